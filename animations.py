@@ -0,0 +1,205 @@
+import logging
+import weakref
+
+import shiboken6
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer, QEvent, QEasingCurve, Qt
+from PySide6.QtWidgets import QWidget
+
+FRAME_INTERVAL_MS = 16
+LOW_POWER_FRAME_INTERVAL_MS = 50
+
+
+class Animation:
+    # Запись планировщика: callback(now_ms) вызывается не чаще раза в interval мс,
+    # пока анимация запущена владельцем и её виджет действительно виден на экране
+    def __init__(self, scheduler, widget, callback, interval, decorative, oneshot=False):
+        self.scheduler = scheduler
+        self.oneshot = oneshot
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        self.decorative = decorative
+        self.running = False
+        self.on_screen = False
+        self.due = 0
+
+    def start(self):
+        self.running = True
+        self.due = 0
+        self.scheduler.refresh()
+
+    def stop(self):
+        # Остановленная разовая анимация больше не нужна и снимается с учёта
+        self.running = False
+        if self.oneshot:
+            self.scheduler.forget(self)
+        else:
+            self.scheduler.refresh()
+
+    def is_running(self):
+        return self.running
+
+    def defer(self, delay):
+        # Следующий вызов не раньше чем через delay мс (для кадров с разной задержкой)
+        self.due = self.scheduler.clock.elapsed() + delay
+
+
+class AnimationScheduler(QObject):
+    # Общие часы для всех анимаций интерфейса вместо отдельных QTimer/QPropertyAnimation
+    # в каждом виджете. Один таймер тикает с частотой кадров и обслуживает все активные
+    # анимации сразу. Анимации виджетов, которые скрыты (неактивная страница QStackedWidget),
+    # свёрнуты или перекрыты (окно не экспонировано), приостанавливаются; когда активных нет,
+    # таймер останавливается совсем. В режиме энергосбережения часы идут реже,
+    # а декоративные анимации (рамки, звёзды) не проигрываются.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.animations = []
+        # Слабые ссылки: закрытые уведомления и их окна не должны жить из-за планировщика
+        self.watched = weakref.WeakSet()
+        self.animated = weakref.WeakSet()
+        self.low_power = False
+        self.ticks = 0
+        self.clock = QElapsedTimer()
+        self.clock.start()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(FRAME_INTERVAL_MS)
+        self.timer.timeout.connect(self.tick)
+        self.refresh_pending = False
+
+    def register(self, widget, callback, interval=0, decorative=False, oneshot=False):
+        animation = Animation(self, widget, callback, interval, decorative, oneshot)
+        self.animations.append(animation)
+        self.watch(widget)
+        if widget not in self.animated:
+            # Одно соединение destroyed на виджет, сколько бы анимаций на нём ни запускалось
+            self.animated.add(widget)
+            widget.destroyed.connect(self.forget_deleted)
+        return animation
+
+    def forget(self, animation):
+        if animation in self.animations:
+            self.animations.remove(animation)
+        self.refresh()
+
+    def forget_deleted(self, *args):
+        # Виджет удалён: снимаем анимации всех виджетов, чья C++-часть уже разрушена.
+        # Сам объект в слот не захватываем — иначе соединение держало бы его обёртку
+        self.animations = [animation for animation in self.animations if shiboken6.isValid(animation.widget)]
+        self.refresh()
+
+    def tween(self, widget, duration, step, finished=None, easing=QEasingCurve.InOutQuad):
+        # Разовая анимация: step(progress) с прогрессом 0..1 по кривой easing, затем finished()
+        curve = QEasingCurve(easing)
+        started = []
+
+        def advance(now):
+            if not started:
+                started.append(now)
+            progress = min(1.0, (now - started[0]) / duration)
+            step(curve.valueForProgress(progress))
+            if progress >= 1.0:
+                animation.stop()
+                if finished is not None:
+                    finished()
+
+        animation = self.register(widget, advance, oneshot=True)
+        animation.start()
+        return animation
+
+    def watch(self, obj):
+        if obj is None or obj in self.watched:
+            return
+        # destroyed здесь не подключаем: у QWindow, созданного Qt, соединение со слотом
+        # Python держит обёртку живой и после удаления окна
+        self.watched.add(obj)
+        obj.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange, QEvent.Expose):
+            if event.type() == QEvent.Show:
+                # Окно и его QWindow появляются только при первом показе
+                if isinstance(obj, QWidget):
+                    window = obj.window()
+                    self.watch(window)
+                    self.watch(window.windowHandle())
+            self.refresh()
+        return False
+
+    def refresh(self):
+        # События показа и сворачивания приходят пачками — пересчёт откладывается до конца пачки
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            QTimer.singleShot(0, self.update_states)
+
+    def on_screen(self, widget):
+        try:
+            if not widget.isVisible():
+                return False
+            window = widget.window()
+            if window.isMinimized():
+                return False
+            handle = window.windowHandle()
+            return handle is None or handle.isExposed()
+        except RuntimeError:
+            return False
+
+    def update_states(self):
+        self.refresh_pending = False
+        active = False
+        for animation in self.animations:
+            animation.on_screen = self.on_screen(animation.widget)
+            active = active or self.is_active(animation)
+        if active and not self.timer.isActive():
+            self.timer.start()
+        elif not active and self.timer.isActive():
+            self.timer.stop()
+
+    def is_active(self, animation):
+        return (animation.running and animation.on_screen
+                and not (self.low_power and animation.decorative))
+
+    def tick(self):
+        now = self.clock.elapsed()
+        self.ticks += 1
+        for animation in list(self.animations):
+            if not self.is_active(animation) or now < animation.due:
+                continue
+            animation.due = now + animation.interval
+            try:
+                animation.callback(now)
+            except RuntimeError:
+                # C++-часть виджета уже удалена, а сигнал destroyed ещё не дошёл
+                self.forget(animation)
+
+    def set_low_power(self, enabled):
+        self.low_power = enabled
+        self.timer.setInterval(LOW_POWER_FRAME_INTERVAL_MS if enabled else FRAME_INTERVAL_MS)
+        self.update_states()
+        logging.info(f"Режим энергосбережения {'включён' if enabled else 'выключен'}: {self.stats()}")
+
+    def active_count(self):
+        return sum(1 for animation in self.animations if self.is_active(animation))
+
+    def stats(self):
+        running = [animation for animation in self.animations if animation.running]
+        return {
+            "registered": len(self.animations),
+            "running": len(running),
+            "active": self.active_count(),
+            "suspended": len(running) - self.active_count(),
+            "clock_running": self.timer.isActive(),
+            "frame_interval_ms": self.timer.interval(),
+            "low_power": self.low_power,
+            "ticks": self.ticks,
+        }
+
+
+_shared = None
+
+
+def shared_scheduler():
+    global _shared
+    if _shared is None:
+        _shared = AnimationScheduler()
+    return _shared
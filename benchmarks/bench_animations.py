@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QWidget, QStackedWidget, QVBoxLayout
+from PySide6.QtCore import QPropertyAnimation, QElapsedTimer, Property
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from main import AnimatedBorderWidget
+from animations import shared_scheduler
+
+
+class LegacyBorder(AnimatedBorderWidget):
+    # Прежняя рамка: бесконечная QPropertyAnimation на каждый экземпляр
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.animation.stop()
+        self.legacy = QPropertyAnimation(self, b"angle")
+        self.legacy.setDuration(3000)
+        self.legacy.setStartValue(0)
+        self.legacy.setEndValue(360)
+        self.legacy.setLoopCount(-1)
+        self.legacy.start()
+
+
+def counting(cls):
+    class Counted(cls):
+        paints = 0
+        updates = 0
+
+        def set_angle(self, angle):
+            Counted.updates += 1
+            super().set_angle(angle)
+
+        angle = Property(int, AnimatedBorderWidget.get_angle, set_angle)
+
+        def paintEvent(self, event):
+            Counted.paints += 1
+            super().paintEvent(event)
+    return Counted
+
+
+def run_events(ms):
+    timer = QElapsedTimer()
+    timer.start()
+    while timer.elapsed() < ms:
+        app.processEvents()
+        time.sleep(0.002)
+
+
+def build(cls, pages, per_page):
+    stack = QStackedWidget()
+    stack.resize(800, 600)
+    for _ in range(pages):
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        for _ in range(per_page):
+            border = cls()
+            border.setFixedSize(300, 80)
+            layout.addWidget(border)
+        stack.addWidget(page)
+    stack.show()
+    return stack
+
+
+def measure(cls, args, label):
+    counted = counting(cls)
+    stack = build(counted, args.pages, args.per_page)
+    run_events(100)
+    counted.paints = counted.updates = 0
+    run_events(args.ms)
+    print(f"{label}: {counted.updates} angle updates, {counted.paints} repaints in {args.ms} ms "
+          f"({args.pages} pages x {args.per_page} borders, one page visible); scheduler {shared_scheduler().stats()}")
+    stack.hide()
+    stack.deleteLater()
+    run_events(50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Анимации рамок: отдельные QPropertyAnimation против общего планировщика")
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--per-page", type=int, default=3)
+    parser.add_argument("--ms", type=int, default=2000)
+    args = parser.parse_args()
+
+    measure(LegacyBorder, args, "legacy   ")
+    measure(AnimatedBorderWidget, args, "scheduler")
+    shared_scheduler().set_low_power(True)
+    measure(AnimatedBorderWidget, args, "low power")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+from system_cursors import CursorApplier, MemoryBackend, TimingBackend
+from bench_cursor_decode import make_library
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def describe(label, values):
+    print(f"{label:>12}: p50 {statistics.median(values):7.3f} мс, p95 {percentile(values, 0.95):7.3f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка применения схемы курсоров через бэкенд в памяти")
+    parser.add_argument("--packs", type=int, default=50)
+    parser.add_argument("--applies", type=int, default=500)
+    parser.add_argument("--write-delay-ms", type=float, default=0.0, help="имитация записи пачки в реестр")
+    parser.add_argument("--broadcast-delay-ms", type=float, default=0.0, help="имитация SystemParametersInfoW")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cursors-apply-")
+    try:
+        library = os.path.join(root, "Anime")
+        make_library(library, args.packs, ani_roles=3)
+        catalog = Catalog(os.path.join(root, "catalog.db"), {"anime": library})
+        catalog.refresh("anime")
+        schemes = [catalog.scheme("anime", name) for name in catalog.page("anime")]
+        catalog.close()
+
+        memory = MemoryBackend(write_delay=args.write_delay_ms / 1000,
+                               broadcast_delay=args.broadcast_delay_ms / 1000)
+        backend = TimingBackend(memory)
+        applier = CursorApplier(backend)
+        totals = []
+        for idx in range(args.applies):
+            start = time.perf_counter()
+            applier.apply(schemes[idx % len(schemes)])
+            totals.append((time.perf_counter() - start) * 1000)
+        print(f"Применений: {args.applies}, пачек записи: {len(memory.batches)}, рассылок: {memory.broadcasts}")
+        describe("apply", totals)
+        for operation, values in backend.timings.items():
+            describe(operation, values)
+
+        # Откат к предыдущей схеме и сбой записи посреди пачки
+        before = dict(memory.values)
+        applier.apply(schemes[0])
+        start = time.perf_counter()
+        applier.rollback()
+        print(f"{'rollback':>12}: {(time.perf_counter() - start) * 1000:7.3f} мс, схема восстановлена: {memory.values == before}")
+        memory.fail_writes = 1
+        try:
+            applier.apply(schemes[1 % len(schemes)])
+        except OSError as e:
+            print(f"{'failed write':>12}: {e}; схема не изменилась: {memory.values == before}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
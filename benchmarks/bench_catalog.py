@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+
+ROLES = ["pointer", "help", "busy", "link", "cross", "text", "move", "dgn1", "dgn2",
+         "horz", "vert", "alternate", "unavailable", "work", "hand", "person", "pin"]
+
+
+def make_library(root, packs):
+    for i in range(packs):
+        pack = os.path.join(root, f"Pack {i:05d}")
+        os.makedirs(pack)
+        for j, role in enumerate(ROLES):
+            with open(os.path.join(pack, role + (".ani" if j % 3 == 0 else ".cur")), "wb") as f:
+                f.write(b"\0" * 64)
+        if i % 2 == 0:
+            open(os.path.join(pack, "preview.gif"), "wb").close()
+
+
+def legacy_scan(path):
+    # Прежний Worker.load_cursors: os.listdir по каждому паку
+    cursors = {}
+    for folder in os.listdir(path):
+        full_path = os.path.join(path, folder)
+        if os.path.isdir(full_path):
+            cursor_files = {
+                name.lower().split(".")[0]: os.path.abspath(os.path.join(full_path, name))
+                for name in os.listdir(full_path) if name.lower().endswith((".cur", ".ani"))
+            }
+            if cursor_files:
+                cursors[folder] = cursor_files
+    return cursors
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Открытие категории: сканирование каталогов против индекса SQLite")
+    parser.add_argument("--packs", type=int, default=5000)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cursors-catalog-")
+    try:
+        library = os.path.join(root, "Anime")
+        make_library(library, args.packs)
+        db_path = os.path.join(root, "catalog.db")
+
+        legacy, elapsed = timed(legacy_scan, library)
+        print(f"legacy scan:        {elapsed:.3f}s")
+
+        catalog = Catalog(db_path, {"anime": library})
+        _, elapsed = timed(catalog.refresh, "anime")
+        print(f"catalog cold build: {elapsed:.3f}s")
+        _, elapsed = timed(catalog.refresh, "anime")
+        print(f"catalog warm check: {elapsed:.3f}s")
+        loaded, elapsed = timed(catalog.load, "anime")
+        print(f"catalog load:       {elapsed:.3f}s")
+        assert loaded == legacy
+
+        os.makedirs(os.path.join(library, "New pack"))
+        open(os.path.join(library, "New pack", "pointer.cur"), "wb").close()
+        changed, elapsed = timed(catalog.refresh, "anime")
+        print(f"one new pack:       {elapsed:.3f}s, added={changed.added}")
+        catalog.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import io
+import os
+import sys
+import time
+import shutil
+import hashlib
+import zipfile
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifest import archive_digests, HASH_CHUNK_SIZE
+
+# Потоковая проверка держит в памяти несколько блоков чтения, а не архив или запись целиком:
+# предел не зависит от размера архива, и возврат к BytesIO его сразу превысит
+PEAK_LIMIT_MB = 8 * HASH_CHUNK_SIZE // (1024 * 1024)
+
+
+def make_archive(path, size_mb):
+    # Записи по 1 МБ плюс одна крупная на четверть архива: растёт и архив, и самая большая запись
+    block = os.urandom(1024 * 1024)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zf:
+        with zf.open("CursorsLib/Anime/Big/preview.ani", "w") as entry:
+            for _ in range(size_mb // 4):
+                entry.write(block)
+        for i in range(size_mb - size_mb // 4):
+            zf.writestr(f"CursorsLib/Classic/Pack {i:05d}/cursor.cur", block[i % 64:])
+
+
+def legacy_digests(zip_path):
+    # Прежний путь проверки: архив в BytesIO, каждая запись читается целиком
+    with open(zip_path, "rb") as f:
+        zip_data = io.BytesIO(f.read())
+    digests = {}
+    with zipfile.ZipFile(zip_data, "r") as zip_ref:
+        for file_name in zip_ref.namelist():
+            if file_name.endswith((".cur", ".ani")):
+                with zip_ref.open(file_name) as f:
+                    digests[file_name] = hashlib.md5(f.read()).hexdigest()
+    return digests
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пиковое потребление памяти при проверке архива")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 256], help="размеры архивов в МБ")
+    parser.add_argument("--legacy", action="store_true", help="замерить и прежний путь через BytesIO")
+    parser.add_argument("--limit-mb", type=float, default=PEAK_LIMIT_MB, help="допустимый пик потоковой проверки")
+    args = parser.parse_args()
+
+    exceeded = []
+
+    root = tempfile.mkdtemp(prefix="cursors-memory-")
+    try:
+        for size_mb in args.sizes:
+            path = os.path.join(root, f"CursorsLib-{size_mb}.zip")
+            make_archive(path, size_mb)
+            digests, peak, elapsed = measure(archive_digests, path, (".cur", ".ani"))
+            line = f"{size_mb:>5} MB: streaming peak {peak / 1024 / 1024:7.2f} MB, {elapsed:.2f}s"
+            if peak > args.limit_mb * 1024 * 1024:
+                exceeded.append(size_mb)
+                line += f" — выше предела {args.limit_mb:g} MB"
+            if args.legacy:
+                legacy, legacy_peak, legacy_elapsed = measure(legacy_digests, path)
+                assert legacy == digests
+                line += f" | legacy peak {legacy_peak / 1024 / 1024:7.2f} MB, {legacy_elapsed:.2f}s"
+            print(line)
+            os.remove(path)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if exceeded:
+        print(f"Пик потоковой проверки выше {args.limit_mb:g} MB на архивах {', '.join(map(str, exceeded))} MB")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QGuiApplication, QImageReader
+
+from catalog import CURSOR_EXTENSIONS
+from cursor_files import CursorFile
+from thumbnails import render_cursor_frames
+from sample_cursors import make_cur, make_ani
+
+ROLES = ("pointer", "help", "busy", "link", "cross", "text", "move", "dgn1", "dgn2", "horz", "vert",
+         "alternate", "unavailable", "work", "hand")
+
+
+def make_library(root, packs, ani_roles):
+    # В каждом паке все роли; первые ani_roles ролей анимированы, как в типичных анимешных паках
+    samples = {
+        "cur32": make_cur(32, 32, 32, seed=1),
+        "cur8": make_cur(32, 32, 8, seed=2),
+        "ani": make_ani(frames=8, seed=3),
+    }
+    for idx in range(packs):
+        path = os.path.join(root, f"Pack {idx:05d}")
+        os.makedirs(path)
+        for pos, role in enumerate(ROLES):
+            if pos < ani_roles:
+                name, data = f"{role}.ani", samples["ani"]
+            else:
+                name, data = f"{role}.cur", samples["cur32" if pos % 2 else "cur8"]
+            with open(os.path.join(path, name), "wb") as f:
+                f.write(data)
+
+
+def library_files(root):
+    files = []
+    for dirpath, _, names in os.walk(root):
+        files.extend(os.path.join(dirpath, name) for name in names if name.lower().endswith(CURSOR_EXTENSIONS))
+    return files
+
+
+def timed(func, files):
+    start = time.perf_counter()
+    result = func(files)
+    return result, time.perf_counter() - start
+
+
+def parse_headers(files):
+    frames = failed = 0
+    for path in files:
+        try:
+            with CursorFile(path) as cursor:
+                frames += len(cursor.frames)
+        except (OSError, ValueError):
+            failed += 1
+    return frames, failed
+
+
+def decode_all(files):
+    frames = failed = 0
+    for path in files:
+        try:
+            with CursorFile(path) as cursor:
+                for frame in range(len(cursor.frames)):
+                    cursor.image(frame)
+                    frames += 1
+        except (OSError, ValueError):
+            failed += 1
+    return frames, failed
+
+
+def qt_reader(files):
+    # Для сравнения: ICO-плагин Qt (читает только .cur, .ani не понимает)
+    frames = failed = 0
+    for path in files:
+        if not path.lower().endswith(".cur"):
+            continue
+        image = QImageReader(path).read()
+        if image.isNull():
+            failed += 1
+        else:
+            frames += 1
+    return frames, failed
+
+
+def previews(files):
+    frames = failed = 0
+    for path in files:
+        try:
+            frames += len(render_cursor_frames(path, QSize(195, 150), first_only=True))
+        except (OSError, ValueError):
+            failed += 1
+    return frames, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пропускная способность разбора .cur/.ani по всей библиотеке")
+    parser.add_argument("--library", help="каталог с паками (по умолчанию — синтетическая библиотека)")
+    parser.add_argument("--packs", type=int, default=200)
+    parser.add_argument("--ani-roles", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)
+    root = args.library
+    if root is None:
+        root = tempfile.mkdtemp(prefix="cursors-decode-")
+        make_library(root, args.packs, args.ani_roles)
+    try:
+        files = library_files(root)
+        total = sum(os.path.getsize(path) for path in files)
+        print(f"{len(files)} cursor files, {total / 1024 / 1024:.1f} MiB")
+        for label, func in (("headers (mmap)", parse_headers), ("decode all frames", decode_all),
+                            ("Qt reader, .cur only", qt_reader), ("card previews", previews)):
+            (frames, failed), elapsed = timed(func, files)
+            print(f"{label:>20}: {elapsed:6.2f}s, {len(files) / elapsed:8.0f} files/s, "
+                  f"{total / 1024 / 1024 / elapsed:7.1f} MiB/s, {frames / elapsed:8.0f} frames/s, failed {failed}")
+    finally:
+        if args.library is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
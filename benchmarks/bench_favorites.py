@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+from favorites import FavoritesStore
+from schemes import SchemeCache
+
+ITEMS_PER_PAGE = 12
+
+
+def make_library(root, count):
+    names = []
+    for idx in range(count):
+        name = f"Pack {idx:05d}"
+        os.makedirs(os.path.join(root, name))
+        open(os.path.join(root, name, "pointer.cur"), "wb").close()
+        names.append(name)
+    return names
+
+
+def load_cursor_files(folder_path):
+    cursor_files = {}
+    if os.path.exists(folder_path):
+        for name in os.listdir(folder_path):
+            if name.lower().endswith((".cur", ".ani")):
+                cursor_files[name.lower().split(".")[0]] = os.path.abspath(os.path.join(folder_path, name))
+    return cursor_files
+
+
+def legacy_keystroke(root, favorites, query):
+    # Прежний режим избранного: фильтр по списку словарей, listdir каждого избранного пака
+    # и линейная проверка членства для каждой карточки страницы
+    filtered = [item["name"] for item in favorites if query in item["name"].lower()]
+    current = {}
+    for item in favorites:
+        full_path = os.path.join(root, item["name"])
+        if os.path.isdir(full_path):
+            cursor_files = load_cursor_files(full_path)
+            if cursor_files:
+                current[item["name"]] = cursor_files
+    return [{"name": name, "category": "anime"} in favorites for name in filtered[:ITEMS_PER_PAGE]]
+
+
+def store_keystroke(store, query):
+    filtered = store.search(query)
+    return [(name, "anime") in store for name in filtered[:ITEMS_PER_PAGE]]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Режим избранного: список словарей против индексированного хранилища")
+    parser.add_argument("--packs", type=int, default=5000)
+    parser.add_argument("--favorites", type=int, default=2000)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cursors-favorites-")
+    try:
+        names = make_library(root, args.packs)
+        favorites = [{"name": name, "category": "anime"} for name in names[::max(1, args.packs // args.favorites)]]
+        favorites = favorites[:args.favorites]
+        store = FavoritesStore(FavoritesStore.parse(favorites))
+
+        for query in ["", "pack 0", "pack 012", "pack 01234"]:
+            legacy = timed(legacy_keystroke, root, favorites, query.lower())
+            indexed = timed(store_keystroke, store, query)
+            print(f"{query!r:>14}: legacy {legacy:8.2f} ms, store {indexed:6.2f} ms ({len(store.search(query))} matches)")
+
+        # Применение из избранного: схема собирается из каталога один раз и дальше берётся из кеша
+        catalog = Catalog(os.path.join(root, "catalog.db"), {"anime": root})
+        catalog.refresh("anime")
+        schemes = SchemeCache(catalog)
+        first = timed(schemes.get, "anime", favorites[0]["name"])
+        again = timed(schemes.get, "anime", favorites[0]["name"])
+        print(f"scheme resolve: first {first:.3f} ms, cached {again:.4f} ms")
+        catalog.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
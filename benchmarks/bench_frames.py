@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent
+from PySide6.QtWidgets import QApplication
+
+from main import AnimatedGIF
+from frame_cache import FrameCache
+from sample_gif import make_gif
+
+ITEMS_PER_PAGE = 12
+
+
+def make_previews(root, count, variants):
+    gifs = [make_gif(frames=6, delay_cs=2, seed=seed) for seed in range(variants)]
+    paths = []
+    for idx in range(count):
+        path = os.path.join(root, f"Pack {idx:05d}", "preview.gif")
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(gifs[idx % variants])
+        paths.append(path)
+    return paths
+
+
+def rss_mib():
+    # Текущий RSS процесса; /proc есть только в Linux
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return float("nan")
+
+
+def hover(app, widget, until_cached):
+    # Время до первого кадра анимации; until_cached — дождаться записи полного цикла в кеш
+    start = time.perf_counter()
+    widget.start_animation()
+    while widget.movie is not None and widget.recorded == []:
+        app.processEvents()
+    first_frame = time.perf_counter() - start
+    while until_cached and widget.movie is not None:
+        app.processEvents()
+        time.sleep(0.001)
+    widget.stop_animation()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    return first_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Анимация превью: ленивый QMovie и общий LRU-кеш кадров")
+    parser.add_argument("--packs", type=int, default=360)
+    parser.add_argument("--variants", type=int, default=24)
+    parser.add_argument("--budget-mib", type=int, default=16)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    root = tempfile.mkdtemp(prefix="cursors-frames-")
+    try:
+        paths = make_previews(root, args.packs, args.variants)
+
+        cache = FrameCache(args.budget_mib * 1024 * 1024)
+        cards = [AnimatedGIF(path, cache) for path in paths[:ITEMS_PER_PAGE]]
+        first = [hover(app, card, until_cached=True) for card in cards]
+        misses = cache.misses
+        second = [hover(app, card, until_cached=False) for card in cards]
+        print(f"hover sweep over one page: first pass {sum(first) / len(first) * 1000:.2f} ms to first frame "
+              f"(QMovie), second pass {sum(second) / len(second) * 1000:.3f} ms (cache), "
+              f"re-decoded {cache.misses - misses} of {len(cards)}")
+
+        # Сначала ограниченный кеш: память, занятая неограниченным, иначе исказила бы замер
+        for label, budget in ((f"{args.budget_mib} MiB budget", args.budget_mib * 1024 * 1024), ("unbounded", 1 << 62)):
+            cache = FrameCache(budget)
+            for card in cards:
+                card.frame_cache = cache
+            baseline = rss_mib()
+            samples = []
+            for page_start in range(0, len(paths), ITEMS_PER_PAGE):
+                page = paths[page_start:page_start + ITEMS_PER_PAGE]
+                for card, path in zip(cards, page):
+                    card.set_source(path)
+                    hover(app, card, until_cached=True)
+                if (page_start // ITEMS_PER_PAGE) % 5 == 4:
+                    samples.append(f"{rss_mib() - baseline:+.0f}")
+            print(f"{label:>16}: {len(paths)} packs hovered, cache {cache.total_bytes / (1024 * 1024):.1f} MiB "
+                  f"in {len(cache)} animations, evictions {cache.evictions}, RSS growth MiB by page: {' '.join(samples)}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
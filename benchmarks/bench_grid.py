@@ -0,0 +1,207 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt, QEvent, QSize, QPropertyAnimation, QEasingCurve, Property
+from PySide6.QtGui import QMovie, QPixmap
+from PySide6.QtWidgets import (QApplication, QWidget, QGridLayout, QScrollArea, QFrame, QLabel, QVBoxLayout,
+                               QPushButton)
+
+from main import CursorCard
+from thumbnails import ThumbnailService
+from frame_cache import FrameCache
+from sample_gif import make_gif
+
+ITEMS_PER_PAGE = 12
+BUTTON_STYLE = "QPushButton { padding: 8px; font-size: 16px; }"
+
+
+def make_library(root, count, variants):
+    gifs = [make_gif(seed=seed) for seed in range(variants)]
+    packs = []
+    for idx in range(count):
+        path = os.path.join(root, f"Pack {idx:05d}")
+        os.makedirs(path)
+        with open(os.path.join(path, "preview.gif"), "wb") as f:
+            f.write(gifs[idx % variants])
+        packs.append((f"Pack {idx:05d}", os.path.join(path, "preview.gif")))
+    return packs
+
+
+class AnimatedGIF(QLabel):
+    # Прежнее превью карточки (до пула карточек): свой QMovie на каждую карточку,
+    # первый кадр декодируется прямо в конструкторе
+    def __init__(self, gif_path, width=195, height=150):
+        super().__init__()
+        self._size = QSize(width, height)
+        self.base_size = QSize(width, height)
+        self.hover_size = QSize(int(width * 1.1), int(height * 1.1))
+
+        self.setFixedSize(self.base_size)
+        self.movie = QMovie(gif_path)
+        self.movie.setScaledSize(self.base_size)
+
+        self.movie.jumpToFrame(0)
+        self.static_pixmap = QPixmap(self.movie.currentPixmap())
+        self.setPixmap(self.static_pixmap)
+
+        self.movie.frameChanged.connect(self.update_pixmap)
+        self.movie.stop()
+
+        self.anim = QPropertyAnimation(self, b"animatedSize")
+        self.anim.setDuration(200)
+        self.anim.setEasingCurve(QEasingCurve.OutCubic)
+
+    def update_pixmap(self):
+        if self.movie.state() == QMovie.Running:
+            self.setPixmap(self.movie.currentPixmap())
+
+    def start_animation(self):
+        self.movie.start()
+
+    def stop_animation(self):
+        self.movie.stop()
+        self.setPixmap(self.static_pixmap)
+
+    def get_animated_size(self):
+        return self.size()
+
+    def set_animated_size(self, size):
+        self.setFixedSize(size)
+        self.movie.setScaledSize(size)
+
+    animatedSize = Property(QSize, get_animated_size, set_animated_size)
+
+
+def create_card(name, preview_path):
+    # Прежний MainApp.create_card без обращений к состоянию окна
+    card = QFrame()
+    card.setStyleSheet("background-color: #3a3b3f; border-radius: 10px;")
+    card.setFixedSize(230, 320)
+    layout = QVBoxLayout(card)
+
+    gif_widget = None
+    if preview_path:
+        gif_widget = AnimatedGIF(preview_path)
+        layout.addWidget(gif_widget, alignment=Qt.AlignCenter)
+
+    def enter_event(event):
+        if gif_widget:
+            gif_widget.start_animation()
+        QFrame.enterEvent(card, event)
+
+    def leave_event(event):
+        if gif_widget:
+            gif_widget.stop_animation()
+        QFrame.leaveEvent(card, event)
+
+    card.enterEvent = enter_event
+    card.leaveEvent = leave_event
+
+    title = QLabel(name)
+    title.setStyleSheet("color: white; font-size: 18px; font-weight: bold; font-family: 'Segoe UI';")
+    title.setAlignment(Qt.AlignCenter)
+    layout.addWidget(title)
+
+    apply_btn = QPushButton("Применить")
+    apply_btn.setStyleSheet(BUTTON_STYLE)
+    layout.addWidget(apply_btn)
+
+    fav_btn = QPushButton("☆")
+    fav_btn.setStyleSheet(BUTTON_STYLE)
+    layout.addWidget(fav_btn)
+
+    return card
+
+
+class LegacyGrid:
+    # Прежний update_display: все карточки страницы удаляются и создаются заново через create_card
+    def __init__(self, grid, thumbnails):
+        self.grid = grid
+
+    def show_page(self, items):
+        while self.grid.count():
+            child = self.grid.takeAt(0)
+            if child.widget():
+                child.widget().deleteLater()
+        for idx, (name, preview) in enumerate(items):
+            self.grid.addWidget(create_card(name, preview), idx // 4, idx % 4)
+
+
+class PooledGrid:
+    # Текущий render_page: карточки из пула перепривязываются к новым пакам
+    def __init__(self, grid, thumbnails):
+        self.grid = grid
+        self.thumbnails = thumbnails
+        self.frame_cache = FrameCache(16 * 1024 * 1024)
+        self.pool = []
+
+    def show_page(self, items):
+        while len(self.pool) < len(items):
+            card = CursorCard(BUTTON_STYLE, self.thumbnails, self.frame_cache)
+            self.grid.addWidget(card, len(self.pool) // 4, len(self.pool) % 4)
+            self.pool.append(card)
+        for card, (name, preview) in zip(self.pool, items):
+            card.bind(name, "anime", preview, False)
+            card.show()
+        for card in self.pool[len(items):]:
+            card.hide()
+
+
+def flip_pages(app, grid_widget, strategy, pages):
+    timings = []
+    for page in pages:
+        start = time.perf_counter()
+        strategy.show_page(page)
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        app.processEvents()
+        grid_widget.repaint()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summary(timings):
+    timings = sorted(timings)
+    mean = sum(timings) / len(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return f"mean {mean * 1000:6.2f} ms, p95 {p95 * 1000:6.2f} ms, max {timings[-1] * 1000:6.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка смены страницы: пересоздание карточек против пула")
+    parser.add_argument("--packs", type=int, default=240)
+    parser.add_argument("--variants", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=2)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    root = tempfile.mkdtemp(prefix="cursors-grid-")
+    try:
+        packs = make_library(root, args.packs, args.variants)
+        pages = [packs[i:i + ITEMS_PER_PAGE] for i in range(0, len(packs), ITEMS_PER_PAGE)] * args.rounds
+
+        for label, factory in (("recreate", LegacyGrid), ("recycle", PooledGrid)):
+            scroll = QScrollArea()
+            scroll.setWidgetResizable(True)
+            grid_widget = QWidget()
+            grid = QGridLayout(grid_widget)
+            scroll.setWidget(grid_widget)
+            scroll.resize(1180, 700)
+            scroll.show()
+            timings = flip_pages(app, grid_widget, factory(grid, ThumbnailService(os.path.join(root, f"thumbnails-{label}"))), pages)
+            print(f"{label:>8}: {len(pages)} page changes, {summary(timings[1:])}")
+            scroll.close()
+            scroll.deleteLater()
+            app.sendPostedEvents(None, QEvent.DeferredDelete)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
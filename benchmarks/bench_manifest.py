@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifest import HashManifest
+
+
+def make_library(root, files, file_size):
+    # Синтетическая библиотека: паки по 17 курсоров, как в типичном CursorsLib
+    payload = os.urandom(file_size)
+    anime = os.path.join(root, "CursorsLib", "Anime")
+    classic = os.path.join(root, "CursorsLib", "Classic")
+    for i in range(files):
+        base = anime if i % 2 == 0 else classic
+        pack = os.path.join(base, f"Pack {i // 34:05d}")
+        os.makedirs(pack, exist_ok=True)
+        ext = ".ani" if i % 3 == 0 else ".cur"
+        with open(os.path.join(pack, f"cursor{i}{ext}"), "wb") as f:
+            f.write(payload[i % 64:] + i.to_bytes(4, "little"))
+    return [anime, classic]
+
+
+def run_check(manifest_path, root, paths):
+    manifest = HashManifest(manifest_path, root)
+    start = time.perf_counter()
+    manifest.load()
+    manifest.scan(paths)
+    manifest.save()
+    return time.perf_counter() - start, manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Холодная и тёплая проверка библиотеки через HashManifest")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--file-size", type=int, default=64 * 1024)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cursors-bench-")
+    try:
+        paths = make_library(root, args.files, args.file_size)
+        manifest_path = os.path.join(root, "cursors_manifest.json")
+
+        cold, manifest = run_check(manifest_path, root, paths)
+        print(f"cold: {cold:.3f}s  hashed={manifest.hashed} reused={manifest.reused}")
+        warm, manifest = run_check(manifest_path, root, paths)
+        print(f"warm: {warm:.3f}s  hashed={manifest.hashed} reused={manifest.reused}")
+        print(f"speedup: x{cold / warm:.1f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import io
+import os
+import sys
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+import sync
+from constants import CURSOR_LIB_PATH
+from remote_zip import RemoteZip, RangeNotSupported
+from stand_in_server import StandInServer
+
+FAILURES = []
+
+
+def check(condition, message):
+    print(f"  {'ok' if condition else 'FAILED'}: {message}")
+    if not condition:
+        FAILURES.append(message)
+
+
+def make_archive(entries, entry_size):
+    buffer = io.BytesIO()
+    payload = os.urandom(entry_size)
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(entries):
+            category = "Anime" if i % 2 == 0 else "Classic"
+            ext = ".ani" if i % 3 == 0 else ".cur"
+            zf.writestr(f"CursorsLib/{category}/Pack {i // 17:05d}/cursor{i}{ext}", payload[i % 64:])
+    return buffer.getvalue()
+
+
+def change_entry(data, name):
+    # Тот же архив, но у записи name другой CRC при том же размере
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            content = src.read(info)
+            if info.filename == name:
+                content = bytes([content[0] ^ 0xFF]) + content[1:]
+            dst.writestr(info.filename, content)
+    return buffer.getvalue()
+
+
+def check_sync(data):
+    # sync.check_library в рабочем каталоге с раскладкой приложения: библиотека распакована
+    # из того же архива, поэтому без изменений он актуален, а с изменённым CRC — нет
+    print("sync.check_library:")
+    workdir = tempfile.mkdtemp(prefix="cursors-remote-check-")
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        zipfile.ZipFile(io.BytesIO(data)).extractall(CURSOR_LIB_PATH)
+        changed = change_entry(data, zipfile.ZipFile(io.BytesIO(data)).namelist()[0])
+
+        with StandInServer(data) as server:
+            outdated = sync.check_library(server.url)
+            check(outdated is False, "центральный каталог совпадает с манифестом")
+            check(200 not in server.statuses and server.bytes_sent < len(data),
+                  f"архив не скачивался целиком ({server.bytes_sent} из {len(data)} байт)")
+        with StandInServer(changed) as server:
+            check(sync.check_library(server.url) is True, "изменённый CRC в центральном каталоге найден")
+            check(200 not in server.statuses, "изменение найдено без полной загрузки")
+
+        with StandInServer(data, support_range=False) as server:
+            outdated = sync.check_library(server.url)
+            check(200 in server.statuses and server.bytes_sent >= len(data),
+                  "без Range проверка перешла на загрузку архива целиком")
+            check(outdated is False, "полный архив совпадает с локальными файлами")
+        with StandInServer(changed, support_range=False) as server:
+            check(sync.check_library(server.url) is True, "изменённый файл найден в полном архиве")
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка обновлений по центральному каталогу против полной загрузки")
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--entry-size", type=int, default=16 * 1024)
+    args = parser.parse_args()
+
+    data = make_archive(args.entries, args.entry_size)
+    expected = {info.filename: (info.CRC, info.file_size) for info in zipfile.ZipFile(io.BytesIO(data)).infolist()}
+    print(f"archive: {len(data) / 1024 / 1024:.1f} MB, {len(expected)} entries")
+
+    with StandInServer(data) as server:
+        start = time.perf_counter()
+        remote = RemoteZip(server.url)
+        entries = remote.read_central_directory()
+        elapsed = time.perf_counter() - start
+        print(f"central directory: {elapsed:.3f}s, {server.bytes_sent} bytes in {server.requests} requests")
+        check({name: (e.crc, e.size) for name, e in entries.items()} == expected,
+              "CRC и размеры из центрального каталога совпадают с архивом")
+
+        sent = server.bytes_sent
+        start = time.perf_counter()
+        requests.get(server.url).content
+        elapsed = time.perf_counter() - start
+        print(f"full download:     {elapsed:.3f}s, {server.bytes_sent - sent} bytes")
+
+    with StandInServer(data, support_range=False) as server:
+        try:
+            RemoteZip(server.url).read_central_directory()
+            check(False, "сервер без Range отклонён")
+        except RangeNotSupported as e:
+            print(f"fallback: {e}, {server.bytes_sent} bytes sent")
+            check(True, "сервер без Range отклонён")
+
+    check_sync(data)
+    if FAILURES:
+        print(f"Проверок не прошло: {len(FAILURES)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
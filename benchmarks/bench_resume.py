@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downloads import DownloadCache, fetch_archive, DOWNLOAD_CHUNK_SIZE, SEGMENT_MIN_SIZE
+from stand_in_server import StandInServer
+
+FAILURES = []
+
+
+def check(condition, message):
+    print(f"  {'ok' if condition else 'FAILED'}: {message}")
+    if not condition:
+        FAILURES.append(message)
+
+
+def split_segments(size, segments):
+    # Та же разбивка, что в Downloader._attempt_segmented; маленький файл качается одним потоком
+    if segments < 2 or size < SEGMENT_MIN_SIZE:
+        return [(0, size)]
+    step = -(-size // segments)
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def drop_offsets(ranges, drops):
+    # Обрывы внутри диапазонов, а не на их границах: StandInServer рвёт ответ только
+    # строго внутри запрошенного диапазона. Смещения кратны размеру блока чтения,
+    # чтобы клиент успел записать всё полученное до обрыва
+    offsets = []
+    for pos, (start, end) in enumerate(ranges):
+        count = len(range(pos, drops, len(ranges)))
+        for i in range(count):
+            offset = start + (end - start) * (i + 1) // (count + 1)
+            offsets.append(max(start + DOWNLOAD_CHUNK_SIZE, offset - offset % DOWNLOAD_CHUNK_SIZE))
+    return sorted(offsets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Загрузка с обрывами соединения: продолжение и 304 Not Modified")
+    parser.add_argument("--size", type=int, default=64 * 1024 * 1024)
+    parser.add_argument("--drops", type=int, default=3)
+    parser.add_argument("--segments", type=int, default=1)
+    args = parser.parse_args()
+
+    data = os.urandom(args.size)
+    ranges = split_segments(args.size, args.segments)
+    drop_at = drop_offsets(ranges, args.drops)
+    root = tempfile.mkdtemp(prefix="cursors-resume-")
+    try:
+        with StandInServer(data, drop_at=drop_at) as server:
+            cache = DownloadCache(os.path.join(root, "download_cache"))
+            start = time.perf_counter()
+            path, _ = fetch_archive(server.url, cache, segments=args.segments)
+            elapsed = time.perf_counter() - start
+            print(f"{args.segments} segment(s), {args.drops} drops: {elapsed:.3f}s, sent {server.bytes_sent} of {len(data)} bytes, "
+                  f"responses {server.statuses}")
+            with open(path, "rb") as f:
+                check(f.read() == data, "скачанный файл совпадает с исходным побайтно")
+            check(not server.drop_at, "все обрывы сработали")
+            # Каждый обрыв продолжается запросом 206; без сегментов первый ответ — 200 на весь файл
+            resumed = server.statuses.count(206) - (len(ranges) if len(ranges) > 1 else 0)
+            check(resumed == args.drops, f"после каждого обрыва ответ 206 ({resumed} из {args.drops})")
+            for offset in drop_at:
+                start, end = next((start, end) for start, end in ranges if start < offset < end)
+                check((offset, end) in server.ranges,
+                      f"диапазон {start}-{end - 1} продолжен с {offset - start} уже полученных байт")
+            if len(ranges) == 1:
+                check(server.statuses[0] == 200 and set(server.statuses[1:]) <= {206},
+                      "первый ответ 200, продолжения только 206")
+
+            sent, requests_before = server.bytes_sent, server.requests
+            start = time.perf_counter()
+            fetch_archive(server.url, cache, segments=args.segments)
+            elapsed = time.perf_counter() - start
+            print(f"repeat: {elapsed:.3f}s, sent {server.bytes_sent - sent} bytes, last response {server.statuses[-1]}")
+            check(server.statuses[requests_before:] == [304] and server.bytes_sent == sent,
+                  "повторный запрос с тем же ETag получил 304 без тела")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if FAILURES:
+        print(f"Проверок не прошло: {len(FAILURES)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
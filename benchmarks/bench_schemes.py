@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+from schemes import SchemeCache
+from bench_cursor_decode import make_library
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Собранные схемы паков: сборка, загрузка из каталога, поиск при клике")
+    parser.add_argument("--packs", type=int, default=500)
+    parser.add_argument("--page", type=int, default=12)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cursors-schemes-")
+    try:
+        library = os.path.join(root, "Anime")
+        make_library(library, args.packs, ani_roles=3)
+        catalog = Catalog(os.path.join(root, "catalog.db"), {"anime": library})
+        catalog.refresh("anime")
+        names = catalog.page("anime")
+
+        # Прежний путь клика: схема из каталога и проверка файлов на диске
+        _, legacy = timed(lambda: [catalog.scheme("anime", name) for name in names[:args.page]])
+        print(f"{'click (catalog)':>18}: {legacy / args.page:8.4f} мс на пак")
+
+        cache = SchemeCache(catalog)
+        _, cold = timed(cache.warm, "anime", names)
+        print(f"{'compile all':>18}: {cold:8.1f} мс, собрано {cache.compiled}")
+
+        cache = SchemeCache(catalog)
+        _, stored = timed(cache.warm, "anime", names)
+        print(f"{'load persisted':>18}: {stored:8.1f} мс, собрано {cache.compiled}")
+
+        _, page = timed(lambda: [cache.get("anime", name) for name in names[:args.page]])
+        print(f"{'click (compiled)':>18}: {page / args.page:8.4f} мс на пак, промахов {cache.misses}")
+        catalog.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
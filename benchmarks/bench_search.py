@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex
+
+WORDS = ["ayaka", "kamisato", "black", "swan", "aventurine", "sangonomiya", "kokomi", "raiden", "shogun",
+         "neon", "galaxy", "classic", "pixel", "retro", "dark", "light", "sakura", "kitsune", "cyber", "star"]
+
+
+def make_names(count, seed=1):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        name = " ".join(word.capitalize() for word in words)
+        if rng.random() < 0.5:
+            name += f" {rng.randint(1, 99999)}"
+        names.add(name)
+    return sorted(names, key=lambda n: (n.lower(), n))
+
+
+def linear_filter(names, query):
+    # Прежний update_display: подстрока по каждому имени
+    return [name for name in names if query in name.lower()]
+
+
+def timed(func, *args, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Поиск по именам паков: линейный фильтр против триграммного индекса")
+    parser.add_argument("--names", type=int, default=50000)
+    args = parser.parse_args()
+
+    names = make_names(args.names)
+    index, elapsed = timed(SearchIndex, names, repeat=1)
+    print(f"index build: {elapsed * 1000:.1f} ms for {len(names)} names")
+    _, elapsed = timed(index.search, "swan", repeat=1)
+    print(f"first trigram search (builds postings): {elapsed * 1000:.1f} ms")
+
+    for query in ["a", "sw", "swan", "kamisato", "aventurine 12", "kamsato", "zzz"]:
+        legacy, legacy_time = timed(linear_filter, names, query)
+        ranked, index_time = timed(index.search, query)
+        assert set(legacy) <= set(ranked)
+        print(f"{query!r:>16}: linear {legacy_time * 1000:6.2f} ms ({len(legacy)}), "
+              f"index {index_time * 1000:6.2f} ms ({len(ranked)}), top: {ranked[:2]}")
+
+    # Набор 10-символьного запроса: без debounce — поиск и перестройка сетки на каждую клавишу
+    query = "kamisato a"
+    _, per_key = timed(lambda: [linear_filter(names, query[:i]) for i in range(1, len(query) + 1)], repeat=1)
+    _, debounced = timed(index.search, query, repeat=1)
+    print(f"typing {query!r}: {len(query)} linear filters {per_key * 1000:.1f} ms, one debounced search {debounced * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
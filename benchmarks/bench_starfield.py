@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QWidget, QStackedWidget
+from PySide6.QtCore import QTimer, QPoint, QElapsedTimer
+from PySide6.QtGui import QPainter, QColor, QBrush, QRadialGradient, QImage
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from main import StarryBackground
+
+
+class LegacyStarryBackground(QWidget):
+    # Прежний фон: свой таймер на каждый экземпляр и новый градиент на каждую звезду в кадре
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stars = []
+        self.ticks = 0
+        self.init_stars(150)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.update_stars)
+        self.timer.start(100)
+
+    def init_stars(self, count):
+        self.stars = []
+        for _ in range(count):
+            self.stars.append((random.randint(0, max(1, self.width())), random.randint(0, max(1, self.height())),
+                               random.randint(1, 3), random.randint(50, 255)))
+
+    def update_stars(self):
+        self.ticks += 1
+        self.stars = [(x, y, size, random.randint(50, 255)) for x, y, size, _ in self.stars]
+        self.update()
+
+    def resizeEvent(self, event):
+        self.init_stars(150)
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor(5, 5, 25))
+        for x, y, size, alpha in self.stars:
+            gradient = QRadialGradient(x, y, size * 2)
+            gradient.setColorAt(0, QColor(255, 255, 255, alpha))
+            gradient.setColorAt(1, QColor(255, 255, 255, 0))
+            painter.setBrush(QBrush(gradient))
+            painter.setPen(QColor(0, 0, 0, 0))
+            painter.drawEllipse(QPoint(x, y), size, size)
+
+
+def paint_ms(widget, frames, region=None):
+    image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+    start = time.perf_counter()
+    for _ in range(frames):
+        if region is None:
+            widget.render(image)
+        else:
+            widget.render(image, QPoint(), region)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def run_events(ms):
+    timer = QElapsedTimer()
+    timer.start()
+    while timer.elapsed() < ms:
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Звёздный фон: отрисовка вне экрана и работа таймеров скрытых страниц")
+    parser.add_argument("--width", type=int, default=1180)
+    parser.add_argument("--height", type=int, default=700)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--idle-ms", type=int, default=2000)
+    args = parser.parse_args()
+
+    legacy = LegacyStarryBackground()
+    legacy.resize(args.width, args.height)
+    shared = StarryBackground()
+    shared.resize(args.width, args.height)
+
+    legacy_ms = paint_ms(legacy, args.frames)
+    full_ms = paint_ms(shared, args.frames)
+    dirty_ms = paint_ms(shared, args.frames, shared.dirty_region)
+    area = sum(rect.width() * rect.height() for rect in shared.dirty_region)
+    print(f"paint {args.width}x{args.height}, {args.frames} frames:")
+    print(f"  legacy gradients      {legacy_ms:7.3f} ms/frame")
+    print(f"  sprites, full repaint {full_ms:7.3f} ms/frame")
+    print(f"  sprites, dirty region {dirty_ms:7.3f} ms/frame "
+          f"({area / (args.width * args.height) * 100:.1f}% of the widget)")
+
+    # Три страницы в стеке, видна одна: прежние фоны тикают все, общий — один таймер и только пока виден
+    for label, factory in (("legacy", LegacyStarryBackground), ("shared", StarryBackground)):
+        stack = QStackedWidget()
+        stack.resize(args.width, args.height)
+        pages = [factory() for _ in range(3)]
+        for page in pages:
+            stack.addWidget(page)
+        stack.show()
+        field = pages[0].field if label == "shared" else None
+        before = field.ticks if field else 0
+        run_events(args.idle_ms)
+        visible_ticks = (field.ticks - before) if field else sum(page.ticks for page in pages)
+        stack.hide()
+        before = field.ticks if field else sum(page.ticks for page in pages)
+        run_events(args.idle_ms)
+        hidden_ticks = (field.ticks if field else sum(page.ticks for page in pages)) - before
+        print(f"{label}: timer ticks in {args.idle_ms} ms — one page visible {visible_ticks}, window hidden {hidden_ticks}")
+        stack.deleteLater()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Холодный старт окна: каждый замер — новый процесс, запускающий MainApp так же, как
+# main.py, и выходящий сразу после первой отрисовки. Процесс-замер печатает отчёт
+# StartupProfiler, родитель добавляет время от запуска интерпретатора до выхода.
+# Режим --eager строит все страницы до показа, как было до ленивого построения.
+
+
+def child(eager):
+    import main
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
+
+    # Проверка библиотеки стартует в фоне; сеть замеру не нужна
+    main.GITHUB_CURSORS_URL = "http://127.0.0.1:9/CursorsLib.zip"
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    main.startup_profiler.mark("application")
+    window = main.MainApp()
+    if eager:
+        for name in window.page_builders:
+            window.page(name)
+        main.startup_profiler.mark("eager pages")
+    window.show()
+    main.startup_profiler.mark("show")
+
+    def done(report):
+        print(json.dumps(report), flush=True)
+        os._exit(0)
+
+    main.startup_profiler.when_painted(done)
+    QTimer.singleShot(10000, lambda: os._exit(1))
+    app.exec()
+
+
+def make_workdir(packs):
+    from bench_cursor_decode import make_library
+    from constants import ANIME_PATH, CLASSIC_PATH
+    workdir = tempfile.mkdtemp(prefix="cursors-startup-")
+    make_library(os.path.join(workdir, ANIME_PATH), packs, ani_roles=3)
+    make_library(os.path.join(workdir, CLASSIC_PATH), packs, ani_roles=0)
+    return workdir
+
+
+def run_once(workdir, eager):
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    command = [sys.executable, os.path.abspath(__file__), "--child"] + (["--eager"] if eager else [])
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True, timeout=60)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"замер завершился с кодом {result.returncode}:\n{result.stderr[-2000:]}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["wall_ms"] = round(wall_ms, 2)
+    return report
+
+
+def summarize(label, reports):
+    first_paint = statistics.median(report["first_paint_ms"] for report in reports)
+    wall = statistics.median(report["wall_ms"] for report in reports)
+    print(f"{label:>6}: первая отрисовка {first_paint:7.1f} мс, процесс целиком {wall:7.1f} мс (медианы из {len(reports)})")
+    for name in reports[0]["phases_ms"]:
+        duration = statistics.median(report["phases_ms"].get(name, 0) for report in reports)
+        print(f"        {name:>14}: {duration:7.1f} мс")
+    return first_paint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время холодного старта окна до первой отрисовки")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--packs", type=int, default=200, help="паков в каждой категории библиотеки")
+    parser.add_argument("--eager", action="store_true", help="сравнить с построением всех страниц сразу")
+    parser.add_argument("--json", help="сохранить отчёты замеров в файл")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.eager)
+        return 0
+
+    from startup_profile import STARTUP_BUDGET_MS
+    workdir = make_workdir(args.packs)
+    try:
+        # Первый запуск прогревает кеш байткода и файловый кеш, в медиану не идёт
+        run_once(workdir, eager=False)
+        results = {"lazy": [run_once(workdir, eager=False) for _ in range(args.runs)]}
+        if args.eager:
+            results["eager"] = [run_once(workdir, eager=True) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    first_paint = summarize("lazy", results["lazy"])
+    if args.eager:
+        summarize("eager", results["eager"])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    verdict = "в пределах" if first_paint <= STARTUP_BUDGET_MS else "выше"
+    print(f"Цель {STARTUP_BUDGET_MS} мс: медиана {first_paint:.1f} мс — {verdict} цели")
+    return 0 if first_paint <= STARTUP_BUDGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import zipfile
+import argparse
+import platform
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from main import Worker
+from constants import APP_VERSION, CURSOR_LIB_PATH, ANIME_PATH, CLASSIC_PATH, MANIFEST_FILE, DOWNLOAD_CACHE_PATH
+import sync
+from favorites import FavoritesStore
+from search_index import SearchIndex
+from sample_cursors import make_cur, make_ani
+from bench_cursor_decode import ROLES
+from bench_search import make_names
+from stand_in_server import StandInServer
+
+# main.py включает журнал INFO; в выводе замеров он только мешает
+logging.getLogger().setLevel(logging.WARNING)
+
+# Сквозной набор замеров горячих путей на синтетических библиотеках разного размера:
+# открытие категории (Worker.load_cursors), фильтр выдачи (update_display), проверка
+# обновлений по локальному архиву (sync.check_library) и распаковка (sync.extract_zip).
+# Каждый размер собирается в своём рабочем каталоге с раскладкой как у приложения, и
+# замеры идут из него — модули берут относительные пути из constants.py.
+# Результаты пишутся в JSON; --compare сверяет их с отчётом прошлой версии.
+
+SIZES = (1000, 10000, 50000)
+QUERIES = ("", "a", "sw", "swan", "kamisato ayaka", "kamsato")
+# Доля паков, которые меняются между холодным и повторным открытием категории
+TOUCHED_FRACTION = 0.01
+# Замедление больше этой доли против прошлого отчёта считается регрессией
+REGRESSION_THRESHOLD = 0.2
+
+
+def make_samples(path, ani_roles):
+    # По одному файлу на роль: паки ссылаются на них жёсткими ссылками, и 50k паков
+    # не занимают 50k копий. Размеры как у типичных паков: .cur 32x32, .ani 8 кадров
+    os.makedirs(path)
+    samples = []
+    for pos, role in enumerate(ROLES):
+        if pos < ani_roles:
+            name, data = f"{role}.ani", make_ani(frames=8, seed=pos * 16)
+        else:
+            name, data = f"{role}.cur", make_cur(32, 32, 32 if pos % 2 else 8, seed=pos)
+        sample = os.path.join(path, name)
+        with open(sample, "wb") as f:
+            f.write(data)
+        samples.append((name, sample))
+    return samples
+
+
+def place(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def make_library(root, names, samples):
+    for name in names:
+        path = os.path.join(root, name)
+        os.makedirs(path)
+        for file_name, sample in samples:
+            place(sample, os.path.join(path, file_name))
+
+
+def make_archive(zip_path, library_root):
+    # CursorsLib.zip распаковывается в CURSOR_LIB_PATH: имена записей — пути относительно него
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for dirpath, _, files in os.walk(library_root):
+            for file_name in sorted(files):
+                path = os.path.join(dirpath, file_name)
+                zf.write(path, os.path.relpath(path, library_root).replace(os.sep, "/"))
+
+
+def timed(func, *args, repeat=1):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+class Suite:
+    def __init__(self):
+        self.results = []
+
+    def record(self, bench, case, packs, seconds, **extra):
+        self.results.append({"bench": bench, "case": case, "packs": packs, "seconds": round(seconds, 6), **extra})
+        details = ", ".join(f"{key} {value}" for key, value in extra.items())
+        print(f"{bench:>12} {case:<24} {packs:>6}: {seconds * 1000:10.2f} мс{'  (' + details + ')' if details else ''}",
+              flush=True)
+
+    def load_cursors(self, packs):
+        worker = Worker("anime")
+        cursors, elapsed = timed(worker.load_cursors)
+        self.record("load_cursors", "cold catalog", packs, elapsed, changed=len(worker.changed))
+        _, elapsed = timed(worker.load_cursors)
+        self.record("load_cursors", "unchanged", packs, elapsed, changed=len(worker.changed))
+        for name in list(cursors)[::max(1, int(1 / TOUCHED_FRACTION))]:
+            open(os.path.join(ANIME_PATH, name, "extra.cur"), "wb").close()
+        _, elapsed = timed(worker.load_cursors)
+        self.record("load_cursors", f"{TOUCHED_FRACTION:.0%} packs changed", packs, elapsed,
+                    changed=len(worker.changed))
+        return cursors
+
+    def filtering(self, packs, cursors, repeat):
+        # filter_cursors: выдача браузера — поиск по индексу Worker.run, избранное — FavoritesStore
+        index, elapsed = timed(SearchIndex, cursors)
+        _, postings = timed(index.build_postings)
+        self.record("filter", "index build", packs, elapsed + postings)
+        for query in QUERIES:
+            found, elapsed = timed(index.search, query, repeat=repeat)
+            self.record("filter", f"browser {query!r}", packs, elapsed, matches=len(found))
+        favorites = FavoritesStore((name, "anime") for name in list(cursors)[::10])
+        for query in QUERIES[:4]:
+            found, elapsed = timed(favorites.search, query, repeat=repeat)
+            self.record("filter", f"favorites {query!r}", packs, elapsed, matches=len(found))
+
+    def verify(self, packs, zip_path):
+        with open(zip_path, "rb") as f:
+            data = f.read()
+        if os.path.exists(MANIFEST_FILE):
+            os.remove(MANIFEST_FILE)
+        with StandInServer(data) as server:
+            outdated, elapsed = timed(sync.check_library, server.url)
+            self.record("verify", "central dir, cold hashes", packs, elapsed, outdated=outdated,
+                        bytes=server.bytes_sent)
+            sent = server.bytes_sent
+            outdated, elapsed = timed(sync.check_library, server.url)
+            self.record("verify", "central dir, warm hashes", packs, elapsed, outdated=outdated,
+                        bytes=server.bytes_sent - sent)
+        shutil.rmtree(DOWNLOAD_CACHE_PATH, ignore_errors=True)
+        with StandInServer(data, support_range=False) as server:
+            outdated, elapsed = timed(sync.check_library, server.url)
+            self.record("verify", "full archive", packs, elapsed, outdated=outdated, bytes=server.bytes_sent)
+
+    def extract(self, packs, zip_path):
+        report, elapsed = timed(sync.extract_zip, zip_path, "fresh_install")
+        self.record("extract", "fresh install", packs, elapsed, added=report.added)
+        report, elapsed = timed(sync.extract_zip, zip_path, CURSOR_LIB_PATH)
+        self.record("extract", "unchanged library", packs, elapsed, unchanged=report.unchanged)
+
+
+def run_size(suite, root, packs, samples, args):
+    workdir = os.path.join(root, f"library-{packs}")
+    os.makedirs(os.path.join(workdir, CLASSIC_PATH))
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        _, elapsed = timed(make_library, ANIME_PATH, make_names(packs), samples)
+        print(f"Библиотека {packs} паков собрана за {elapsed:.1f} с", flush=True)
+        cursors = suite.load_cursors(packs)
+        suite.filtering(packs, cursors, args.repeat)
+        if packs > args.sync_limit:
+            print(f"Проверка и распаковка пропущены: больше --sync-limit {args.sync_limit} паков", flush=True)
+            return
+        zip_path = os.path.join(root, "CursorsLib.zip")
+        make_archive(zip_path, CURSOR_LIB_PATH)
+        try:
+            suite.verify(packs, zip_path)
+            suite.extract(packs, zip_path)
+        finally:
+            os.remove(zip_path)
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(item["bench"], item["case"], item["packs"]): item["seconds"] for item in baseline["results"]}
+    regressions = 0
+    print(f"Сравнение с {baseline.get('version')} ({baseline_path}):")
+    for item in results:
+        before = previous.get((item["bench"], item["case"], item["packs"]))
+        if not before:
+            continue
+        ratio = item["seconds"] / before
+        regressed = ratio > 1 + REGRESSION_THRESHOLD
+        regressions += regressed
+        print(f"{item['bench']:>12} {item['case']:<24} {item['packs']:>6}: x{ratio:5.2f}{'  РЕГРЕССИЯ' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Набор замеров: каталог, поиск, проверка обновлений и распаковка")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="размеры библиотек в паках")
+    parser.add_argument("--ani-roles", type=int, default=3, help="анимированных ролей в паке")
+    parser.add_argument("--sync-limit", type=int, default=1000,
+                        help="проверку и распаковку архива гонять только на библиотеках не больше этого")
+    parser.add_argument("--repeat", type=int, default=5, help="повторов поиска, берётся лучший")
+    parser.add_argument("--json", help="сохранить результаты в файл")
+    parser.add_argument("--compare", help="отчёт прошлой версии для сравнения")
+    args = parser.parse_args()
+
+    suite = Suite()
+    root = tempfile.mkdtemp(prefix="cursors-suite-")
+    try:
+        samples = make_samples(os.path.join(root, "samples"), args.ani_roles)
+        for packs in args.sizes:
+            run_size(suite, root, packs, samples, args)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    report = {"version": APP_VERSION, "python": platform.python_version(), "platform": platform.platform(),
+              "cpus": os.cpu_count(), "results": suite.results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        return 1 if compare(suite.results, args.compare) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QMovie, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from thumbnails import ThumbnailService
+from bench_grid import ITEMS_PER_PAGE, make_library
+
+
+def legacy_page(paths):
+    # Прежний AnimatedGIF: QMovie и первый кадр декодируются синхронно в GUI-потоке
+    for path in paths:
+        movie = QMovie(path)
+        movie.setScaledSize(QSize(195, 150))
+        movie.jumpToFrame(0)
+        QPixmap(movie.currentPixmap())
+
+
+def service_page(app, service, paths):
+    # Возвращает (время блокировки GUI-потока, время до прихода всех миниатюр)
+    waiting = set()
+    start = time.perf_counter()
+    for path in paths:
+        if service.request(path) is None:
+            waiting.add(path)
+    blocked = time.perf_counter() - start
+
+    def on_ready(path, image):
+        waiting.discard(path)
+
+    service.ready.connect(on_ready)
+    while waiting:
+        app.processEvents()
+        time.sleep(0.0005)
+    service.ready.disconnect(on_ready)
+    return blocked, time.perf_counter() - start
+
+
+def mean_ms(values):
+    return sum(values) / len(values) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Отрисовка страницы превью: синхронный QMovie против ThumbnailService")
+    parser.add_argument("--packs", type=int, default=120)
+    parser.add_argument("--variants", type=int, default=120)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    root = tempfile.mkdtemp(prefix="cursors-thumbs-")
+    try:
+        packs = make_library(os.path.join(root, "lib"), args.packs, args.variants)
+        pages = [[path for _, path in packs[i:i + ITEMS_PER_PAGE]] for i in range(0, len(packs), ITEMS_PER_PAGE)]
+        cache_dir = os.path.join(root, "thumbnail_cache")
+
+        timings = []
+        for page in pages:
+            start = time.perf_counter()
+            legacy_page(page)
+            timings.append(time.perf_counter() - start)
+        print(f"legacy synchronous: {mean_ms(timings):7.2f} ms per page, all on the GUI thread")
+
+        for label in ("cold (empty cache)", "warm (disk cache)"):
+            service = ThumbnailService(cache_dir)
+            results = [service_page(app, service, page) for page in pages]
+            service.wait()
+            service.save_index()
+            print(f"{label:>18}: GUI blocked {mean_ms([r[0] for r in results]):6.2f} ms, "
+                  f"thumbnails ready after {mean_ms([r[1] for r in results]):7.2f} ms per page")
+        results = [service_page(app, service, page) for page in pages]
+        print(f"{'hot (memory)':>18}: GUI blocked {mean_ms([r[0] for r in results]):6.2f} ms, "
+              f"thumbnails ready after {mean_ms([r[1] for r in results]):7.2f} ms per page")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from user_data import UserDataStore
+
+
+def legacy_toggles(root, names):
+    # Прежний toggle_favorite: поиск в списке словарей и перезапись обоих JSON на каждый клик
+    favorites = []
+    recent = []
+    for name in names:
+        entry = {"name": name, "category": "anime"}
+        if entry in favorites:
+            favorites.remove(entry)
+        else:
+            favorites.append(entry)
+        with open(os.path.join(root, "recent_cursors.json"), "w") as f:
+            json.dump(recent, f, indent=2)
+        with open(os.path.join(root, "favorites.json"), "w") as f:
+            json.dump(favorites, f, indent=2)
+
+
+def store_toggles(root, names, batch):
+    # batch — сколько кликов успевает накопиться до срабатывания таймера сохранения
+    store = UserDataStore(os.path.join(root, "user_data.json"))
+    store.load()
+    for idx, name in enumerate(names):
+        store.set_favorite(name, "anime", (name, "anime") not in store.favorites)
+        if (idx + 1) % batch == 0:
+            store.flush()
+    store.flush()
+    return store
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Переключение избранного: перезапись JSON против журнала с пакетной записью")
+    parser.add_argument("--toggles", type=int, default=10000)
+    parser.add_argument("--legacy-toggles", type=int, default=2000)
+    args = parser.parse_args()
+
+    names = [f"Pack {idx:05d}" for idx in range(args.toggles)]
+    root = tempfile.mkdtemp(prefix="cursors-user-data-")
+    try:
+        # Прежний способ квадратичен по числу избранных, поэтому меряется на префиксе
+        legacy_names = names[:args.legacy_toggles]
+        _, elapsed = timed(legacy_toggles, root, legacy_names)
+        print(f"legacy JSON rewrite: {len(legacy_names)} toggles in {elapsed:.2f}s "
+              f"({elapsed / len(legacy_names) * 1000:.3f} ms per toggle)")
+
+        for batch in (1, 50, args.toggles):
+            run_dir = os.path.join(root, f"batch-{batch}")
+            os.makedirs(run_dir)
+            store, elapsed = timed(store_toggles, run_dir, names, batch)
+            print(f"journal, flush every {batch:>5}: {len(names)} toggles in {elapsed:.2f}s "
+                  f"({elapsed / len(names) * 1000:.3f} ms per toggle), favorites {len(store.favorites)}")
+
+        # Сбой посреди записи: недописанная строка журнала отбрасывается при загрузке
+        path = os.path.join(root, "batch-50", "user_data.json")
+        with open(path + ".journal", "a", encoding="utf-8") as f:
+            f.write('["fav-", "Pack 00')
+        reloaded = UserDataStore(path)
+        reloaded.load()
+        print(f"reload after torn journal write: {len(reloaded.favorites)} favorites")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+from validator import validate_category
+from bench_cursor_decode import make_library
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка целостности библиотеки: один процесс, пул процессов, кеш по stat")
+    parser.add_argument("--packs", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cursors-validate-")
+    try:
+        library = os.path.join(root, "Anime")
+        make_library(library, args.packs, ani_roles=3)
+        # Обрезанный файл, как после прерванной распаковки
+        broken = os.path.join(library, "Pack 00007", "pointer.ani")
+        with open(broken, "r+b") as f:
+            f.truncate(os.path.getsize(broken) // 2)
+
+        catalog = Catalog(os.path.join(root, "catalog.db"), {"anime": library})
+        catalog.refresh("anime")
+        runs = (("single process", dict(workers=1, full=True)),
+                (f"pool of {args.workers}", dict(workers=args.workers, full=True)),
+                ("cached (stat unchanged)", dict(workers=args.workers)))
+        for label, kwargs in runs:
+            (checked, packs, _), elapsed = timed(validate_category, catalog, "anime", **kwargs)
+            rate = f"{checked / elapsed:8.0f} files/s" if checked else "       — files/s"
+            print(f"{label:>24}: {elapsed:6.2f}s, checked {checked:6d}, {rate}, broken packs {sorted(packs)}")
+        catalog.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
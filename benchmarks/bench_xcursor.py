@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import Catalog
+from system_cursors import CursorApplier, XcursorBackend, scheme_values
+from xcursor import compile_themes
+from bench_cursor_decode import make_library
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сборка тем Xcursor: один процесс, пул процессов, кеш по хешу содержимого")
+    parser.add_argument("--packs", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="cursors-xcursor-")
+    try:
+        library = os.path.join(root, "Anime")
+        make_library(library, args.packs, ani_roles=3)
+        # make_library кладёт одинаковые файлы во все паки; хвост делает содержимое паков разным
+        for idx, name in enumerate(sorted(os.listdir(library))):
+            with open(os.path.join(library, name, "hand.cur"), "ab") as f:
+                f.write(idx.to_bytes(4, "little"))
+        catalog = Catalog(os.path.join(root, "catalog.db"), {"anime": library})
+        catalog.refresh("anime")
+        schemes = {name: scheme_values(catalog.scheme("anime", name)) for name in catalog.page("anime")}
+        catalog.close()
+
+        runs = (("single process", os.path.join(root, "cache-single"), 1),
+                (f"pool of {args.workers}", os.path.join(root, "cache-pool"), args.workers),
+                ("cached", os.path.join(root, "cache-pool"), args.workers))
+        for label, cache_dir, workers in runs:
+            jobs = [(name, values, cache_dir) for name, values in schemes.items()]
+            results, elapsed = timed(compile_themes, jobs, workers)
+            built = sum(1 for _, _, was_built, _ in results if was_built)
+            failed = sum(1 for _, _, _, error in results if error)
+            print(f"{label:>16}: {elapsed:6.2f}s, собрано {built:4d}, ошибок {failed}, {elapsed / len(jobs) * 1000:7.1f} мс на пак")
+
+        # Применение через тему: первое — со сборкой, повторное — переключение ссылки на кеш
+        backend = XcursorBackend(icons_dir=os.path.join(root, "icons"), cache_dir=os.path.join(root, "cache-apply"))
+        applier = CursorApplier(backend)
+        catalog = Catalog(os.path.join(root, "catalog.db"), {"anime": library})
+        first, second = (catalog.scheme("anime", name) for name in catalog.page("anime", limit=2))
+        catalog.close()
+        for label, scheme in (("apply (build)", first), ("apply (build)", second), ("re-apply", first), ("re-apply", second)):
+            _, elapsed = timed(applier.apply, scheme)
+            print(f"{label:>16}: {elapsed * 1000:7.1f} мс, собрано тем {backend.built}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
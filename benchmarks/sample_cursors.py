@@ -0,0 +1,43 @@
+import random
+import struct
+
+# Синтетические .cur и .ani для бенчмарков и проверки декодера: DIB с маской AND,
+# 32 бита с альфой или 8 бит с палитрой; ANI — RIFF ACON с anih, rate, seq и LIST fram
+
+
+def make_dib(width, height, bit_count, rng):
+    palette = b""
+    if bit_count == 8:
+        palette = bytes(rng.randrange(256) if idx % 4 != 3 else 0 for idx in range(256 * 4))
+        stride = ((width * 8 + 31) // 32) * 4
+        pixels = bytes(rng.randrange(256) for _ in range(stride * height))
+    else:
+        stride = width * 4
+        pixels = bytes(rng.randrange(256) for _ in range(stride * height))
+    mask_stride = ((width + 31) // 32) * 4
+    mask = bytes(rng.randrange(256) for _ in range(mask_stride * height))
+    header = struct.pack("<IiiHHIIiiII", 40, width, height * 2, 1, bit_count, 0,
+                         len(pixels) + len(mask), 0, 0, 256 if bit_count == 8 else 0, 0)
+    return header + palette + pixels + mask
+
+
+def make_cur(width=32, height=32, bit_count=32, hotspot=(0, 0), seed=0):
+    rng = random.Random(seed)
+    image = make_dib(width, height, bit_count, rng)
+    header = struct.pack("<HHH", 0, 2, 1)
+    entry = struct.pack("<BBBBHHII", width % 256, height % 256, 0, 0, hotspot[0], hotspot[1], len(image), 22)
+    return header + entry + image
+
+
+def chunk(tag, data):
+    return tag + struct.pack("<I", len(data)) + data + (b"\0" if len(data) & 1 else b"")
+
+
+def make_ani(frames=8, width=32, height=32, bit_count=32, jiffies=6, seed=0):
+    icons = b"".join(chunk(b"icon", make_cur(width, height, bit_count, seed=seed + idx)) for idx in range(frames))
+    steps = frames * 2
+    anih = struct.pack("<9I", 36, frames, steps, width, height, bit_count, 1, jiffies, 1)
+    rate = struct.pack(f"<{steps}I", *[jiffies + idx % 3 for idx in range(steps)])
+    seq = struct.pack(f"<{steps}I", *[idx % frames for idx in range(steps)])
+    body = b"ACON" + chunk(b"anih", anih) + chunk(b"rate", rate) + chunk(b"seq ", seq) + chunk(b"LIST", b"fram" + icons)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
@@ -0,0 +1,61 @@
+import random
+import struct
+
+# Несжатый GIF: LZW-поток из 9-битных литералов со сбросом словаря каждые 254 кода.
+# Нужен бенчмаркам, чтобы не тянуть Pillow ради тестовых preview.gif
+CLEAR_CODE = 256
+END_CODE = 257
+CODES_PER_CLEAR = 254
+
+
+def lzw_literals(pixels):
+    out = bytearray()
+    acc = 0
+    bits = 0
+
+    def emit(code):
+        nonlocal acc, bits
+        acc |= code << bits
+        bits += 9
+        while bits >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            bits -= 8
+
+    for pos in range(0, len(pixels), CODES_PER_CLEAR):
+        emit(CLEAR_CODE)
+        for pixel in pixels[pos:pos + CODES_PER_CLEAR]:
+            emit(pixel)
+    emit(END_CODE)
+    if bits:
+        out.append(acc & 0xFF)
+    return bytes(out)
+
+
+def sub_blocks(data):
+    blocks = bytearray()
+    for pos in range(0, len(data), 255):
+        chunk = data[pos:pos + 255]
+        blocks.append(len(chunk))
+        blocks += chunk
+    blocks.append(0)
+    return bytes(blocks)
+
+
+def make_gif(width=195, height=150, frames=8, delay_cs=8, seed=0):
+    rng = random.Random(seed)
+    palette = bytes(rng.randrange(256) for _ in range(768))
+    data = bytearray(b"GIF89a")
+    data += struct.pack("<HHBBB", width, height, 0xF7, 0, 0)
+    data += palette
+    data += b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00"
+    for frame in range(frames):
+        # Горизонтальные полосы, сдвигающиеся от кадра к кадру
+        base = rng.randrange(256)
+        row_colors = [(base + (y + frame * 4) // 6 * 17) % 256 for y in range(height)]
+        pixels = bytes(color for color in row_colors for _ in range(width))
+        data += b"\x21\xF9\x04\x00" + struct.pack("<H", delay_cs) + b"\x00\x00"
+        data += b"\x2C" + struct.pack("<HHHHB", 0, 0, width, height, 0)
+        data += b"\x08" + sub_blocks(lzw_literals(pixels))
+    data += b"\x3B"
+    return bytes(data)
@@ -0,0 +1,127 @@
+import re
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class StandInServer:
+    # Локальная замена GitHub Releases: отдаёт один файл с поддержкой Range,
+    # If-Range и If-None-Match, считает отправленные байты и умеет обрывать
+    # соединение на заданных смещениях файла (каждое смещение срабатывает один раз)
+    def __init__(self, data, support_range=True, drop_at=()):
+        self.data = data
+        self.support_range = support_range
+        self.etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        self.drop_at = sorted(drop_at)
+        self.bytes_sent = 0
+        self.requests = 0
+        self.statuses = []
+        # Запрошенные диапазоны ответов 206: (начало, конец) в смещениях файла
+        self.ranges = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        # Обрывы соединений со стороны клиента здесь ожидаемы
+        self.httpd.handle_error = lambda request, client_address: None
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/CursorsLib.zip"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, status, sent, start=0, end=0):
+        with self.lock:
+            self.bytes_sent += sent
+            self.requests += 1
+            self.statuses.append(status)
+            if status == 206:
+                self.ranges.append((start, end))
+
+    def _take_drop(self, start, end):
+        with self.lock:
+            for offset in self.drop_at:
+                if start < offset < end:
+                    self.drop_at.remove(offset)
+                    return offset
+        return None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self.serve(head=False)
+
+            def do_HEAD(self):
+                self.serve(head=True)
+
+            def serve(self, head):
+                data = server.data
+                total = len(data)
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", server.etag)
+                    self.end_headers()
+                    server._count(304, 0)
+                    return
+
+                start, end = 0, total
+                status = 200
+                range_header = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if range_header and server.support_range and if_range in (None, server.etag):
+                    match = re.match(r"bytes=(\d*)-(\d*)", range_header)
+                    if match.group(1):
+                        start = int(match.group(1))
+                        end = int(match.group(2)) + 1 if match.group(2) else total
+                    else:
+                        start = max(0, total - int(match.group(2)))
+                    end = min(end, total)
+                    if start >= total:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{total}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        server._count(416, 0)
+                        return
+                    status = 206
+                body = data[start:end]
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", server.etag)
+                if server.support_range:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end - 1}/{total}")
+                self.end_headers()
+                if head:
+                    server._count(status, 0)
+                    return
+
+                drop = server._take_drop(start, end)
+                if drop is not None:
+                    # Отдаём часть тела и рвём соединение, не досылая обещанный Content-Length
+                    body = body[:drop - start]
+                    self.close_connection = True
+                try:
+                    self.wfile.write(body)
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # Клиент закрыл соединение, не дочитав ответ
+                    return
+                server._count(status, len(body), start, end)
+
+        return Handler
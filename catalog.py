@@ -0,0 +1,312 @@
+import os
+import json
+import sqlite3
+import logging
+
+CATALOG_SCHEMA_VERSION = 4
+CURSOR_EXTENSIONS = (".cur", ".ani")
+PREVIEW_NAME = "preview.gif"
+# Для паков без preview.gif превью рисуется из самого курсора: сначала основная стрелка,
+# потом курсор ожидания; анимированный .ani предпочтительнее статичного .cur
+PREVIEW_ROLES = ("pointer", "normal", "arrow", "busy", "working", "work")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS packs (
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    preview TEXT,
+    scheme TEXT NOT NULL,
+    PRIMARY KEY (category, name)
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    category TEXT NOT NULL,
+    pack TEXT NOT NULL,
+    role TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    checked INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    PRIMARY KEY (category, pack, role)
+);
+CREATE INDEX IF NOT EXISTS cursors_path ON cursors (path);
+CREATE TABLE IF NOT EXISTS compiled (
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (category, name)
+);
+"""
+
+
+def cursor_role(file_name):
+    return file_name.lower().split(".")[0]
+
+
+def cursor_preview(files):
+    # files — [(роль, путь, размер)]; пустые файлы превью не дадут
+    files = [(role, path) for role, path, size in files if size > 0]
+
+    def rank(item):
+        role, path = item
+        priority = PREVIEW_ROLES.index(role) if role in PREVIEW_ROLES else len(PREVIEW_ROLES)
+        return (priority, not path.lower().endswith(".ani"), role)
+
+    return min(files, key=rank)[1] if files else None
+
+
+def pack_preview(path):
+    # Превью пака прямо с диска, для паков, которых ещё нет в каталоге
+    files = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.lower() == PREVIEW_NAME:
+                    return entry.path
+                if entry.name.lower().endswith(CURSOR_EXTENSIONS):
+                    files.append((cursor_role(entry.name), entry.path, entry.stat().st_size))
+    except OSError:
+        return None
+    return cursor_preview(files)
+
+
+class CatalogDelta:
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.changed = []
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+
+class Catalog:
+    # Индекс CursorsLib в SQLite: паки, роли курсоров с путями и stat-данными, превью.
+    # refresh() пересканирует только паки, у которых изменился mtime каталога,
+    # поэтому повторное открытие категории не требует обхода всей библиотеки.
+    # Соединение SQLite привязано к потоку: каждому потоку — свой экземпляр Catalog.
+    def __init__(self, db_path, roots):
+        self.roots = roots
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def close(self):
+        self.db.close()
+
+    def _init_schema(self):
+        self.db.executescript(SCHEMA)
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row and int(row[0]) == CATALOG_SCHEMA_VERSION:
+            return
+        # Таблицы пересоздаются: в новых версиях у них другие столбцы
+        self.db.executescript("DROP TABLE packs; DROP TABLE cursors; DROP TABLE compiled; DELETE FROM meta;" + SCHEMA)
+        with self.db:
+            self.db.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(CATALOG_SCHEMA_VERSION),))
+
+    def _check_root(self, category, root):
+        # Пути в индексе абсолютные: если библиотека переехала, индекс категории строится заново
+        key = f"root:{category}"
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        if row and row[0] == root:
+            return
+        self.db.execute("DELETE FROM packs WHERE category = ?", (category,))
+        self.db.execute("DELETE FROM cursors WHERE category = ?", (category,))
+        self.db.execute("DELETE FROM compiled WHERE category = ?", (category,))
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, root))
+
+    def refresh(self, category):
+        # Возвращает CatalogDelta с именами добавленных, удалённых и изменившихся паков
+        root = os.path.abspath(self.roots[category])
+        delta = CatalogDelta()
+        with self.db:
+            self._check_root(category, root)
+            stored = dict(self.db.execute("SELECT name, mtime_ns FROM packs WHERE category = ?", (category,)))
+            seen = set()
+            if os.path.isdir(root):
+                with os.scandir(root) as it:
+                    for entry in it:
+                        if not entry.is_dir():
+                            continue
+                        seen.add(entry.name)
+                        mtime_ns = entry.stat().st_mtime_ns
+                        if stored.get(entry.name) != mtime_ns:
+                            self._index_pack(category, entry.name, entry.path, mtime_ns)
+                            (delta.changed if entry.name in stored else delta.added).append(entry.name)
+            for name in set(stored) - seen:
+                self._remove_pack(category, name)
+                delta.removed.append(name)
+        if delta:
+            logging.info(f"Каталог {category}: добавлено {len(delta.added)}, удалено {len(delta.removed)}, "
+                         f"изменено {len(delta.changed)}")
+        return delta
+
+    def _index_pack(self, category, name, path, mtime_ns):
+        # Результаты проверки целостности переживают переиндексацию, пока у файла не изменились размер и mtime
+        checks = {row[0]: row[1:] for row in self.db.execute(
+            "SELECT path, size, mtime_ns, checked, error FROM cursors WHERE category = ? AND pack = ?",
+            (category, name))}
+        self.db.execute("DELETE FROM cursors WHERE category = ? AND pack = ?", (category, name))
+        # Собранная схема пака устаревает вместе с индексом в той же транзакции
+        self.db.execute("DELETE FROM compiled WHERE category = ? AND name = ?", (category, name))
+        preview = None
+        rows = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    # Preview.gif и PREVIEW.GIF тоже считаются превью
+                    if entry.name.lower() == PREVIEW_NAME:
+                        preview = entry.path
+                    elif entry.name.lower().endswith(CURSOR_EXTENSIONS):
+                        st = entry.stat()
+                        checked, error = 0, None
+                        previous = checks.get(entry.path)
+                        if previous and previous[:2] == (st.st_size, st.st_mtime_ns):
+                            checked, error = previous[2:]
+                        rows.append((category, name, cursor_role(entry.name), entry.path, st.st_size, st.st_mtime_ns,
+                                     checked, error))
+        except OSError as e:
+            logging.warning(f"Не удалось прочитать пак {path}: {str(e)}")
+        self.db.executemany("INSERT OR REPLACE INTO cursors VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        if preview is None:
+            preview = cursor_preview([(row[2], row[3], row[4]) for row in rows])
+        # Схема пака дублируется в packs одной JSON-строкой, чтобы load() читал по строке на пак
+        scheme = json.dumps({row[2]: row[3] for row in rows}, ensure_ascii=False)
+        self.db.execute("INSERT OR REPLACE INTO packs VALUES (?, ?, ?, ?, ?)", (category, name, mtime_ns, preview, scheme))
+
+    def _remove_pack(self, category, name):
+        self.db.execute("DELETE FROM packs WHERE category = ? AND name = ?", (category, name))
+        self.db.execute("DELETE FROM cursors WHERE category = ? AND pack = ?", (category, name))
+        self.db.execute("DELETE FROM compiled WHERE category = ? AND name = ?", (category, name))
+
+    def load(self, category):
+        # {pack: {role: abspath}} — тот же формат, что раньше строил Worker.load_cursors
+        rows = self.db.execute(
+            "SELECT name, scheme FROM packs WHERE category = ? AND scheme != '{}' ORDER BY name COLLATE NOCASE, name",
+            (category,))
+        return {name: json.loads(scheme) for name, scheme in rows}
+
+    def scheme(self, category, name):
+        # None — пака нет в индексе (категория ещё не сканировалась или пак удалён)
+        row = self.db.execute("SELECT scheme FROM packs WHERE category = ? AND name = ?", (category, name)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def preview(self, category, name):
+        # (есть ли пак в индексе, путь к preview.gif или курсору для превью, или None)
+        row = self.db.execute("SELECT preview FROM packs WHERE category = ? AND name = ?", (category, name)).fetchone()
+        return (True, row[0]) if row else (False, None)
+
+    def page(self, category, offset=0, limit=None):
+        rows = self.db.execute(
+            "SELECT name FROM packs WHERE category = ? AND scheme != '{}' "
+            "ORDER BY name COLLATE NOCASE, name LIMIT ? OFFSET ?",
+            (category, -1 if limit is None else limit, offset))
+        return [row[0] for row in rows]
+
+    def unvalidated(self, category):
+        # [(путь, размер, mtime)] файлов, которые ещё не проверялись в текущем виде
+        return self.db.execute(
+            "SELECT path, size, mtime_ns FROM cursors WHERE category = ? AND checked = 0", (category,)).fetchall()
+
+    def restat(self, category):
+        # Файл, переписанный или обрезанный на месте, не меняет mtime каталога пака, и refresh()
+        # его не замечает. Сверяем stat каждого файла с индексом: у изменившихся сбрасываем
+        # проверку и собранную схему пака. Возвращает имена паков с изменившимися файлами
+        rows = self.db.execute(
+            "SELECT pack, path, size, mtime_ns FROM cursors WHERE category = ?", (category,)).fetchall()
+        updates = []
+        packs = set()
+        for pack, path, size, mtime_ns in rows:
+            try:
+                st = os.stat(path)
+            except OSError:
+                # Удалённый файл меняет mtime каталога — его уберёт refresh()
+                continue
+            if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                updates.append((st.st_size, st.st_mtime_ns, path))
+                packs.add(pack)
+        if updates:
+            with self.db:
+                self.db.executemany(
+                    "UPDATE cursors SET size = ?, mtime_ns = ?, checked = 0, error = NULL WHERE path = ?", updates)
+                self.db.executemany("DELETE FROM compiled WHERE category = ? AND name = ?",
+                                    [(category, pack) for pack in packs])
+            logging.info(f"Каталог {category}: изменились файлы в паках {len(packs)}")
+        return sorted(packs)
+
+    def record_validation(self, results):
+        # results — [(путь, размер, mtime, ошибка или None)]; если файл успели изменить
+        # и переиндексировать, строка с новым stat не совпадёт и останется непроверенной
+        with self.db:
+            self.db.executemany(
+                "UPDATE cursors SET checked = 1, error = ? WHERE path = ? AND size = ? AND mtime_ns = ?",
+                [(error, path, size, mtime_ns) for path, size, mtime_ns, error in results])
+
+    def reset_validation(self, category):
+        with self.db:
+            self.db.execute("UPDATE cursors SET checked = 0, error = NULL WHERE category = ?", (category,))
+
+    def broken(self, category):
+        # {пак: [(роль, ошибка)]} для паков, где проверка нашла повреждённые файлы
+        broken = {}
+        rows = self.db.execute(
+            "SELECT pack, role, error FROM cursors WHERE category = ? AND error IS NOT NULL ORDER BY pack, role",
+            (category,))
+        for pack, role, error in rows:
+            broken.setdefault(pack, []).append((role, error))
+        return broken
+
+    def pack_files(self, category, names):
+        # {пак: [(роль, путь, размер, mtime)]} для паков из индекса; у пака без курсоров — пустой список
+        files = {}
+        for chunk in chunked(names):
+            rows = self.db.execute(
+                f"SELECT p.name, c.role, c.path, c.size, c.mtime_ns FROM packs p "
+                f"LEFT JOIN cursors c ON c.category = p.category AND c.pack = p.name "
+                f"WHERE p.category = ? AND p.name IN ({','.join('?' * len(chunk))})", (category, *chunk))
+            for name, role, path, size, mtime_ns in rows:
+                pack = files.setdefault(name, [])
+                if role is not None:
+                    pack.append((role, path, size, mtime_ns))
+        return files
+
+    def compiled(self, category, names):
+        # {пак: JSON собранной схемы} из кеша SchemeCache
+        result = {}
+        for chunk in chunked(names):
+            rows = self.db.execute(
+                f"SELECT name, data FROM compiled WHERE category = ? AND name IN ({','.join('?' * len(chunk))})",
+                (category, *chunk))
+            result.update(rows)
+        return result
+
+    def store_compiled(self, category, items):
+        # items — [(пак, JSON)]; только для паков, что есть в индексе: иначе запись некому сбросить
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO compiled SELECT category, name, ? FROM packs WHERE category = ? AND name = ?",
+                [(data, category, name) for name, data in items])
+
+    def locate(self, names):
+        # {пак: категория} — первая по имени категория, где пак есть в индексе
+        result = {}
+        for chunk in chunked(names):
+            rows = self.db.execute(
+                f"SELECT name, category FROM packs WHERE name IN ({','.join('?' * len(chunk))}) ORDER BY category",
+                chunk)
+            for name, category in rows:
+                result.setdefault(name, category)
+        return result
+
+
+def chunked(items, size=500):
+    # SQLite ограничивает число параметров запроса
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
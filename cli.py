@@ -0,0 +1,217 @@
+import sys
+import json
+import logging
+import argparse
+
+from constants import CATEGORY_PATHS, CATALOG_FILE, CURSOR_LIB_PATH, GITHUB_CURSORS_URL, XCURSOR_CACHE_PATH
+from validator import add_arguments as add_verify_arguments
+from system_cursors import BACKENDS
+
+# Консольный режим без Qt: list, search, sync, verify, apply <пак>, xcursor.
+# Модули команд импортируются внутри обработчиков, чтобы запуск не платил
+# за requests и прочее, что нужно только одной из команд; validator, system_cursors
+# и constants лёгкие.
+
+
+def open_catalog():
+    from catalog import Catalog
+    return Catalog(CATALOG_FILE, CATEGORY_PATHS)
+
+
+def category_names(catalog, category):
+    catalog.refresh(category)
+    return catalog.page(category)
+
+
+def cmd_list(args):
+    catalog = open_catalog()
+    try:
+        result = {category: category_names(catalog, category) for category in args.category or sorted(CATEGORY_PATHS)}
+    finally:
+        catalog.close()
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        for category, names in result.items():
+            for name in names:
+                print(f"{category}\t{name}")
+    return 0
+
+
+def cmd_search(args):
+    from search_index import SearchIndex
+    catalog = open_catalog()
+    try:
+        result = {}
+        for category in args.category or sorted(CATEGORY_PATHS):
+            result[category] = SearchIndex(category_names(catalog, category)).search(args.query, args.limit)
+    finally:
+        catalog.close()
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        for category, names in result.items():
+            for name in names:
+                print(f"{category}\t{name}")
+    return 0 if any(result.values()) else 1
+
+
+def print_progress(percent, text, *rest):
+    print(f"\r{percent:3d}% {text}", end="", file=sys.stderr, flush=True)
+
+
+def cmd_sync(args):
+    from sync import check_library, install_library
+    needs_update = check_library(args.url, progress=None if args.quiet else print_progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    if not needs_update:
+        print("Библиотека актуальна")
+        return 0
+    if args.check:
+        print("Доступно обновление библиотеки")
+        return 1
+
+    def extract_progress(done, total, file_name):
+        if not args.quiet:
+            print_progress(int(done / total * 100), file_name)
+
+    report = install_library(args.url, CURSOR_LIB_PATH, progress=None if args.quiet else print_progress,
+                             extract_progress=extract_progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Библиотека обновлена: {report}")
+    return 0
+
+
+def cmd_verify(args):
+    from validator import verify_library
+    return verify_library(args.category, args.workers, args.full, args.json)
+
+
+def find_scheme(catalog, name, categories):
+    # Сначала индекс как есть, затем с досканированием категории — пак мог появиться только что
+    for refresh in (False, True):
+        for category in categories:
+            if refresh:
+                catalog.refresh(category)
+            scheme = catalog.scheme(category, name)
+            if scheme:
+                return category, scheme
+    return None, None
+
+
+def cmd_apply(args):
+    from validator import check_file
+    catalog = open_catalog()
+    try:
+        category, scheme = find_scheme(catalog, args.pack, args.category or sorted(CATEGORY_PATHS))
+    finally:
+        catalog.close()
+    if not scheme:
+        print(f"Пак '{args.pack}' не найден", file=sys.stderr)
+        return 1
+    problems = [(role, error) for role, error in ((role, check_file(path)) for role, path in scheme.items()) if error]
+    if problems and not args.force:
+        # Повреждённый файл в реестре превратится в сломанный курсор системы
+        for role, error in problems:
+            print(f"{role}: {error}", file=sys.stderr)
+        print(f"Пак '{args.pack}' повреждён, --force применит его как есть", file=sys.stderr)
+        return 1
+    if args.dry_run:
+        print(json.dumps({"category": category, "scheme": scheme}, ensure_ascii=False, indent=2))
+        return 0
+
+    from system_cursors import CursorApplier, make_backend
+    from user_data import UserDataStore
+    from constants import USER_DATA_FILE, FAV_FILE, FAV_ANIME_FILE, RECENT_FILE
+    try:
+        CursorApplier(make_backend(args.backend)).apply(scheme)
+    except Exception as e:
+        print(f"Ошибка применения курсора {args.pack}: {str(e)}", file=sys.stderr)
+        return 1
+    user_data = UserDataStore(USER_DATA_FILE, legacy_favorites=[FAV_FILE, FAV_ANIME_FILE], legacy_recents=RECENT_FILE)
+    user_data.load()
+    user_data.touch_recent(args.pack)
+    user_data.flush()
+    print(f"Курсор '{args.pack}' ({category}) установлен")
+    return 0
+
+
+def cmd_xcursor(args):
+    # Заранее собирает темы Xcursor для паков, чтобы apply в Linux только переключал ссылку
+    from system_cursors import scheme_values
+    from xcursor import compile_themes
+    catalog = open_catalog()
+    try:
+        jobs = []
+        for category in args.category or sorted(CATEGORY_PATHS):
+            for name in category_names(catalog, category):
+                if not args.pack or name in args.pack:
+                    jobs.append((name, scheme_values(catalog.scheme(category, name)), args.cache))
+    finally:
+        catalog.close()
+    results = compile_themes(jobs, args.workers)
+    failed = [(title, error) for title, _, _, error in results if error]
+    built = sum(1 for _, _, was_built, _ in results if was_built)
+    for title, error in failed:
+        print(f"{title}: {error}", file=sys.stderr)
+    print(f"Тем Xcursor: собрано {built}, из кеша {len(results) - built - len(failed)}, с ошибками {len(failed)}")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Cursor Galaxy без графического интерфейса")
+    parser.add_argument("-v", "--verbose", action="store_true", help="подробный журнал")
+    commands = parser.add_subparsers(dest="command", required=True)
+    categories = sorted(CATEGORY_PATHS)
+
+    list_parser = commands.add_parser("list", help="паки библиотеки")
+    list_parser.add_argument("--category", choices=categories, action="append")
+    list_parser.add_argument("--json", action="store_true")
+    list_parser.set_defaults(handler=cmd_list)
+
+    search_parser = commands.add_parser("search", help="поиск паков по имени")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--category", choices=categories, action="append")
+    search_parser.add_argument("--limit", type=int)
+    search_parser.add_argument("--json", action="store_true")
+    search_parser.set_defaults(handler=cmd_search)
+
+    sync_parser = commands.add_parser("sync", help="сверить библиотеку с релизом и докачать изменения")
+    sync_parser.add_argument("--check", action="store_true", help="только проверить; код 1 — есть обновление")
+    sync_parser.add_argument("--url", default=GITHUB_CURSORS_URL)
+    sync_parser.add_argument("-q", "--quiet", action="store_true")
+    sync_parser.set_defaults(handler=cmd_sync)
+
+    verify_parser = commands.add_parser("verify", help="проверка целостности файлов курсоров")
+    add_verify_arguments(verify_parser)
+    verify_parser.set_defaults(handler=cmd_verify)
+
+    apply_parser = commands.add_parser("apply", help="установить пак курсоров")
+    apply_parser.add_argument("pack")
+    apply_parser.add_argument("--category", choices=categories, action="append")
+    apply_parser.add_argument("--force", action="store_true", help="применить даже повреждённый пак")
+    apply_parser.add_argument("--dry-run", action="store_true", help="только показать схему")
+    apply_parser.add_argument("--backend", choices=sorted(BACKENDS),
+                              help="куда записывать схему (по умолчанию реестр в Windows, тема Xcursor в Linux)")
+    apply_parser.set_defaults(handler=cmd_apply)
+
+    xcursor_parser = commands.add_parser("xcursor", help="собрать темы Xcursor для Linux")
+    xcursor_parser.add_argument("pack", nargs="*", help="паки (по умолчанию все)")
+    xcursor_parser.add_argument("--category", choices=categories, action="append")
+    xcursor_parser.add_argument("--workers", type=int, help="число процессов сборки")
+    xcursor_parser.add_argument("--cache", default=XCURSOR_CACHE_PATH, help="каталог собранных тем")
+    xcursor_parser.set_defaults(handler=cmd_xcursor)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
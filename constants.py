@@ -0,0 +1,49 @@
+import os
+
+# Пути и адреса, общие для окна и консольного cli.py. Модуль не тянет Qt и тяжёлые
+# зависимости: cli.py импортирует его при каждом запуске
+
+APP_VERSION = "v1.3.0"
+RECENT_FILE = "recent_cursors.json"
+FAV_FILE = "favorites.json"
+FAV_ANIME_FILE = "favorites_anime.json"
+USER_DATA_FILE = "user_data.json"
+CURSOR_LIB_PATH = "CursorsLib"
+ANIME_PATH = os.path.join(CURSOR_LIB_PATH, "CursorsLib", "Anime")
+CLASSIC_PATH = os.path.join(CURSOR_LIB_PATH, "CursorsLib", "Classic")
+CATEGORY_PATHS = {"anime": ANIME_PATH, "classic": CLASSIC_PATH}
+MANIFEST_FILE = "cursors_manifest.json"
+DOWNLOAD_CACHE_PATH = "download_cache"
+DOWNLOAD_SEGMENTS = 4
+CATALOG_FILE = "cursors_catalog.db"
+XCURSOR_CACHE_PATH = "xcursor_themes"
+GITHUB_CURSORS_URL = "https://github.com/ShustovCarleone/Cursor-Galaxy/releases/download/v1.2.0/CursorsLib.zip"
+
+CURSOR_KEYS = {
+    "pointer": "Arrow",
+    "help": "Help",
+    "busy": "Busy",
+    "link": "AppStarting",
+    "cross": "Crosshair",
+    "text": "IBeam",
+    "move": "SizeAll",
+    "dgn1": "SizeNESW",
+    "dgn2": "SizeNWSE",
+    "horz": "SizeWE",
+    "vert": "SizeNS",
+    "alternate": "AlternateSelect",
+    "unavailable": "No",
+    "work": "WorkingInBackground",
+    "hand": "Hand",
+    "normal": "Arrow",
+    "alternate2": "AlternateSelect",
+    "diagonal1": "SizeNESW",
+    "diagonal2": "SizeNWSE",
+    "handwriting": "Handwriting",
+    "horizontal": "SizeWE",
+    "vertical": "SizeNS",
+    "person": "Person",
+    "pin": "Pin",
+    "precision": "PrecisionSelect",
+    "working": "WorkingInBackground"
+}
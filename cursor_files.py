@@ -0,0 +1,325 @@
+import os
+import mmap
+import zlib
+import struct
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JIFFY_MS = 1000 / 60
+AF_ICON = 0x1
+
+
+class CursorImage:
+    # Один декодированный кадр: RGBA построчно сверху вниз (kind="rgba")
+    # или нетронутый PNG из файла (kind="png", декодирует вызывающий)
+    def __init__(self, width, height, hotspot, kind, data):
+        self.width = width
+        self.height = height
+        self.hotspot = hotspot
+        self.kind = kind
+        self.data = data
+
+
+class CursorFile:
+    # Разбор .cur (формат ICO) и .ani (RIFF ACON: anih, rate, seq , LIST fram) без WinAPI.
+    # Файл отображается в память через mmap; при открытии читаются только заголовки
+    # и таблица кадров, а пиксели выбранного размера декодируются по запросу в image().
+    # steps — порядок показа: список (номер кадра, задержка в мс).
+    def __init__(self, path):
+        self.path = path
+        self.frames = []
+        self.steps = []
+        self.animated = False
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("пустой файл")
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if self.data[:4] == b"RIFF":
+                self.parse_ani()
+            else:
+                self.frames.append(self.parse_icon_dir(0, len(self.data)))
+                self.steps.append((0, 0))
+        except (struct.error, IndexError) as e:
+            self.close()
+            raise ValueError(f"повреждённый файл курсора: {str(e)}")
+        except ValueError:
+            self.close()
+            raise
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def parse_icon_dir(self, base, end):
+        # Каталог ICO/CUR: список вариантов размера (ширина, высота, хотспот, смещение, длина)
+        reserved, kind, count = struct.unpack_from("<HHH", self.data, base)
+        if reserved != 0 or kind not in (1, 2) or count == 0:
+            raise ValueError("не ICO/CUR")
+        entries = []
+        for idx in range(count):
+            width, height, _, _, hot_x, hot_y, size, offset = struct.unpack_from(
+                "<BBBBHHII", self.data, base + 6 + idx * 16)
+            if kind == 1:
+                hot_x = hot_y = 0
+            start = base + offset
+            if start + size > end:
+                raise ValueError("кадр выходит за пределы файла")
+            entries.append((width or 256, height or 256, (hot_x, hot_y), start, size))
+        return entries
+
+    def parse_ani(self):
+        riff, length, form = struct.unpack_from("<4sI4s", self.data, 0)
+        if riff != b"RIFF" or form != b"ACON":
+            raise ValueError("не RIFF ACON")
+        end = min(len(self.data), 8 + length)
+        frame_count = step_count = 0
+        jif_rate = 0
+        flags = AF_ICON
+        rates = seq = None
+        pos = 12
+        while pos + 8 <= end:
+            chunk, size = struct.unpack_from("<4sI", self.data, pos)
+            body = pos + 8
+            if body + size > len(self.data):
+                raise ValueError(f"чанк {chunk.decode('latin-1')!r} обрезан")
+            if chunk == b"anih":
+                _, frame_count, step_count, _, _, _, _, jif_rate, flags = struct.unpack_from("<9I", self.data, body)
+            elif chunk == b"rate":
+                rates = struct.unpack_from(f"<{size // 4}I", self.data, body)
+            elif chunk == b"seq ":
+                seq = struct.unpack_from(f"<{size // 4}I", self.data, body)
+            elif chunk == b"LIST" and self.data[body:body + 4] == b"fram":
+                self.parse_frames(body + 4, body + size)
+            pos = body + size + (size & 1)
+
+        if not flags & AF_ICON:
+            raise ValueError("кадры ANI без ICO-заголовков не поддерживаются")
+        if not self.frames or (frame_count and len(self.frames) < frame_count):
+            raise ValueError("в ANI нет кадров")
+        step_count = step_count or len(self.frames)
+        for step in range(step_count):
+            frame = seq[step] if seq and step < len(seq) else step % len(self.frames)
+            if frame >= len(self.frames):
+                raise ValueError("seq ссылается на несуществующий кадр")
+            jiffies = rates[step] if rates and step < len(rates) else jif_rate
+            self.steps.append((frame, round(jiffies * JIFFY_MS)))
+        self.animated = len(self.steps) > 1
+
+    def parse_frames(self, pos, end):
+        while pos + 8 <= end:
+            chunk, size = struct.unpack_from("<4sI", self.data, pos)
+            body = pos + 8
+            if body + size > end:
+                raise ValueError("кадр LIST fram обрезан")
+            if chunk == b"icon":
+                self.frames.append(self.parse_icon_dir(body, body + size))
+            pos = body + size + (size & 1)
+
+    def validate(self):
+        # Проверка без декодирования пикселей: заголовки всех вариантов всех кадров
+        # и то, что данные изображения помещаются в границы своей записи
+        for entries in self.frames:
+            for width, height, _, start, length in entries:
+                if self.data[start:start + 8] == PNG_SIGNATURE:
+                    if length < 33 or self.data[start + 12:start + 16] != b"IHDR":
+                        raise ValueError("повреждённый PNG-кадр")
+                    continue
+                if length < 40:
+                    raise ValueError("обрезанный заголовок DIB")
+                header_size, dib_width, dib_height, _, bit_count, compression = struct.unpack_from(
+                    "<IiiHHI", self.data, start)
+                if header_size < 40 or dib_width <= 0 or dib_height <= 0:
+                    raise ValueError("неверный заголовок DIB")
+                if bit_count not in (1, 4, 8, 24, 32) or compression != 0:
+                    raise ValueError(f"неподдерживаемый формат DIB ({bit_count} бит, сжатие {compression})")
+                colors = 0
+                if bit_count <= 8:
+                    colors = struct.unpack_from("<I", self.data, start + 32)[0] or (1 << bit_count)
+                stride = ((dib_width * bit_count + 31) // 32) * 4
+                if header_size + colors * 4 + stride * (dib_height // 2) > length:
+                    raise ValueError("пиксели кадра выходят за границы записи")
+        return len(self.frames)
+
+    def best_entry(self, frame, size=None):
+        # Наименьший вариант не меньше size, иначе самый крупный
+        entries = sorted(self.frames[frame], key=lambda entry: entry[0] * entry[1])
+        if size:
+            for entry in entries:
+                if entry[0] >= size and entry[1] >= size:
+                    return entry
+        return entries[-1]
+
+    def image(self, frame=0, size=None):
+        return self.entry_image(self.best_entry(frame, size))
+
+    def entry_image(self, entry):
+        # Вариант кадра из frames[кадр] как есть, без выбора размера
+        width, height, hotspot, start, length = entry
+        if self.data[start:start + 8] == PNG_SIGNATURE:
+            return CursorImage(width, height, hotspot, "png", self.data[start:start + length])
+        return CursorImage(width, height, hotspot, "rgba", self.decode_dib(start, length))
+
+    def decode_dib(self, start, length):
+        header_size, width, height, _, bit_count, compression = struct.unpack_from("<IiiHHI", self.data, start)
+        if compression != 0:
+            raise ValueError(f"сжатые DIB не поддерживаются ({compression})")
+        # В ICO высота записана вдвое: цветные строки плюс маска AND
+        height //= 2
+        colors_used = struct.unpack_from("<I", self.data, start + 32)[0]
+        pos = start + header_size
+        palette = None
+        if bit_count <= 8:
+            colors = colors_used or (1 << bit_count)
+            palette = self.data[pos:pos + colors * 4]
+            pos += colors * 4
+        stride = ((width * bit_count + 31) // 32) * 4
+        mask_stride = ((width + 31) // 32) * 4
+        xor = self.data[pos:pos + stride * height]
+        mask = self.data[pos + stride * height:pos + stride * height + mask_stride * height]
+        if len(xor) < stride * height:
+            raise ValueError("обрезанные пиксели DIB")
+
+        # Строки DIB идут снизу вверх
+        rows = b"".join(xor[stride * y:stride * y + stride] for y in range(height - 1, -1, -1))
+        rgba = expand_pixels(rows, width, height, stride, bit_count, palette)
+        if bit_count != 32 or not any(rgba[3::4]):
+            # Без альфа-канала прозрачность берётся из маски AND
+            apply_mask(rgba, mask, width, height, mask_stride)
+        return bytes(rgba)
+
+
+def expand_pixels(rows, width, height, stride, bit_count, palette):
+    # Каналы раскладываются срезами и bytes.translate, без цикла по пикселям
+    rgba = bytearray(width * height * 4)
+    if bit_count == 32:
+        rgba[0::4] = rows[2::4]
+        rgba[1::4] = rows[1::4]
+        rgba[2::4] = rows[0::4]
+        rgba[3::4] = rows[3::4]
+        return rgba
+    if bit_count == 24:
+        packed = b"".join(rows[stride * y:stride * y + width * 3] for y in range(height))
+        rgba[0::4] = packed[2::3]
+        rgba[1::4] = packed[1::3]
+        rgba[2::4] = packed[0::3]
+        rgba[3::4] = b"\xff" * (width * height)
+        return rgba
+    if bit_count not in (1, 4, 8):
+        raise ValueError(f"глубина цвета {bit_count} не поддерживается")
+    if bit_count == 8:
+        indices = b"".join(rows[stride * y:stride * y + width] for y in range(height))
+    else:
+        table = UNPACK_TABLES[bit_count]
+        indices = b"".join(b"".join(table[byte] for byte in rows[stride * y:stride * y + stride])[:width]
+                           for y in range(height))
+    palette = bytes(palette).ljust(256 * 4, b"\0")
+    rgba[0::4] = indices.translate(palette[2::4])
+    rgba[1::4] = indices.translate(palette[1::4])
+    rgba[2::4] = indices.translate(palette[0::4])
+    rgba[3::4] = b"\xff" * (width * height)
+    return rgba
+
+
+def unpack_table(bit_count):
+    # Байт упакованных индексов -> индексы по байту на пиксель
+    value_mask = (1 << bit_count) - 1
+    shifts = range(8 - bit_count, -1, -bit_count)
+    return [bytes((byte >> shift) & value_mask for shift in shifts) for byte in range(256)]
+
+
+UNPACK_TABLES = {1: unpack_table(1), 4: unpack_table(4)}
+MASK_TABLE = [bytes(0 if byte & (0x80 >> bit) else 255 for bit in range(8)) for byte in range(256)]
+
+
+def apply_mask(rgba, mask, width, height, mask_stride):
+    row_bytes = width * 4
+    for y in range(height):
+        src = mask_stride * (height - 1 - y)
+        alpha = b"".join(MASK_TABLE[byte] for byte in mask[src:src + mask_stride])[:width]
+        if len(alpha) < width:
+            alpha = alpha.ljust(width, b"\xff")
+        rgba[y * row_bytes + 3:(y + 1) * row_bytes:4] = alpha
+
+
+def decode_png(data):
+    # Кадр PNG из курсора -> (ширина, высота, RGBA). Только то, что встречается в курсорах:
+    # 8 бит на канал, RGB или RGBA, без чересстрочности
+    data = bytes(data)
+    if data[:8] != PNG_SIGNATURE:
+        raise ValueError("не PNG")
+    pos = 8
+    header = None
+    idat = []
+    while pos + 8 <= len(data):
+        length, chunk = struct.unpack_from(">I4s", data, pos)
+        body = data[pos + 8:pos + 8 + length]
+        if len(body) < length:
+            raise ValueError(f"чанк PNG {chunk!r} обрезан")
+        if chunk == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body[:13])
+        elif chunk == b"IDAT":
+            idat.append(body)
+        elif chunk == b"IEND":
+            break
+        pos += 12 + length
+    if header is None:
+        raise ValueError("в PNG нет IHDR")
+    width, height, depth, color_type, _, _, interlace = header
+    if depth != 8 or color_type not in (2, 6) or interlace:
+        raise ValueError(f"PNG-кадр не поддерживается (глубина {depth}, тип {color_type}, чересстрочный {interlace})")
+    channels = 4 if color_type == 6 else 3
+    try:
+        raw = zlib.decompress(b"".join(idat))
+    except zlib.error as e:
+        raise ValueError(f"повреждённый PNG-кадр: {str(e)}")
+    stride = width * channels
+    if len(raw) < (stride + 1) * height:
+        raise ValueError("обрезанные пиксели PNG")
+    pixels = unfilter_png(raw, stride, height, channels)
+    if channels == 4:
+        return width, height, bytes(pixels)
+    rgba = bytearray(width * height * 4)
+    rgba[0::4] = pixels[0::3]
+    rgba[1::4] = pixels[1::3]
+    rgba[2::4] = pixels[2::3]
+    rgba[3::4] = b"\xff" * (width * height)
+    return width, height, bytes(rgba)
+
+
+def unfilter_png(raw, stride, height, bpp):
+    out = bytearray(stride * height)
+    prev = bytearray(stride)
+    pos = 0
+    for y in range(height):
+        kind = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += stride + 1
+        if kind == 1:
+            for x in range(bpp, stride):
+                line[x] = (line[x] + line[x - bpp]) & 0xff
+        elif kind == 2:
+            line = bytearray((a + b) & 0xff for a, b in zip(line, prev))
+        elif kind == 3:
+            for x in range(stride):
+                left = line[x - bpp] if x >= bpp else 0
+                line[x] = (line[x] + ((left + prev[x]) >> 1)) & 0xff
+        elif kind == 4:
+            for x in range(stride):
+                a = line[x - bpp] if x >= bpp else 0
+                b = prev[x]
+                c = prev[x - bpp] if x >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                line[x] = (line[x] + (a if pa <= pb and pa <= pc else b if pb <= pc else c)) & 0xff
+        elif kind != 0:
+            raise ValueError(f"неизвестный фильтр PNG {kind}")
+        out[y * stride:(y + 1) * stride] = line
+        prev = line
+    return out
@@ -0,0 +1,408 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from manifest import atomic_write_json
+
+CACHE_INDEX_NAME = "index.json"
+DEFAULT_CACHE_LIMIT = 1024 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = (10, 60)
+RETRY_LIMIT = 5
+RETRY_DELAY = 1.0
+SEGMENT_MIN_SIZE = 8 * 1024 * 1024
+
+
+def response_validators(headers):
+    return {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "size": int(headers.get("Content-Length") or 0) or None,
+    }
+
+
+def same_version(a, b):
+    if a.get("size") and b.get("size") and a["size"] != b["size"]:
+        return False
+    if a.get("etag") and b.get("etag"):
+        return a["etag"] == b["etag"]
+    if a.get("last_modified") and b.get("last_modified"):
+        return a["last_modified"] == b["last_modified"]
+    return False
+
+
+class DownloadCache:
+    # Локальный кэш скачанных архивов. Ключ — SHA-256 от URL и валидаторов ответа
+    # (ETag, Last-Modified, размер), поэтому новая версия архива по тому же URL
+    # получает новый ключ, а старая со временем вытесняется по LRU.
+    def __init__(self, root, max_bytes=DEFAULT_CACHE_LIMIT):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, CACHE_INDEX_NAME)
+        os.makedirs(root, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Индекс кэша загрузок повреждён и будет пересоздан: {str(e)}")
+            return {}
+
+    def _save_index(self):
+        atomic_write_json(self.index_path, self.index)
+
+    @staticmethod
+    def cache_key(url, validators):
+        if not validators.get("etag") and not validators.get("last_modified"):
+            return None
+        raw = "\n".join([url, validators.get("etag") or "", validators.get("last_modified") or "",
+                         str(validators.get("size") or "")])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.root, key + ".zip")
+
+    def lookup(self, url, validators):
+        key = self.cache_key(url, validators)
+        entry = self.index.get(key) if key else None
+        if not entry:
+            return None
+        path = self.entry_path(key)
+        if not os.path.exists(path) or os.path.getsize(path) != entry["size"]:
+            logging.warning(f"Файл кэша {path} отсутствует или повреждён")
+            self.index.pop(key, None)
+            self._save_index()
+            return None
+        entry["used"] = time.time()
+        self._save_index()
+        return path
+
+    def latest(self, url):
+        # Последняя сохранённая версия архива по этому URL — её валидаторы
+        # отправляются в условном запросе
+        entries = [(key, entry) for key, entry in self.index.items() if entry["url"] == url]
+        if not entries:
+            return None, None
+        key, entry = max(entries, key=lambda item: item[1].get("stored", item[1]["used"]))
+        validators = {"etag": entry["etag"], "last_modified": entry["last_modified"], "size": entry["size"]}
+        path = self.lookup(url, validators)
+        return (path, validators) if path else (None, None)
+
+    def part_path(self, url):
+        # Постоянное имя недокачанного файла, чтобы загрузку можно было продолжить после перезапуска
+        return os.path.join(self.root, hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".part")
+
+    def commit(self, url, validators, temp_path):
+        # Переносим скачанный файл в кэш. Без валидаторов ключ построить нельзя,
+        # и файл остаётся временным — вызывающий сам его удалит.
+        key = self.cache_key(url, validators)
+        if not key:
+            return None
+        path = self.entry_path(key)
+        os.replace(temp_path, path)
+        self.index[key] = {
+            "url": url,
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "size": os.path.getsize(path),
+            "used": time.time(),
+            "stored": time.time(),
+        }
+        self.evict(keep=key)
+        self._save_index()
+        return path
+
+    def total_size(self):
+        return sum(entry["size"] for entry in self.index.values())
+
+    def evict(self, keep=None):
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["used"]):
+            if self.total_size() <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            logging.info(f"Удаление из кэша загрузок: {entry['url']} ({entry['size']} байт)")
+            try:
+                os.remove(self.entry_path(key))
+            except OSError:
+                pass
+            del self.index[key]
+
+
+class IncompleteDownload(Exception):
+    pass
+
+
+class ArchiveChanged(Exception):
+    pass
+
+
+class DownloadResult:
+    def __init__(self, path, validators, not_modified=False, resumed_from=0):
+        self.path = path
+        self.validators = validators
+        self.not_modified = not_modified
+        self.resumed_from = resumed_from
+
+
+class Downloader:
+    # Загрузка в .part-файл с продолжением после обрыва. Рядом с .part хранится .part.json
+    # с URL и валидаторами ответа: по ним при следующей попытке отправляется Range + If-Range,
+    # и сервер либо досылает остаток (206), либо отдаёт изменившийся файл целиком (200).
+    # При segments > 1 большой файл делится на диапазоны, которые качаются параллельно
+    # в заранее выделенный .part; прогресс сегментов в .part.json позволяет продолжить и их.
+    def __init__(self, session=None, progress=None, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                 retries=RETRY_LIMIT, retry_delay=RETRY_DELAY, timeout=DOWNLOAD_TIMEOUT,
+                 segments=1, segment_min_size=SEGMENT_MIN_SIZE):
+        if session is None:
+            session = requests.Session()
+            if segments > 1:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=segments)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+        self.session = session
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.segments = segments
+        self.segment_min_size = segment_min_size
+        self._lock = threading.Lock()
+
+    def download(self, url, part_path, known=None):
+        attempt = 0
+        while True:
+            try:
+                return self._attempt(url, part_path, known)
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError, IncompleteDownload) as e:
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                logging.warning(f"Загрузка прервана ({str(e)}), повтор {attempt} из {self.retries}")
+                time.sleep(self.retry_delay * attempt)
+
+    def _load_meta(self, url, part_path):
+        meta_path = part_path + ".json"
+        if not os.path.exists(part_path) or not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except Exception:
+            return None
+        return meta if meta.get("url") == url else None
+
+    @staticmethod
+    def _if_range(validators):
+        # If-Range допускает только сильный ETag
+        etag = validators.get("etag")
+        return etag if etag and not etag.startswith("W/") else validators.get("last_modified")
+
+    @staticmethod
+    def _conditional_headers(known):
+        headers = {}
+        if known:
+            if known.get("etag"):
+                headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                headers["If-Modified-Since"] = known["last_modified"]
+        return headers
+
+    def _request_headers(self, meta, offset, known):
+        headers = self._conditional_headers(known)
+        if meta and offset:
+            validator = self._if_range(meta)
+            if validator:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+        return headers
+
+    def _attempt(self, url, part_path, known):
+        meta = self._load_meta(url, part_path)
+        if self.segments > 1:
+            result = self._attempt_segmented(url, part_path, known, meta)
+            if result is not None:
+                return result
+        if meta and meta.get("segments"):
+            # Недокачанный сегментированный файл предвыделен целиком, продолжить его одним потоком нельзя
+            meta = None
+        offset = os.path.getsize(part_path) if meta else 0
+        headers = self._request_headers(meta, offset, known)
+        if "Range" not in headers:
+            offset = 0
+
+        response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        with response:
+            if response.status_code == 304:
+                logging.info("Сервер ответил 304 Not Modified")
+                return DownloadResult(None, known, not_modified=True)
+            if response.status_code == 416 and offset and meta.get("size") == offset:
+                # Файл был докачан полностью, но не успел перейти в кэш
+                self._finish(part_path)
+                return DownloadResult(part_path, meta, resumed_from=offset)
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                match = re.match(r"bytes (\d+)-(\d+)/(\d+|\*)", response.headers.get("Content-Range", ""))
+                if not match or int(match.group(1)) != offset:
+                    self._discard(part_path)
+                    raise IncompleteDownload("Сервер вернул неожиданный диапазон")
+                validators = dict(meta)
+                validators.pop("url", None)
+                if match.group(3) != "*":
+                    validators["size"] = int(match.group(3))
+                mode = "ab"
+                logging.info(f"Продолжение загрузки с {offset} байт")
+            else:
+                validators = response_validators(response.headers)
+                if known and same_version(validators, known):
+                    # Сервер проигнорировал условные заголовки, но версия та же
+                    return DownloadResult(None, known, not_modified=True)
+                offset = 0
+                mode = "wb"
+                atomic_write_json(part_path + ".json", {"url": url, **validators})
+
+            total = validators.get("size") or 0
+            downloaded = offset
+            start_time = time.time()
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if self.progress:
+                            elapsed_time = time.time() - start_time
+                            speed = ((downloaded - offset) / 1024 / 1024) / elapsed_time if elapsed_time > 0 else 0
+                            self.progress(downloaded, total, speed)
+
+        if total and downloaded != total:
+            raise IncompleteDownload(f"Получено {downloaded} из {total} байт")
+        self._finish(part_path)
+        return DownloadResult(part_path, validators, resumed_from=offset)
+
+    def _attempt_segmented(self, url, part_path, known, meta):
+        if meta and meta.get("segments") and os.path.getsize(part_path) == meta.get("size"):
+            validators = {key: meta[key] for key in ("etag", "last_modified", "size")}
+            segments = meta["segments"]
+            logging.info("Продолжение сегментированной загрузки")
+        else:
+            response = self.session.head(url, headers=self._conditional_headers(known),
+                                         allow_redirects=True, timeout=self.timeout)
+            if response.status_code == 304:
+                logging.info("Сервер ответил 304 Not Modified")
+                return DownloadResult(None, known, not_modified=True)
+            response.raise_for_status()
+            validators = response_validators(response.headers)
+            if known and same_version(validators, known):
+                return DownloadResult(None, known, not_modified=True)
+            size = validators.get("size") or 0
+            if (response.headers.get("Accept-Ranges", "").lower() != "bytes" or size < self.segment_min_size
+                    or not self._if_range(validators)):
+                return None
+            step = -(-size // self.segments)
+            segments = [[start, min(start + step, size), start] for start in range(0, size, step)]
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+            self._save_segments(url, part_path, validators, segments)
+            logging.info(f"Сегментированная загрузка: {len(segments)} диапазонов по {step} байт")
+
+        total = validators["size"]
+        if_range = self._if_range(validators)
+        self._downloaded = sum(pos - start for start, _, pos in segments)
+        self._start_time = time.time()
+        self._start_downloaded = self._downloaded
+        pending = [segment for segment in segments if segment[2] < segment[1]]
+        fd = os.open(part_path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            with ThreadPoolExecutor(max_workers=len(pending) or 1) as pool:
+                futures = [pool.submit(self._fetch_segment, url, fd, segment, if_range, total) for segment in pending]
+                errors = [future.exception() for future in as_completed(futures)]
+        finally:
+            os.close(fd)
+        errors = [error for error in errors if error is not None]
+        if any(isinstance(error, ArchiveChanged) for error in errors):
+            self._discard(part_path)
+            raise IncompleteDownload("Архив изменился во время загрузки")
+        if errors:
+            self._save_segments(url, part_path, validators, segments)
+            raise errors[0]
+        self._finish(part_path)
+        return DownloadResult(part_path, validators)
+
+    def _fetch_segment(self, url, fd, segment, if_range, total):
+        _, end, pos = segment
+        headers = {"Range": f"bytes={pos}-{end - 1}", "If-Range": if_range}
+        response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        with response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise ArchiveChanged()
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                if chunk:
+                    self._write_at(fd, pos, chunk)
+                    pos += len(chunk)
+                    segment[2] = pos
+                    self._report_segment(len(chunk), total)
+        if pos != end:
+            raise IncompleteDownload(f"Диапазон {segment[0]}-{end - 1} получен не полностью")
+
+    def _write_at(self, fd, offset, data):
+        if hasattr(os, "pwrite"):
+            os.pwrite(fd, data, offset)
+        else:
+            # На Windows нет pwrite: позиционирование и запись под общей блокировкой
+            with self._lock:
+                os.lseek(fd, offset, os.SEEK_SET)
+                os.write(fd, data)
+
+    def _report_segment(self, size, total):
+        with self._lock:
+            self._downloaded += size
+            if self.progress:
+                elapsed_time = time.time() - self._start_time
+                loaded = self._downloaded - self._start_downloaded
+                speed = (loaded / 1024 / 1024) / elapsed_time if elapsed_time > 0 else 0
+                self.progress(self._downloaded, total, speed)
+
+    def _save_segments(self, url, part_path, validators, segments):
+        atomic_write_json(part_path + ".json", {"url": url, **validators, "segments": segments})
+
+    def _finish(self, part_path):
+        try:
+            os.remove(part_path + ".json")
+        except OSError:
+            pass
+
+    def _discard(self, part_path):
+        self._finish(part_path)
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+
+
+def fetch_archive(url, cache, progress=None, session=None, segments=1):
+    # Общая точка загрузки архива для проверки и установки. Возвращает путь к архиву
+    # и признак того, что файл временный (ответ без валидаторов в кэш не попадает).
+    known_path, known = cache.latest(url)
+    downloader = Downloader(session=session, progress=progress, segments=segments)
+    result = downloader.download(url, cache.part_path(url), known)
+    if result.not_modified:
+        logging.info("Архив этой версии уже есть в кэше загрузок")
+        return known_path, False
+    path = cache.commit(url, result.validators, result.path)
+    if path:
+        return path, False
+    return result.path, True
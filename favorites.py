@@ -0,0 +1,75 @@
+from search_index import SearchIndex
+
+
+class FavoritesStore:
+    # Избранное: упорядоченный словарь (name, category) -> True вместо списка словарей
+    # и индекс имя -> категории для карточек и поиска. Схемы паков — в schemes.SchemeCache
+    def __init__(self, entries=()):
+        self.entries = {}
+        self.categories = {}
+        self.search_index = SearchIndex()
+        for name, category in entries:
+            self.add(name, category)
+
+    @staticmethod
+    def parse(data):
+        # Старый формат — список имён (всё из Anime), новый — список {"name", "category"}
+        entries = []
+        for item in data or []:
+            if isinstance(item, str):
+                entries.append((item, "anime"))
+            elif isinstance(item, dict) and item.get("name"):
+                entries.append((item["name"], item.get("category", "anime")))
+        return entries
+
+    def to_json(self):
+        return [{"name": name, "category": category} for name, category in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add(self, name, category):
+        if (name, category) in self.entries:
+            return
+        self.entries[(name, category)] = True
+        self.categories.setdefault(name, []).append(category)
+        self.search_index.add(name)
+
+    def remove(self, name, category):
+        if self.entries.pop((name, category), None) is None:
+            return
+        categories = self.categories[name]
+        categories.remove(category)
+        if not categories:
+            del self.categories[name]
+            self.search_index.remove(name)
+
+    def toggle(self, name, category):
+        if (name, category) in self.entries:
+            self.remove(name, category)
+            return False
+        self.add(name, category)
+        return True
+
+    def category_of(self, name, default="anime"):
+        # Первая по порядку добавления категория, в которой пак есть в избранном
+        categories = self.categories.get(name)
+        return categories[0] if categories else default
+
+    def names(self):
+        names = []
+        for name, category in self.entries:
+            if self.categories[name][0] == category:
+                names.append(name)
+        return names
+
+    def search(self, query):
+        # Без запроса — порядок добавления, с запросом — ранжированная выдача индекса;
+        # диск при этом не читается
+        return self.search_index.search(query) if query.strip() else self.names()
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+
+class FrameCache:
+    # Общий LRU-кеш декодированных кадров анимаций с ограничением по памяти.
+    # Значение — список кадров, стоимость в байтах считает вызывающий код;
+    # при превышении бюджета вытесняются давно не использованные анимации.
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, frames, cost):
+        if cost > self.budget_bytes:
+            # Анимация больше всего бюджета: не кешируем, чтобы не вытеснить всё остальное
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self.entries[key] = (frames, cost)
+        self.total_bytes += cost
+        while self.total_bytes > self.budget_bytes:
+            _, (_, evicted_cost) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_cost
+            self.evictions += 1
+
+    def discard(self, path):
+        # Удаляет кадры файла во всех размерах (ключи вида (path, ширина, высота))
+        for key in [key for key in self.entries if key[0] == path]:
+            self.total_bytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
@@ -0,0 +1,152 @@
+import os
+import zlib
+import shutil
+import zipfile
+import logging
+
+STAGING_SUFFIX = ".staging"
+BACKUP_SUFFIX = ".old"
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class InstallReport:
+    def __init__(self):
+        self.added = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+
+    def __str__(self):
+        return (f"добавлено {self.added}, изменено {self.changed}, без изменений {self.unchanged}, "
+                f"удалено {self.removed}; записано {self.bytes_written} байт, пропущено {self.bytes_skipped} байт")
+
+
+def file_crc32(path):
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def safe_member_path(name):
+    # Отбрасываем записи с абсолютными путями и выходом за пределы каталога установки
+    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+    if not parts or ".." in parts or ":" in parts[0]:
+        return None
+    return "/".join(parts)
+
+
+def recover_install(install_dir):
+    # Доводим до конца или откатываем установку, прерванную посреди подмены каталогов
+    staging = install_dir + STAGING_SUFFIX
+    backup = install_dir + BACKUP_SUFFIX
+    if not os.path.exists(install_dir) and os.path.exists(backup):
+        logging.warning(f"Восстановление {install_dir} после прерванной установки")
+        os.replace(backup, install_dir)
+    if os.path.exists(staging):
+        shutil.rmtree(staging, ignore_errors=True)
+    if os.path.exists(backup):
+        shutil.rmtree(backup, ignore_errors=True)
+
+
+class DeltaInstaller:
+    # Дифференциальная установка архива: в соседнем staging-каталоге собирается новое
+    # дерево, неизменённые файлы переносятся жёсткими ссылками, распаковываются только
+    # добавленные и изменённые записи, затем каталоги подменяются переименованием.
+    def __init__(self, zip_path, install_dir, manifest=None, progress=None):
+        self.zip_path = zip_path
+        self.install_dir = install_dir
+        self.manifest = manifest
+        self.progress = progress
+
+    def install(self):
+        recover_install(self.install_dir)
+        staging = self.install_dir + STAGING_SUFFIX
+        os.makedirs(staging)
+        report = InstallReport()
+        installed = set()
+        try:
+            with zipfile.ZipFile(self.zip_path, "r") as zip_ref:
+                infos = zip_ref.infolist()
+                for idx, info in enumerate(infos):
+                    if zip_ref.getinfo(info.filename) is not info:
+                        # При повторяющихся именах действует последняя запись, как и в zipfile
+                        continue
+                    rel = safe_member_path(info.filename)
+                    if rel is None:
+                        logging.warning(f"Пропущена запись с недопустимым путём: {info.filename}")
+                        continue
+                    target = os.path.join(staging, rel)
+                    if info.is_dir():
+                        os.makedirs(target, exist_ok=True)
+                        continue
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    installed.add(rel)
+                    current = os.path.join(self.install_dir, rel)
+                    if self.is_unchanged(current, rel, info):
+                        report.unchanged += 1
+                        if self.link_or_copy(current, target):
+                            report.bytes_skipped += info.file_size
+                        else:
+                            report.bytes_written += info.file_size
+                    else:
+                        if os.path.exists(current):
+                            report.changed += 1
+                        else:
+                            report.added += 1
+                        if os.path.lexists(target):
+                            # Не пишем поверх жёсткой ссылки на файл из текущей библиотеки
+                            os.remove(target)
+                        with zip_ref.open(info) as src, open(target, "wb") as dst:
+                            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+                        report.bytes_written += info.file_size
+                    if self.progress:
+                        self.progress(idx + 1, len(infos), info.filename)
+            report.removed = self.count_removed(installed)
+            self.swap(staging)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return report
+
+    def is_unchanged(self, current, rel, info):
+        try:
+            st = os.stat(current)
+        except OSError:
+            return False
+        if st.st_size != info.file_size:
+            return False
+        if self.manifest is not None:
+            entry = self.manifest.entries.get(rel)
+            if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                return entry[3] == info.CRC
+        return file_crc32(current) == info.CRC
+
+    def link_or_copy(self, src, dst):
+        try:
+            os.link(src, dst)
+            return True
+        except OSError:
+            shutil.copy2(src, dst)
+            return False
+
+    def count_removed(self, installed):
+        removed = 0
+        if not os.path.exists(self.install_dir):
+            return removed
+        for root, _, files in os.walk(self.install_dir):
+            for file in files:
+                rel = os.path.relpath(os.path.join(root, file), self.install_dir).replace(os.sep, "/")
+                if rel not in installed:
+                    removed += 1
+        return removed
+
+    def swap(self, staging):
+        backup = self.install_dir + BACKUP_SUFFIX
+        if os.path.exists(self.install_dir):
+            os.replace(self.install_dir, backup)
+        os.replace(staging, self.install_dir)
+        shutil.rmtree(backup, ignore_errors=True)
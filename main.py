@@ -1,69 +1,49 @@
 import sys
 import os
-import json
-import ctypes
-import webbrowser
-import random
-import hashlib
-import requests
-import zipfile
-import io
-import shutil
-import subprocess
+import logging
+# Часы запуска стартуют при импорте профайлера — раньше тяжёлых модулей и Qt
+from startup_profile import startup_profiler
+from constants import (
+    APP_VERSION, RECENT_FILE, FAV_FILE, FAV_ANIME_FILE, USER_DATA_FILE, CURSOR_LIB_PATH, ANIME_PATH,
+    CLASSIC_PATH, CATEGORY_PATHS, CATALOG_FILE, GITHUB_CURSORS_URL
+)
+from system_cursors import apply_values, reset_scheme
+from catalog import Catalog, pack_preview
+from search_index import SearchIndex
+from thumbnails import ThumbnailService, is_cursor_file, render_cursor_frames
+from frame_cache import FrameCache
+from favorites import FavoritesStore
+from schemes import SchemeCache
+from user_data import UserDataStore
+from starfield import shared_star_field, COORD_SCALE
+from validator import validate_category
+from animations import shared_scheduler
 from PySide6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
     QStackedWidget, QProgressBar, QFrame, QScrollArea, QGridLayout, 
     QMessageBox, QLineEdit, QDialog
 )
 from PySide6.QtCore import (
-    Qt, QTimer, QPropertyAnimation, QEasingCurve, QSize,
-    QThread, Signal, QObject, QPoint, QRectF, Property
+    Qt, QTimer, QEasingCurve, QSize,
+    QThread, Signal, QObject, QRect, Property, QFileSystemWatcher
 )
 from PySide6.QtGui import (
     QMovie, QPixmap, QIcon, QPainter, QPen, QConicalGradient, 
-    QColor, QBrush, QLinearGradient, QRadialGradient, QFont
+    QColor, QBrush, QRegion
 )
-import time
-import logging
+
+# sync (а с ним requests), webbrowser и прочее, что нужно только отдельным действиям,
+# импортируется внутри них: к первой отрисовке окна грузится лишь необходимое
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-APP_VERSION = "v1.3.0"
-RECENT_FILE = "recent_cursors.json"
-FAV_FILE = "favorites.json"
-CURSOR_LIB_PATH = "CursorsLib"
-ANIME_PATH = os.path.join(CURSOR_LIB_PATH, "CursorsLib", "Anime")
-CLASSIC_PATH = os.path.join(CURSOR_LIB_PATH, "CursorsLib", "Classic")
-GITHUB_CURSORS_URL = "https://github.com/ShustovCarleone/Cursor-Galaxy/releases/download/v1.2.0/CursorsLib.zip"
-
-CURSOR_KEYS = {
-    "pointer": "Arrow",
-    "help": "Help",
-    "busy": "Busy",
-    "link": "AppStarting",
-    "cross": "Crosshair",
-    "text": "IBeam",
-    "move": "SizeAll",
-    "dgn1": "SizeNESW",
-    "dgn2": "SizeNWSE",
-    "horz": "SizeWE",
-    "vert": "SizeNS",
-    "alternate": "AlternateSelect",
-    "unavailable": "No",
-    "work": "WorkingInBackground",
-    "hand": "Hand",
-    "normal": "Arrow",
-    "alternate2": "AlternateSelect",
-    "diagonal1": "SizeNESW",
-    "diagonal2": "SizeNWSE",
-    "handwriting": "Handwriting",
-    "horizontal": "SizeWE",
-    "vertical": "SizeNS",
-    "person": "Person",
-    "pin": "Pin",
-    "precision": "PrecisionSelect",
-    "working": "WorkingInBackground"
-}
+USER_DATA_SAVE_DELAY_MS = 1000
+SEARCH_DEBOUNCE_MS = 200
+THUMBNAIL_CACHE_PATH = "thumbnail_cache"
+FRAME_CACHE_BUDGET = 64 * 1024 * 1024
+BORDER_PERIOD_MS = 3000
+
+startup_profiler.mark("imports")
 
 # Классы для интерфейса
 class AnimatedBackground(QLabel):
@@ -80,9 +60,14 @@ class AnimatedBackground(QLabel):
         super().resizeEvent(event)
 
 class Notification(QWidget):
+    # Вызывающий код ссылку не хранит — открытые уведомления держит класс до закрытия
+    shown = set()
+
     def __init__(self, message, duration=3000):
         super().__init__(None, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
+        # После затухания окно удаляется целиком, а не просто прячется
+        self.setAttribute(Qt.WA_DeleteOnClose)
         self.duration = duration
 
         layout = QVBoxLayout(self)
@@ -95,80 +80,289 @@ class Notification(QWidget):
         frame_layout.addWidget(label)
         layout.addWidget(frame)
 
-        self.opacity_anim = QPropertyAnimation(self, b"windowOpacity")
-        self.opacity_anim.setDuration(300)
-        self.opacity_anim.setStartValue(0)
-        self.opacity_anim.setEndValue(1)
-        self.opacity_anim.setEasingCurve(QEasingCurve.InOutQuad)
-        self.opacity_anim.start()
+        self.setWindowOpacity(0)
+        self.opacity_anim = shared_scheduler().tween(self, 300, self.setWindowOpacity)
 
+        Notification.shown.add(self)
         QTimer.singleShot(self.duration, self.fade_out)
 
+    def closeEvent(self, event):
+        Notification.shown.discard(self)
+        super().closeEvent(event)
+
     def fade_out(self):
-        self.opacity_anim = QPropertyAnimation(self, b"windowOpacity")
-        self.opacity_anim.setDuration(300)
-        self.opacity_anim.setStartValue(1)
-        self.opacity_anim.setEndValue(0)
-        self.opacity_anim.finished.connect(self.close)
-        self.opacity_anim.start()
+        self.opacity_anim.stop()
+        self.opacity_anim = shared_scheduler().tween(
+            self, 300, lambda progress: self.setWindowOpacity(1 - progress), self.close)
+
+PLACEHOLDERS = {}
+
+
+def preview_placeholder(size):
+    key = (size.width(), size.height())
+    if key not in PLACEHOLDERS:
+        pixmap = QPixmap(size)
+        pixmap.fill(QColor(47, 48, 52))
+        PLACEHOLDERS[key] = pixmap
+    return PLACEHOLDERS[key]
 
 class AnimatedGIF(QLabel):
-    def __init__(self, gif_path, width=195, height=150):
+    # Превью пака. В покое показывает статичную миниатюру; QMovie создаётся только при
+    # первом наведении и декодирует кадры сразу в размере hover_size. Полный цикл кадров
+    # кладётся в общий FrameCache, после чего QMovie удаляется, а повторные наведения
+    # (в том числе на другие карточки с тем же preview.gif) проигрывают кадры из кеша.
+    # У паков без preview.gif источником служит сам курсор (.ani или .cur).
+    def __init__(self, gif_path, frame_cache, width=195, height=150):
         super().__init__()
         self._size = QSize(width, height)
         self.base_size = QSize(width, height)
         self.hover_size = QSize(int(width * 1.1), int(height * 1.1))
+        self.frame_cache = frame_cache
+        # Промежуточные размеры анимации наведения масштабирует QLabel, а не декодер
+        self.setScaledContents(True)
 
         self.setFixedSize(self.base_size)
-        self.movie = QMovie(gif_path)
-        self.movie.setScaledSize(self.base_size)
-        
-        self.movie.jumpToFrame(0)
-        self.static_pixmap = QPixmap(self.movie.currentPixmap())
-        self.setPixmap(self.static_pixmap)
-        
-        self.movie.frameChanged.connect(self.update_pixmap)
-        self.movie.stop()
+        self.anim = None
+
+        self.movie = None
+        self.recorded = None
+        self.frames = None
+        self.frame_index = 0
+        self.frame_anim = shared_scheduler().register(self, self.next_cached_frame)
+        self.set_source(gif_path)
+
+    def set_source(self, gif_path):
+        # Карточки переиспользуются: при смене пака меняется только источник анимации.
+        # Первый кадр здесь не декодируется — до прихода миниатюры из ThumbnailService
+        # показывается заглушка
+        self.stop_resize()
+        self.stop_playback()
+        self.gif_path = gif_path
+        self.setFixedSize(self.base_size)
+        self.set_static_pixmap(preview_placeholder(self.base_size))
+
+    def set_static_pixmap(self, pixmap):
+        self.static_pixmap = pixmap
+        if not self.is_playing():
+            self.setPixmap(pixmap)
 
-        self.anim = QPropertyAnimation(self, b"animatedSize")
-        self.anim.setDuration(200)
-        self.anim.setEasingCurve(QEasingCurve.OutCubic)
+    def frame_key(self):
+        return (self.gif_path, self.hover_size.width(), self.hover_size.height())
 
-    def update_pixmap(self):
-        if self.movie.state() == QMovie.Running:
-            self.setPixmap(self.movie.currentPixmap())
+    def is_playing(self):
+        return self.frame_anim.is_running() or (self.movie is not None and self.movie.state() == QMovie.Running)
 
     def start_animation(self):
+        if self.is_playing():
+            return
+        frames = self.frame_cache.get(self.frame_key())
+        if frames:
+            self.frames = frames
+            self.frame_index = 0
+            self.show_cached_frame()
+            return
+        if is_cursor_file(self.gif_path):
+            self.start_cursor_animation()
+            return
+        self.movie = QMovie(self.gif_path, parent=self)
+        self.movie.setScaledSize(self.hover_size)
+        self.movie.frameChanged.connect(self.update_pixmap)
+        self.movie.finished.connect(self.store_frames)
+        self.recorded = []
         self.movie.start()
 
+    def start_cursor_animation(self):
+        # Паки без preview.gif: кадры .ani/.cur декодируются сразу целиком и идут в тот же FrameCache
+        try:
+            images = render_cursor_frames(self.gif_path, self.hover_size)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Не удалось прочитать курсор {self.gif_path}: {str(e)}")
+            return
+        frames = [(QPixmap.fromImage(image), delay) for image, delay in images]
+        cost = sum(pixmap.width() * pixmap.height() * 4 for pixmap, _ in frames)
+        self.frame_cache.put(self.frame_key(), frames, cost)
+        self.frames = frames
+        self.frame_index = 0
+        self.show_cached_frame()
+
+    def update_pixmap(self, frame_number):
+        pixmap = self.movie.currentPixmap()
+        self.setPixmap(pixmap)
+        if self.recorded is None:
+            return
+        if frame_number == 0 and self.recorded:
+            # Анимация пошла по второму кругу — все кадры уже записаны
+            self.store_frames()
+            return
+        self.recorded.append((pixmap, self.movie.nextFrameDelay()))
+        if len(self.recorded) == self.movie.frameCount():
+            self.store_frames()
+
+    def store_frames(self):
+        # Переключаемся с QMovie на воспроизведение записанных кадров из кеша
+        if not self.recorded:
+            return
+        frames, self.recorded = self.recorded, None
+        cost = sum(pixmap.width() * pixmap.height() * 4 for pixmap, _ in frames)
+        self.frame_cache.put(self.frame_key(), frames, cost)
+        playing = self.movie is not None and self.movie.state() == QMovie.Running
+        self.release_movie()
+        if playing and len(frames) > 1:
+            self.frames = frames
+            self.frame_index = 1 % len(frames)
+            self.show_cached_frame()
+
+    def show_cached_frame(self):
+        pixmap, delay = self.frames[self.frame_index]
+        self.setPixmap(pixmap)
+        if len(self.frames) > 1:
+            if not self.frame_anim.is_running():
+                self.frame_anim.start()
+            self.frame_anim.defer(max(delay, 10))
+
+    def next_cached_frame(self, now):
+        self.frame_index = (self.frame_index + 1) % len(self.frames)
+        self.show_cached_frame()
+
+    def release_movie(self):
+        if self.movie is not None:
+            self.movie.stop()
+            self.movie.deleteLater()
+            self.movie = None
+
+    def stop_playback(self):
+        # Незаконченная запись кадров отбрасывается вместе с QMovie
+        self.frame_anim.stop()
+        self.frames = None
+        self.recorded = None
+        self.release_movie()
+
     def stop_animation(self):
-        self.movie.stop()
+        self.stop_playback()
         self.setPixmap(self.static_pixmap)
 
     def enterEvent(self, event):
         self.animate_resize(self.hover_size)
-        self.movie.start()
+        self.start_animation()
         super().enterEvent(event)
 
     def leaveEvent(self, event):
         self.animate_resize(self.base_size)
-        self.movie.stop()
+        self.stop_animation()
         super().leaveEvent(event)
 
+    def stop_resize(self):
+        if self.anim is not None:
+            self.anim.stop()
+            self.anim = None
+
     def animate_resize(self, target_size):
-        self.anim.stop()
-        self.anim.setStartValue(self.size())
-        self.anim.setEndValue(target_size)
-        self.anim.start()
+        self.stop_resize()
+        start = self.size()
+
+        def step(progress):
+            self.setFixedSize(QSize(
+                round(start.width() + (target_size.width() - start.width()) * progress),
+                round(start.height() + (target_size.height() - start.height()) * progress)))
+
+        self.anim = shared_scheduler().tween(self, 200, step, easing=QEasingCurve.OutCubic)
 
-    def get_animated_size(self):
-        return self.size()
+class CursorCard(QFrame):
+    # Карточка пака в сетке браузера. Карточки живут в пуле MainApp и при смене
+    # страницы или фильтра только перепривязываются к другому паку через bind()
+    apply_requested = Signal(str)
+    favorite_requested = Signal(str, str)
 
-    def set_animated_size(self, size):
-        self.setFixedSize(size)
-        self.movie.setScaledSize(size)
+    def __init__(self, button_style, thumbnails, frame_cache, parent=None):
+        super().__init__(parent)
+        self.name = None
+        self.category = None
+        self.thumbnails = thumbnails
+        self.frame_cache = frame_cache
+        self.thumbnails.ready.connect(self.on_thumbnail_ready)
+        self.setStyleSheet("background-color: #3a3b3f; border-radius: 10px;")
+        self.setFixedSize(230, 320)
+        self.layout = QVBoxLayout(self)
+
+        self.gif_widget = None
+
+        self.title = QLabel()
+        self.title.setStyleSheet("color: white; font-size: 18px; font-weight: bold; font-family: 'Segoe UI';")
+        self.title.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.title)
+
+        self.apply_btn = QPushButton("Применить")
+        self.apply_btn.setStyleSheet(button_style)
+        self.apply_btn.clicked.connect(self.on_apply_clicked)
+        self.layout.addWidget(self.apply_btn)
+
+        self.fav_btn = QPushButton("☆")
+        self.fav_btn.setStyleSheet(button_style)
+        self.fav_btn.clicked.connect(self.on_favorite_clicked)
+        self.layout.addWidget(self.fav_btn)
+
+    def bind(self, name, category, preview_path, is_favorite, reload=False):
+        # reload=True перечитывает превью, даже если путь не изменился (пак обновился на диске)
+        self.name = name
+        self.category = category
+        self.title.setText(name)
+        self.set_favorite(is_favorite)
+        self.set_preview(preview_path, reload)
+
+    def set_preview(self, preview_path, reload=False):
+        if not preview_path:
+            if self.gif_widget:
+                self.gif_widget.stop_animation()
+                self.gif_widget.hide()
+            return
+        if self.gif_widget is None:
+            self.gif_widget = AnimatedGIF(preview_path, self.frame_cache)
+            self.layout.insertWidget(0, self.gif_widget, alignment=Qt.AlignCenter)
+        elif reload or self.gif_widget.gif_path != preview_path:
+            self.gif_widget.set_source(preview_path)
+        else:
+            self.gif_widget.show()
+            return
+        if reload:
+            self.thumbnails.invalidate(preview_path)
+            self.frame_cache.discard(preview_path)
+        self.show_thumbnail(self.thumbnails.request(preview_path))
+        self.gif_widget.show()
 
-    animatedSize = Property(QSize, get_animated_size, set_animated_size)
+    def on_thumbnail_ready(self, path, image):
+        if self.gif_widget is not None and self.gif_widget.gif_path == path:
+            self.show_thumbnail(image)
+
+    def show_thumbnail(self, image):
+        if image is not None and not image.isNull():
+            self.gif_widget.set_static_pixmap(QPixmap.fromImage(image))
+
+    def set_favorite(self, is_favorite):
+        self.fav_btn.setText("★" if is_favorite else "☆")
+
+    def set_broken(self, problems):
+        # problems — [(роль, ошибка)] из проверки целостности или пустой список
+        self.title.setText(f"⚠ {self.name}" if problems else self.name)
+        self.title.setToolTip("\n".join(f"{role}: {error}" for role, error in problems))
+
+    def has_preview(self):
+        return self.gif_widget is not None and not self.gif_widget.isHidden()
+
+    def on_apply_clicked(self):
+        self.apply_requested.emit(self.name)
+
+    def on_favorite_clicked(self):
+        self.favorite_requested.emit(self.name, self.category)
+
+    def enterEvent(self, event):
+        if self.has_preview():
+            self.gif_widget.start_animation()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        if self.has_preview():
+            self.gif_widget.stop_animation()
+        super().leaveEvent(event)
 
 class Worker(QObject):
     finished = Signal(dict)
@@ -177,67 +371,168 @@ class Worker(QObject):
     def __init__(self, category):
         super().__init__()
         self.category = category
+        self.changed = 0
+        self.rewritten = []
+        self.search_index = None
 
     def run(self):
         try:
             cursors = self.load_cursors()
+            # Триграммы строим здесь, а не при первом поиске в GUI-потоке
+            self.search_index = SearchIndex(cursors)
+            self.search_index.build_postings()
             self.finished.emit(cursors)
         except Exception as e:
             self.error.emit(str(e))
 
     def load_cursors(self):
-        # Теперь ищем курсоры в CursorLib/CursorsLib/Anime и CursorLib/CursorsLib/Classic
-        base_path = os.path.join(CURSOR_LIB_PATH, "CursorsLib")
-        path = os.path.join(base_path, "Anime") if self.category == "anime" else os.path.join(base_path, "Classic")
-        cursors = {}
-        # Не создаём папки, если их нет
-        if not os.path.exists(path):
-            return cursors
-        for folder in os.listdir(path):
-            full_path = os.path.join(path, folder)
-            if os.path.isdir(full_path):
-                files = os.listdir(full_path)
-                cursor_files = {
-                    name.lower().split(".")[0]: os.path.abspath(os.path.join(full_path, name))
-                    for name in files if name.lower().endswith((".cur", ".ani"))
-                }
-                if cursor_files:
-                    cursors[folder] = cursor_files
-        return cursors
+        # Курсоры лежат в CursorLib/CursorsLib/Anime и CursorLib/CursorsLib/Classic.
+        # Каталог досканирует только изменившиеся паки; соединение SQLite у потока своё.
+        catalog = Catalog(CATALOG_FILE, CATEGORY_PATHS)
+        try:
+            self.changed = catalog.refresh(self.category)
+            # Файлы, переписанные на месте, не меняют mtime каталога пака — их находит restat
+            self.rewritten = catalog.restat(self.category)
+            return catalog.load(self.category)
+        finally:
+            catalog.close()
+
+class ValidationWorker(QObject):
+    # Проверка целостности файлов категории в фоне; сами файлы разбираются в пуле процессов
+    finished = Signal(dict)
+    error = Signal(str)
+
+    def __init__(self, category):
+        super().__init__()
+        self.category = category
+        self.rewritten = []
+
+    def run(self):
+        try:
+            catalog = Catalog(CATALOG_FILE, CATEGORY_PATHS)
+            try:
+                _, broken, self.rewritten = validate_category(catalog, self.category)
+            finally:
+                catalog.close()
+            self.finished.emit(broken)
+        except Exception as e:
+            self.error.emit(str(e))
+
+class LibraryWatcher(QObject):
+    # Следит за каталогами категорий (появление и удаление паков) и за паками на текущей
+    # странице (изменение файлов внутри). Серия событий от распаковки или копирования
+    # схлопывается в один сигнал changed(category) после паузы DEBOUNCE_MS.
+    changed = Signal(str)
+    DEBOUNCE_MS = 300
 
-class StarryBackground(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.stars = []
-        self.init_stars(150)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.roots = {}
+        self.pack_dirs = {}
+        self.pending = set()
+        self.paused = False
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_stars)
-        self.timer.start(100)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self.flush)
+
+    def watch_roots(self, roots):
+        # Повторный вызов безопасен: после подмены каталога установщиком пути добавляются заново
+        self.roots = {os.path.abspath(path): category for category, path in roots.items()}
+        if self.paused:
+            return
+        watched = set(self.watcher.directories())
+        missing = [path for path in self.roots if path not in watched and os.path.isdir(path)]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def watch_packs(self, category, names):
+        root = next((path for path, c in self.roots.items() if c == category), None)
+        if root is None or self.paused:
+            return
+        wanted = {os.path.join(root, name): category for name in names}
+        stale = [path for path in self.pack_dirs if path not in wanted]
+        if stale:
+            self.watcher.removePaths(stale)
+        new = [path for path in wanted if path not in self.pack_dirs and os.path.isdir(path)]
+        if new:
+            self.watcher.addPaths(new)
+        self.pack_dirs = wanted
+
+    def pause(self):
+        # Установщик подменяет CursorsLib переименованием, а на Windows открытые дескрипторы
+        # каталогов не дают его переименовать — на время установки снимаем все пути
+        self.paused = True
+        paths = self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+        self.pack_dirs = {}
+        self.pending.clear()
+        self.timer.stop()
+
+    def resume(self, roots):
+        self.paused = False
+        self.watch_roots(roots)
+
+    def on_directory_changed(self, path):
+        category = self.roots.get(path) or self.pack_dirs.get(path)
+        if category:
+            self.pending.add(category)
+            self.timer.start()
+
+    def flush(self):
+        pending, self.pending = self.pending, set()
+        for category in pending:
+            self.changed.emit(category)
 
-    def init_stars(self, count):
-        for _ in range(count):
-            self.stars.append((random.randint(0, self.width()), random.randint(0, self.height()), random.randint(1, 3), random.randint(50, 255)))
-
-    def update_stars(self):
-        self.stars = [(x, y, s, random.randint(50, 255)) for x, y, s, _ in self.stars]
-        self.update()
+class StarryBackground(QWidget):
+    # Фон страниц: звёзды берутся из общего StarField, мерцание идёт только пока фон видим,
+    # а перерисовываются лишь прямоугольники под звёздами
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.field = shared_star_field()
+        self.star_rects = []
+        self.dirty_region = QRegion()
+        self.layout_stars()
+        self.twinkle_anim = shared_scheduler().register(
+            self, self.stars_changed, self.field.interval, decorative=True)
+        self.twinkle_anim.start()
+
+    def layout_stars(self):
+        width, height = self.width(), self.height()
+        self.star_rects = []
+        self.dirty_region = QRegion()
+        for idx in range(len(self.field)):
+            size = self.field.sizes[idx]
+            extent = size * 2 + 2
+            x = self.field.xs[idx] * width // COORD_SCALE
+            y = self.field.ys[idx] * height // COORD_SCALE
+            rect = QRect(x - extent // 2, y - extent // 2, extent, extent)
+            self.star_rects.append(rect)
+            self.dirty_region += rect
+
+    def stars_changed(self, now):
+        self.field.twinkle(now)
+        self.update(self.dirty_region)
 
     def resizeEvent(self, event):
-        self.stars = []
-        self.init_stars(150)
+        self.layout_stars()
         super().resizeEvent(event)
 
     def paintEvent(self, event):
+        # Рисование и так обрезано по event.region(), поэтому фон заливается одним вызовом
         painter = QPainter(self)
-        painter.fillRect(self.rect(), QColor(5, 5, 25))
-        
-        painter.setPen(Qt.NoPen)
-        for x, y, size, alpha in self.stars:
-            gradient = QRadialGradient(x, y, size*2)
-            gradient.setColorAt(0, QColor(255, 255, 255, alpha))
-            gradient.setColorAt(1, QColor(255, 255, 255, 0))
-            painter.setBrush(QBrush(gradient))
-            painter.drawEllipse(QPoint(x, y), size, size)
+        area = event.rect()
+        painter.fillRect(area, QColor(5, 5, 25))
+
+        alphas = self.field.alphas
+        sizes = self.field.sizes
+        for idx, rect in enumerate(self.star_rects):
+            if rect.intersects(area):
+                painter.setOpacity(alphas[idx] / 255)
+                painter.drawPixmap(rect.topLeft(), self.field.sprite(sizes[idx]))
 
 class AnimatedBorderWidget(QWidget):
     def __init__(self, parent=None):
@@ -248,13 +543,14 @@ class AnimatedBorderWidget(QWidget):
         self.gradient.setColorAt(0.5, QColor(50, 50, 200))
         self.gradient.setColorAt(1, QColor(100, 100, 255))
         
-        self.animation = QPropertyAnimation(self, b"angle")
-        self.animation.setDuration(3000)
-        self.animation.setStartValue(0)
-        self.animation.setEndValue(360)
-        self.animation.setLoopCount(-1)
+        # Угол считается от общих часов, поэтому рамки на странице крутятся синхронно,
+        # а на скрытых страницах не перерисовываются вовсе
+        self.animation = shared_scheduler().register(self, self.rotate, decorative=True)
         self.animation.start()
 
+    def rotate(self, now):
+        self.angle = now % BORDER_PERIOD_MS * 360 // BORDER_PERIOD_MS
+
     def get_angle(self):
         return self._angle
 
@@ -338,70 +634,12 @@ class GitHubCheckWorker(QObject):
     def run(self):
         try:
             logging.info("Начало проверки новых курсоров с GitHub...")
-            needs_update = self.verify_files()
+            from sync import check_library
+            needs_update = check_library(GITHUB_CURSORS_URL, progress=self.progress.emit)
             self.finished.emit(needs_update)
         except Exception as e:
             self.error.emit(str(e))
 
-    def verify_files(self):
-        logging.info("Проверка локальных файлов...")
-        local_files = {}
-
-        # Собираем локальные файлы и их MD5-хеши
-        for path in [ANIME_PATH, CLASSIC_PATH]:
-            if not os.path.exists(path):
-                os.makedirs(path, exist_ok=True)
-            for root, _, files in os.walk(path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, 'rb') as f:
-                            local_files[file_path] = hashlib.md5(f.read()).hexdigest()
-                    except Exception as e:
-                        logging.warning(f"Не удалось вычислить MD5 для {file_path}: {str(e)}")
-
-        # Скачиваем архив с GitHub и проверяем содержимое
-        response = requests.get(GITHUB_CURSORS_URL, stream=True)
-        response.raise_for_status()
-
-        zip_data = io.BytesIO()
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded_size = 0
-        start_time = time.time()
-
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
-                zip_data.write(chunk)
-                downloaded_size += len(chunk)
-                if total_size > 0:
-                    progress = int((downloaded_size / total_size) * 100)
-                    elapsed_time = time.time() - start_time
-                    speed = (downloaded_size / 1024 / 1024) / elapsed_time if elapsed_time > 0 else 0
-                    self.progress.emit(progress, f"Скачивание архива... Скорость: {speed:.2f} МБ/с")
-
-        zip_data.seek(0)
-        github_files = {}
-        with zipfile.ZipFile(zip_data, 'r') as zip_ref:
-            file_list = zip_ref.namelist()
-            total_files = len(file_list)
-            for idx, file_name in enumerate(file_list):
-                if file_name.endswith(('.cur', '.ani')):
-                    relative_path = file_name.replace("CursorsLib/", "", 1)
-                    with zip_ref.open(file_name) as f:
-                        github_files[relative_path] = hashlib.md5(f.read()).hexdigest()
-                progress = int(((idx + 1) / total_files) * 100)
-                self.progress.emit(progress, f"Проверка файла: {file_name}")
-
-        # Сравниваем локальные файлы с файлами в архиве
-        needs_update = False
-        for file_path, github_md5 in github_files.items():
-            local_md5 = local_files.get(file_path)
-            if not local_md5 or local_md5 != github_md5:
-                needs_update = True
-                break
-
-        return needs_update
-
 class GitHubDownloadWorker(QObject):
     progress = Signal(int, str, float)
     finished = Signal()
@@ -414,41 +652,20 @@ class GitHubDownloadWorker(QObject):
 
     def run(self):
         try:
-            logging.info(f"Начинается загрузка архива с {self.url}")
-            response = requests.get(self.url, stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded_size = 0
-            zip_path = "temp_cursors.zip"
-
-            with open(zip_path, 'wb') as f:
-                start_time = time.time()
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        if total_size > 0:
-                            progress = int((downloaded_size / total_size) * 100)
-                            elapsed_time = time.time() - start_time
-                            speed = (downloaded_size / 1024 / 1024) / elapsed_time if elapsed_time > 0 else 0
-                            self.progress.emit(progress, "CursorsLib.zip", speed)
-
-            logging.info("Загрузка завершена, начинаем распаковку")
-            self.extract_zip(zip_path, self.install_dir)
-            os.remove(zip_path)
-            logging.info("Распаковка завершена")
+            self.last_extract_progress = -1
+            from sync import install_library
+            install_library(self.url, self.install_dir, progress=self.progress.emit,
+                            extract_progress=self.extract_progress)
             self.finished.emit()
         except Exception as e:
             logging.error(f"Ошибка в процессе загрузки: {str(e)}")
             self.error.emit(str(e))
 
-    def extract_zip(self, zip_path, extract_to):
-        if os.path.exists(extract_to):
-            shutil.rmtree(extract_to)
-        os.makedirs(extract_to, exist_ok=True)
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+    def extract_progress(self, done, total, file_name):
+        progress = int(done / total * 100)
+        if progress != self.last_extract_progress:
+            self.last_extract_progress = progress
+            self.progress.emit(progress, file_name, 0.0)
 
 class MainApp(QWidget):
     def __init__(self):
@@ -460,17 +677,45 @@ class MainApp(QWidget):
         self.bg_image = "default_background.png"
 
         self.recent_cursors = []
-        self.favorites = []
+        self.favorites = FavoritesStore()
+        self.user_data = None
         self.current_cursors = {}
         self.cursor_options = []
         self.current_page = 0
         self.items_per_page = 12
         self.current_category = "anime"
         self.is_fav_mode = False
+        self.catalog = Catalog(CATALOG_FILE, CATEGORY_PATHS)
+        self.schemes = SchemeCache(self.catalog)
+        self.refresh_jobs = []
+        self.refresh_pending = set()
+        self.validation_jobs = {}
+        self.validation_pending = set()
+        self.broken_packs = {}
+        self.page_items = []
+        self.card_pool = []
+        self.loaded_category = None
+        self.search_index = SearchIndex()
+        self.thumbnails = ThumbnailService(THUMBNAIL_CACHE_PATH)
+        self.frame_cache = FrameCache(FRAME_CACHE_BUDGET)
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(USER_DATA_SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.save_data)
+        self.library_watcher = LibraryWatcher()
+        self.library_watcher.changed.connect(self.handle_library_changed)
+        self.library_watcher.watch_roots(CATEGORY_PATHS)
+        startup_profiler.mark("window state")
 
         self.init_ui()
         self.load_data()
+        startup_profiler.mark("user data")
         self.start_check_process()
+        startup_profiler.mark("loader page")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        startup_profiler.painted()
 
     def check_cursors_exist(self):
         def has_files(path):
@@ -482,7 +727,7 @@ class MainApp(QWidget):
         ])
 
     def start_check_process(self):
-        self.stacked.setCurrentWidget(self.loader)
+        self.show_page("loader")
         self.check_thread = QThread()
         self.check_worker = GitHubCheckWorker()
         self.check_worker.moveToThread(self.check_thread)
@@ -503,7 +748,7 @@ class MainApp(QWidget):
         self.loader.progress.setValue(100)
         self.loader.info_label.setText("")
         QTimer.singleShot(1000, lambda: (
-            self.stacked.setCurrentWidget(self.browser),
+            self.show_page("browser"),
             self.show_download_dialog() if needs_update else self.show_notification("Все курсоры актуальны!")
         ))
 
@@ -514,7 +759,7 @@ class MainApp(QWidget):
         self.loader.progress.setValue(0)
         self.loader.info_label.setText("")
         QMessageBox.critical(self, "Ошибка", f"Ошибка проверки курсоров:\n{error}")
-        QTimer.singleShot(2000, lambda: self.stacked.setCurrentWidget(self.browser))
+        QTimer.singleShot(2000, lambda: self.show_page("browser"))
 
     def show_download_dialog(self):
         dialog = QDialog(self)
@@ -550,11 +795,12 @@ class MainApp(QWidget):
 
     def start_download(self, dialog):
         dialog.accept()
-        self.stacked.setCurrentWidget(self.loader)
+        self.show_page("loader")
         self.loader.title_label.setText("Загрузка новых курсоров...")
         self.loader.file_label.setText("Подготовка...")
         self.loader.progress.setValue(0)
 
+        self.library_watcher.pause()
         self.download_thread = QThread()
         self.download_worker = GitHubDownloadWorker(GITHUB_CURSORS_URL, CURSOR_LIB_PATH)
         self.download_worker.moveToThread(self.download_thread)
@@ -572,18 +818,23 @@ class MainApp(QWidget):
         self.loader.info_label.setText(f"Скорость: {speed:.2f} МБ/с")
 
     def on_download_finished(self):
+        # Паки страницы снова попадут под наблюдение при перерисовке браузера
+        self.library_watcher.resume(CATEGORY_PATHS)
         self.loader.title_label.setText("Загрузка завершена!")
         self.loader.file_label.setText("Обновление завершено")
         self.loader.progress.setValue(100)
         self.loader.info_label.setText("")
         QTimer.singleShot(1000, lambda: (
-            self.stacked.setCurrentWidget(self.browser),
+            self.show_page("browser"),
             self.load_data(),
             self.update_display()
         ))
 
     def handle_download_error(self, error):
         logging.error(f"Ошибка загрузки: {error}")
+        self.library_watcher.resume(CATEGORY_PATHS)
+        if self.loaded_category is not None and not self.is_fav_mode:
+            self.library_watcher.watch_packs(self.current_category, self.page_items)
         self.loader.title_label.setText("Ошибка загрузки")
         self.loader.file_label.setText(f"Ошибка: {error}")
         self.loader.progress.setValue(0)
@@ -592,22 +843,44 @@ class MainApp(QWidget):
         QTimer.singleShot(2000, self.show_main_menu)
 
     def load_data(self):
-        if os.path.exists(RECENT_FILE):
-            with open(RECENT_FILE, "r") as f:
-                self.recent_cursors = json.load(f)
-        if os.path.exists(FAV_FILE):
-            with open(FAV_FILE, "r") as f:
-                data = json.load(f)
-                if data and isinstance(data[0], str):
-                    self.favorites = [{"name": name, "category": "anime"} for name in data]
-                else:
-                    self.favorites = data
+        # Прежние recent_cursors.json, favorites.json и favorites_anime.json импортируются при первом запуске
+        if self.user_data is not None:
+            self.save_data()
+        self.user_data = UserDataStore(USER_DATA_FILE, legacy_favorites=[FAV_FILE, FAV_ANIME_FILE],
+                                       legacy_recents=RECENT_FILE)
+        self.user_data.load()
+        self.recent_cursors = list(self.user_data.recents)
+        self.favorites = FavoritesStore(self.user_data.favorites)
+        self.set_low_power(self.user_data.settings.get("low_power", False))
+        # Схемы избранного и недавних собираются после первого кадра, до первого клика
+        QTimer.singleShot(0, self.warm_user_schemes)
+
+    def warm_user_schemes(self):
+        by_category = {}
+        for name, category in self.favorites:
+            by_category.setdefault(category, []).append(name)
+        for category, names in by_category.items():
+            self.schemes.warm(category, names)
+        self.schemes.warm_names(self.recent_cursors)
+
+    def schedule_save(self):
+        # Клики по избранному и применения курсоров сбрасываются на диск одной пачкой
+        self.save_timer.start()
 
     def save_data(self):
-        with open(RECENT_FILE, "w") as f:
-            json.dump(self.recent_cursors, f, indent=2)
-        with open(FAV_FILE, "w") as f:
-            json.dump(self.favorites, f, indent=2)
+        try:
+            self.user_data.flush()
+        except OSError as e:
+            logging.error(f"Ошибка сохранения пользовательских данных: {str(e)}")
+
+    def closeEvent(self, event):
+        # Индекс миниатюр и пользовательские данные сохраняются с задержкой — не теряем последние записи при выходе
+        self.save_timer.stop()
+        self.save_data()
+        for thread, _ in list(self.validation_jobs.values()):
+            thread.wait()
+        self.thumbnails.save_index()
+        super().closeEvent(event)
 
     def init_ui(self):
         self.setAttribute(Qt.WA_StyledBackground, True)
@@ -616,13 +889,28 @@ class MainApp(QWidget):
         main_layout = QVBoxLayout(self)
         main_layout.addWidget(self.stacked)
 
-        self.create_main_menu()
-        self.create_category_menu()
-        self.create_loader()
-        self.create_browser()
-        self.create_functions_menu()
-        # Устанавливаем главное меню как стартовую вкладку
-        self.stacked.setCurrentIndex(0)
+        # Страницы строятся при первом переходе на них: к первой отрисовке нужен
+        # только загрузчик, а меню со звёздами и рамками могут не понадобиться вовсе
+        self.pages = {}
+        self.page_builders = {
+            "main_menu": self.create_main_menu,
+            "category_menu": self.create_category_menu,
+            "loader": self.create_loader,
+            "browser": self.create_browser,
+            "functions_menu": self.create_functions_menu,
+        }
+
+    def page(self, name):
+        widget = self.pages.get(name)
+        if widget is None:
+            widget = self.page_builders[name]()
+            self.pages[name] = widget
+            self.stacked.addWidget(widget)
+            logging.info(f"Построена страница {name}")
+        return widget
+
+    def show_page(self, name):
+        self.stacked.setCurrentWidget(self.page(name))
 
     def create_main_menu(self):
         container = QWidget()
@@ -673,7 +961,7 @@ class MainApp(QWidget):
             bg_layout.addWidget(btn_container, alignment=Qt.AlignCenter)
 
         layout.addWidget(bg)
-        self.stacked.addWidget(container)
+        return container
 
     def create_category_menu(self):
         widget = StarryBackground()
@@ -708,12 +996,11 @@ class MainApp(QWidget):
         back_btn.setStyleSheet(self.button_style())
         back_btn.clicked.connect(self.show_main_menu)
         layout.addWidget(back_btn, alignment=Qt.AlignCenter)
-
-        self.stacked.addWidget(widget)
+        return widget
 
     def create_loader(self):
         self.loader = Loader()
-        self.stacked.addWidget(self.loader)
+        return self.loader
 
     def create_browser(self):
         self.browser = StarryBackground()
@@ -747,7 +1034,12 @@ class MainApp(QWidget):
 
         self.search = QLineEdit()
         self.search.setPlaceholderText("Поиск...")
-        self.search.textChanged.connect(self.update_display)
+        # Поиск запускается после паузы в наборе, а не на каждую клавишу
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search.textChanged.connect(self.schedule_search)
         top_bar.addWidget(self.search)
         layout.addLayout(top_bar)
 
@@ -773,8 +1065,7 @@ class MainApp(QWidget):
         self.next_btn.clicked.connect(self.next_page)
         pagination.addWidget(self.next_btn)
         layout.addLayout(pagination)
-
-        self.stacked.addWidget(self.browser)
+        return self.browser
 
     def create_functions_menu(self):
         widget = StarryBackground()
@@ -796,6 +1087,7 @@ class MainApp(QWidget):
         buttons = [
             ("❤ Поддержать", self.show_support),
             ("Обнова?", self.check_for_update),
+            (self.low_power_text(), self.toggle_low_power),
             ("🔙 Назад", self.show_main_menu)
         ]
 
@@ -820,11 +1112,12 @@ class MainApp(QWidget):
                     background-color: rgba(50,50,100,0.9);
                 }
             """)
+            if callback == self.toggle_low_power:
+                self.low_power_btn = btn
             btn.clicked.connect(callback)
             btn_layout.addWidget(btn)
             layout.addWidget(btn_container, alignment=Qt.AlignCenter)
-
-        self.stacked.addWidget(widget)
+        return widget
 
     def button_style(self):
         return """
@@ -845,7 +1138,14 @@ class MainApp(QWidget):
 
     def start_loading(self, category):
         self.current_category = category
-        self.stacked.setCurrentWidget(self.loader)
+        cursors = self.catalog.load(category)
+        if cursors:
+            # Индекс уже построен: браузер открывается сразу, изменения на диске досканируются в фоне
+            self.handle_loaded_data(cursors)
+            self.start_catalog_refresh(category)
+            return
+
+        self.show_page("loader")
         self.loader.title_label.setText("Загрузка курсоров...")
         self.loader.file_label.setText("Инициализация...")
         self.loader.progress.setValue(0)
@@ -859,12 +1159,118 @@ class MainApp(QWidget):
         self.worker.finished.connect(self.thread.quit)
         self.thread.start()
 
+    def start_catalog_refresh(self, category):
+        # Ссылки на поток и воркер держим до завершения, чтобы быстрое переключение
+        # категорий не уничтожило работающий QThread. Одно досканирование на категорию
+        # за раз; запрос во время него повторит его по окончании
+        if any(job[1].category == category for job in self.refresh_jobs):
+            self.refresh_pending.add(category)
+            return
+        thread = QThread()
+        worker = Worker(category)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        # Слоты — методы MainApp, чтобы они выполнялись в GUI-потоке, а не в потоке воркера
+        worker.finished.connect(self.handle_refreshed_data)
+        worker.error.connect(self.handle_refresh_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(self.forget_refresh_job)
+        self.refresh_jobs.append((thread, worker))
+        thread.start()
+
+    def forget_refresh_job(self):
+        thread = self.sender()
+        for job in [job for job in self.refresh_jobs if job[0] is thread]:
+            self.refresh_jobs.remove(job)
+            category = job[1].category
+            if category in self.refresh_pending:
+                self.refresh_pending.discard(category)
+                self.start_catalog_refresh(category)
+
+    def start_validation(self, category):
+        # Одна проверка на категорию за раз; запрос во время проверки повторит её по окончании
+        if category in self.validation_jobs:
+            self.validation_pending.add(category)
+            return
+        thread = QThread()
+        worker = ValidationWorker(category)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self.handle_validated)
+        worker.error.connect(self.handle_validation_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(self.forget_validation_job)
+        self.validation_jobs[category] = (thread, worker)
+        thread.start()
+
+    def forget_validation_job(self):
+        thread = self.sender()
+        for category, job in list(self.validation_jobs.items()):
+            if job[0] is thread:
+                del self.validation_jobs[category]
+                if category in self.validation_pending:
+                    self.validation_pending.discard(category)
+                    self.start_validation(category)
+
+    def handle_validation_error(self, message):
+        logging.error(f"Ошибка проверки целостности: {message}")
+
+    def handle_validated(self, broken):
+        worker = self.sender()
+        for name in worker.rewritten:
+            self.schemes.invalidate(worker.category, name)
+        self.broken_packs[worker.category] = broken
+        for card in self.card_pool:
+            if card.name is not None and card.category == worker.category:
+                card.set_broken(self.pack_problems(card.name, card.category))
+
+    def pack_problems(self, name, category):
+        return self.broken_packs.get(category, {}).get(name, [])
+
+    def handle_refresh_error(self, message):
+        logging.error(f"Ошибка обновления каталога: {message}")
+
+    def handle_refreshed_data(self, cursors):
+        worker = self.sender()
+        # Установщик или пользователь мог пересоздать каталог категории
+        self.library_watcher.watch_roots(CATEGORY_PATHS)
+        for name in worker.changed.added + worker.changed.removed + worker.changed.changed + worker.rewritten:
+            self.schemes.invalidate(worker.category, name)
+        if worker.changed or worker.rewritten:
+            self.start_validation(worker.category)
+        if worker.category != self.current_category:
+            return
+        self.search_index = worker.search_index
+        if not worker.changed:
+            return
+        self.current_cursors = cursors
+        self.cursor_options = list(cursors.keys())
+        if self.is_fav_mode:
+            self.update_display()
+        else:
+            self.render_page(self.filter_cursors(), changed=set(worker.changed.changed))
+
+    def handle_library_changed(self, category):
+        # Событие от LibraryWatcher приходит уже после паузы DEBOUNCE_MS. Категория досканируется
+        # в фоновом Worker — обход паков и запись в SQLite не держат GUI-поток на время
+        # копирования в CursorsLib; разницу к открытому браузеру применяет handle_refreshed_data
+        self.start_catalog_refresh(category)
+
     def handle_loaded_data(self, cursors):
+        self.loaded_category = self.current_category
         self.current_cursors = cursors
         self.cursor_options = list(cursors.keys())
+        worker = self.sender()
+        if isinstance(worker, Worker) and worker.search_index is not None:
+            self.search_index = worker.search_index
+        else:
+            self.search_index = SearchIndex(self.cursor_options)
         self.current_page = 0
         self.update_display()
-        self.stacked.setCurrentWidget(self.browser)
+        self.show_page("browser")
+        self.start_validation(self.current_category)
 
     def handle_error(self, message):
         logging.error(f"Ошибка загрузки курсоров: {message}")
@@ -875,124 +1281,102 @@ class MainApp(QWidget):
         QMessageBox.critical(self, "Ошибка", f"Ошибка загрузки курсоров:\n{message}")
         self.show_category_menu()
 
-    def update_display(self):
-        search_text = self.search.text().lower()
-        current_category = self.current_category if not self.is_fav_mode else None
-        filtered = []
-
-        for name in self.cursor_options:
-            if self.is_fav_mode:
-                if {"name": name, "category": self.current_category} in self.favorites:
-                    if search_text in name.lower():
-                        filtered.append(name)
-            else:
-                if search_text in name.lower():
-                    filtered.append(name)
+    def schedule_search(self):
+        self.search_timer.start()
 
-        if self.is_fav_mode:
-            all_fav_names = [item["name"] for item in self.favorites]
-            filtered = [name for name in all_fav_names if search_text in name.lower()]
-            self.current_cursors = {}
-            for item in self.favorites:
-                path = ANIME_PATH if item["category"] == "anime" else CLASSIC_PATH
-                full_path = os.path.join(path, item["name"])
-                if os.path.isdir(full_path):
-                    cursor_files = self.load_cursor_files(full_path)
-                    if cursor_files:  # Только если есть файлы курсоров
-                        self.current_cursors[item["name"]] = cursor_files
+    def apply_search(self):
+        self.current_page = 0
+        self.update_display()
 
+    def update_display(self):
+        self.render_page(self.filter_cursors())
+
+    def filter_cursors(self):
+        # Данные категории приходят до первого показа браузера — строка поиска нужна уже сейчас
+        self.page("browser")
+        search_text = self.search.text()
+        if not self.is_fav_mode:
+            # Выдача ранжирована: начало имени, начало слова, подстрока, нечёткие совпадения
+            return self.search_index.search(search_text)
+
+        return self.favorites.search(search_text)
+
+    def render_page(self, filtered, changed=None):
+        # Карточки берутся из пула и только перепривязываются к пакам страницы.
+        # changed=None — привязываются все карточки; иначе только те, что сменили пак
+        # или чьи паки входят в changed (у них превью перечитывается с диска)
         total_pages = (len(filtered) - 1) // self.items_per_page + 1
+        if changed is not None and self.current_page >= total_pages:
+            self.current_page = total_pages - 1
         start = self.current_page * self.items_per_page
         end = start + self.items_per_page
         page_items = filtered[start:end]
 
-        while self.grid.count():
-            child = self.grid.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        row, col = 0, 0
+        self.grid_widget.setUpdatesEnabled(False)
+        while len(self.card_pool) < len(page_items):
+            card = CursorCard(self.button_style(), self.thumbnails, self.frame_cache)
+            card.apply_requested.connect(self.apply_cursor)
+            card.favorite_requested.connect(self.handle_card_favorite)
+            idx = len(self.card_pool)
+            self.grid.addWidget(card, idx // 4, idx % 4)
+            self.card_pool.append(card)
+
+        # Схемы паков страницы собираются сразу — клик по «Применить» их только читает
+        by_category = {}
         for name in page_items:
-            self.grid.addWidget(self.create_card(name), row, col)
-            col = (col + 1) % 4
-            if col == 0:
-                row += 1
+            by_category.setdefault(self.card_category(name), []).append(name)
+        for category, names in by_category.items():
+            self.schemes.warm(category, names)
+
+        for idx, name in enumerate(page_items):
+            card = self.card_pool[idx]
+            if changed is not None and idx < len(self.page_items) and self.page_items[idx] == name \
+                    and name not in changed:
+                continue
+            category = self.card_category(name)
+            card.bind(name, category, self.find_preview(name, category),
+                      (name, category) in self.favorites,
+                      reload=changed is not None and name in changed)
+            card.set_broken(self.pack_problems(name, category))
+            card.show()
+        for card in self.card_pool[len(page_items):]:
+            card.hide()
+        self.page_items = page_items
+        self.grid_widget.setUpdatesEnabled(True)
 
         self.page_label.setText(f"Страница {self.current_page + 1} из {total_pages}")
         self.prev_btn.setEnabled(self.current_page > 0)
         self.next_btn.setEnabled(end < len(filtered))
+        if not self.is_fav_mode:
+            self.library_watcher.watch_packs(self.current_category, self.page_items)
 
-    def create_card(self, name):
-        category = self.current_category if not self.is_fav_mode else next(
-            (item["category"] for item in self.favorites if item["name"] == name), "anime"
-        )
-        card = QFrame()
-        card.setStyleSheet("background-color: #3a3b3f; border-radius: 10px;")
-        card.setFixedSize(230, 320)
-        layout = QVBoxLayout(card)
-
-        preview_path = self.find_preview(name, category)
-        gif_widget = None
-        if preview_path:
-            gif_widget = AnimatedGIF(preview_path)
-            layout.addWidget(gif_widget, alignment=Qt.AlignCenter)
-
-        def enter_event(event):
-            if gif_widget:
-                gif_widget.start_animation()
-            QFrame.enterEvent(card, event)
-
-        def leave_event(event):
-            if gif_widget:
-                gif_widget.stop_animation()
-            QFrame.leaveEvent(card, event)
-
-        card.enterEvent = enter_event
-        card.leaveEvent = leave_event
-
-        title = QLabel(name)
-        title.setStyleSheet("color: white; font-size: 18px; font-weight: bold; font-family: 'Segoe UI';")
-        title.setAlignment(Qt.AlignCenter)
-        layout.addWidget(title)
-
-        apply_btn = QPushButton("Применить")
-        apply_btn.setStyleSheet(self.button_style())
-        apply_btn.clicked.connect(lambda: self.apply_cursor(name))
-        layout.addWidget(apply_btn)
-
-        fav_btn = QPushButton("★" if {"name": name, "category": category} in self.favorites else "☆")
-        fav_btn.setStyleSheet(self.button_style())
-        fav_btn.clicked.connect(lambda: self.toggle_favorite(name, category, fav_btn))
-        layout.addWidget(fav_btn)
-
-        return card
+    def card_category(self, name):
+        if not self.is_fav_mode:
+            return self.current_category
+        return self.favorites.category_of(name)
 
     def find_preview(self, name, category):
-        # Теперь ищем превью в CursorLib/CursorsLib/Anime/<name>/preview.gif или CursorLib/CursorsLib/Classic/<name>/preview.gif
-        base_path = os.path.join(CURSOR_LIB_PATH, "CursorsLib")
-        path = os.path.join(base_path, "Anime") if category == "anime" else os.path.join(base_path, "Classic")
-        preview = os.path.join(path, name, "preview.gif")
-        return preview if os.path.exists(preview) else None
+        # Превью CursorLib/CursorsLib/<Категория>/<name>/preview.gif (или курсор пака, если gif нет)
+        # берём из каталога, а для паков, которых в нём ещё нет, проверяем диск
+        found, preview = self.catalog.preview(category, name)
+        if found:
+            return preview
+        return pack_preview(os.path.join(CATEGORY_PATHS[category], name))
 
     def apply_cursor(self, name):
-        if self.is_fav_mode:
-            category = next(item["category"] for item in self.favorites if item["name"] == name)
-        else:
-            category = self.current_category
-
-        scheme = self.current_cursors.get(name)
+        category = self.card_category(name)
         try:
-            if not scheme:
+            compiled = self.schemes.get(category, name)
+            if compiled is None:
                 raise ValueError("Схема курсоров не найдена")
-
-            import winreg
-            reg_path = r"Control Panel\Cursors"
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path, 0, winreg.KEY_SET_VALUE) as key:
-                for key_name, reg_name in CURSOR_KEYS.items():
-                    if key_name in scheme:
-                        winreg.SetValueEx(key, reg_name, 0, winreg.REG_SZ, scheme[key_name])
-
-            ctypes.windll.user32.SystemParametersInfoW(0x0057, 0, None, 3)
+            problems = self.pack_problems(name, category)
+            if problems:
+                # Повреждённый файл в реестре превратится в сломанный курсор системы
+                raise ValueError(f"пак повреждён ({', '.join(role for role, _ in problems)})")
+            if compiled.problems:
+                raise ValueError(f"пак повреждён ({', '.join(compiled.problems)})")
+
+            apply_values(compiled.values)
             self.update_recent(name)
             self.show_notification(f"Курсор '{name}' установлен!")
         except Exception as e:
@@ -1000,22 +1384,18 @@ class MainApp(QWidget):
             self.show_notification(f"Ошибка: {str(e)}")
 
     def update_recent(self, name):
-        if name in self.recent_cursors:
-            self.recent_cursors.remove(name)
-        self.recent_cursors.insert(0, name)
-        if len(self.recent_cursors) > 5:
-            self.recent_cursors.pop()
-        self.save_data()
+        self.recent_cursors = list(self.user_data.touch_recent(name))
+        self.schedule_save()
 
-    def toggle_favorite(self, name, category, btn):
-        entry = {"name": name, "category": category}
-        if entry in self.favorites:
-            self.favorites.remove(entry)
-            btn.setText("☆")
-        else:
-            self.favorites.append(entry)
-            btn.setText("★")
-        self.save_data()
+    def handle_card_favorite(self, name, category):
+        card = self.sender()
+        card.set_favorite(self.toggle_favorite(name, category))
+
+    def toggle_favorite(self, name, category):
+        is_favorite = self.favorites.toggle(name, category)
+        self.user_data.set_favorite(name, category, is_favorite)
+        self.schedule_save()
+        return is_favorite
 
     def toggle_fav_mode(self):
         self.is_fav_mode = not self.is_fav_mode
@@ -1041,15 +1421,31 @@ class MainApp(QWidget):
         Notification(message).show()
 
     def show_main_menu(self):
-        self.stacked.setCurrentIndex(0)
+        self.show_page("main_menu")
 
     def show_category_menu(self):
-        self.stacked.setCurrentIndex(1)
+        self.show_page("category_menu")
 
     def show_functions_menu(self):
-        self.stacked.setCurrentIndex(4)
+        self.show_page("functions_menu")
+
+    def low_power_text(self):
+        return f"Энергосбережение: {'вкл' if shared_scheduler().low_power else 'выкл'}"
+
+    def set_low_power(self, enabled):
+        # Реже тикающие общие часы и без декоративных рамок и звёзд
+        shared_scheduler().set_low_power(enabled)
+        if "functions_menu" in self.pages:
+            self.low_power_btn.setText(self.low_power_text())
+
+    def toggle_low_power(self):
+        enabled = not shared_scheduler().low_power
+        self.set_low_power(enabled)
+        self.user_data.set_setting("low_power", enabled)
+        self.schedule_save()
 
     def show_support(self):
+        import webbrowser
         dialog = QDialog(self)
         dialog.setWindowModality(Qt.ApplicationModal)
         dialog.setObjectName("supportDialog")
@@ -1097,23 +1493,9 @@ class MainApp(QWidget):
 
         dialog.exec()
 
-    def load_cursor_files(self, folder_path):
-        cursor_files = {}
-        if os.path.exists(folder_path):
-            for name in os.listdir(folder_path):
-                if name.lower().endswith((".cur", ".ani")):
-                    key = name.lower().split(".")[0]
-                    cursor_files[key] = os.path.abspath(os.path.join(folder_path, name))
-        return cursor_files
-
     def reset_to_default_cursor(self):
         try:
-            import winreg
-            reg_path = r"Control Panel\Cursors"
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, reg_path, 0, winreg.KEY_SET_VALUE) as key:
-                for key_name, reg_name in CURSOR_KEYS.items():
-                    winreg.SetValueEx(key, reg_name, 0, winreg.REG_SZ, "")
-            ctypes.windll.user32.SystemParametersInfoW(0x0057, 0, None, 3)
+            reset_scheme()
             self.show_notification("Восстановлен стандартный курсор Windows!")
         except Exception as e:
             logging.error(f"Ошибка сброса курсора: {str(e)}")
@@ -1124,7 +1506,6 @@ class MainApp(QWidget):
         import zipfile
         import io
         import shutil
-        import subprocess
 
         repo_api = "https://api.github.com/repos/ShustovCarleone/Cursor-Galaxy/releases/latest"
 
@@ -1185,8 +1566,13 @@ class MainApp(QWidget):
         self.start_check_process()
 
 if __name__ == "__main__":
+    # Пул процессов проверки целостности в собранном exe
+    import multiprocessing
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
+    startup_profiler.mark("application")
     window = MainApp()
     window.show()
+    startup_profiler.mark("show")
     sys.exit(app.exec())
@@ -0,0 +1,159 @@
+import os
+import json
+import mmap
+import zlib
+import hashlib
+import zipfile
+import tempfile
+import logging
+
+MANIFEST_VERSION = 2
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digests(path, chunk_size=HASH_CHUNK_SIZE):
+    # MD5 и CRC32 за один проход: CRC32 сверяется с центральным каталогом ZIP
+    digest = hashlib.md5()
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+    return digest.hexdigest(), crc
+
+
+class MappedFile(mmap.mmap):
+    # zipfile проверяет fp.seekable(), а у mmap этого метода нет до Python 3.13
+    def seekable(self):
+        return True
+
+
+def archive_digests(zip_path, suffixes, progress=None, chunk_size=HASH_CHUNK_SIZE):
+    # MD5 записей архива без распаковки целиком: архив отображается в память через mmap,
+    # каждая запись хешируется кусками по chunk_size, так что пиковое потребление памяти
+    # не зависит ни от размера архива, ни от размера самой большой записи
+    digests = {}
+    with open(zip_path, 'rb') as f:
+        try:
+            source = MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Пустой файл отобразить нельзя, zipfile сам сообщит об ошибке формата
+            source = f
+        try:
+            with zipfile.ZipFile(source, 'r') as zip_ref:
+                infos = zip_ref.infolist()
+                for idx, info in enumerate(infos):
+                    if info.filename.endswith(suffixes):
+                        digest = hashlib.md5()
+                        with zip_ref.open(info) as entry:
+                            for chunk in iter(lambda: entry.read(chunk_size), b""):
+                                digest.update(chunk)
+                        digests[info.filename] = digest.hexdigest()
+                    if progress:
+                        progress(idx + 1, len(infos), info.filename)
+        finally:
+            if source is not f:
+                source.close()
+    return digests
+
+
+def atomic_write_json(path, data):
+    # Пишем во временный файл рядом с целевым и подменяем его через os.replace,
+    # чтобы при падении на диске оставалась либо старая, либо новая версия
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class HashManifest:
+    # Кэш хешей локальной библиотеки: relpath -> (size, mtime_ns, md5, crc32).
+    # Пути хранятся относительно root с "/" в качестве разделителя,
+    # в том же виде, что и имена записей в CursorsLib.zip.
+    def __init__(self, path, root):
+        self.path = path
+        self.root = root
+        self.entries = {}
+        self.hashed = 0
+        self.reused = 0
+
+    def load(self):
+        self.entries = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                logging.info("Версия манифеста изменилась, хеши будут пересчитаны")
+                return
+            self.entries = {
+                rel: (size, mtime_ns, digest, crc)
+                for rel, size, mtime_ns, digest, crc in data.get("files", [])
+            }
+        except Exception as e:
+            logging.warning(f"Манифест {self.path} повреждён и будет пересоздан: {str(e)}")
+            self.entries = {}
+
+    def save(self):
+        atomic_write_json(self.path, {
+            "version": MANIFEST_VERSION,
+            "files": [[rel, *entry] for rel, entry in sorted(self.entries.items())],
+        })
+
+    def relpath(self, file_path):
+        return os.path.relpath(file_path, self.root).replace(os.sep, "/")
+
+    def scan(self, paths):
+        # Обходим каталоги и пересчитываем MD5 только для файлов,
+        # у которых изменились размер или mtime. Записи удалённых файлов выбрасываются.
+        self.hashed = 0
+        self.reused = 0
+        entries = {}
+        for path in paths:
+            if not os.path.exists(path):
+                os.makedirs(path, exist_ok=True)
+            for entry in self._walk(path):
+                rel = self.relpath(entry.path)
+                try:
+                    st = entry.stat()
+                    cached = self.entries.get(rel)
+                    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                        entries[rel] = cached
+                        self.reused += 1
+                    else:
+                        entries[rel] = (st.st_size, st.st_mtime_ns, *file_digests(entry.path))
+                        self.hashed += 1
+                except Exception as e:
+                    logging.warning(f"Не удалось вычислить MD5 для {entry.path}: {str(e)}")
+        self.entries = entries
+        return {rel: entry[2] for rel, entry in entries.items()}
+
+    def matches(self, rel, size, crc):
+        entry = self.entries.get(rel)
+        return entry is not None and entry[0] == size and entry[3] == crc
+
+    def _walk(self, path):
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+            except OSError as e:
+                logging.warning(f"Не удалось прочитать каталог {current}: {str(e)}")
@@ -0,0 +1,141 @@
+import re
+import struct
+import logging
+import requests
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD64_SIGNATURE = b"PK\x06\x06"
+EOCD64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+CENTRAL_DIR_SIGNATURE = b"PK\x01\x02"
+
+EOCD_STRUCT = struct.Struct("<4s4H2LH")
+EOCD64_STRUCT = struct.Struct("<4sQ2H2L4Q")
+EOCD64_LOCATOR_STRUCT = struct.Struct("<4sLQL")
+CENTRAL_DIR_STRUCT = struct.Struct("<4s6H3L5H2L")
+
+# EOCD (22 байта) + максимальная длина комментария архива
+TAIL_SIZE = EOCD_STRUCT.size + 0xFFFF
+REQUEST_TIMEOUT = 30
+
+
+class RangeNotSupported(Exception):
+    pass
+
+
+class RemoteZipEntry:
+    __slots__ = ("name", "crc", "size", "compressed_size")
+
+    def __init__(self, name, crc, size, compressed_size):
+        self.name = name
+        self.crc = crc
+        self.size = size
+        self.compressed_size = compressed_size
+
+
+class RemoteZip:
+    # Читает только центральный каталог удалённого ZIP через HTTP Range:
+    # один запрос на хвост файла с EOCD и, если каталог в него не поместился, второй — на сам каталог.
+    def __init__(self, url, session=None, timeout=REQUEST_TIMEOUT):
+        self.url = url
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.total_size = None
+        self.bytes_fetched = 0
+
+    def fetch_range(self, start=None, end=None, suffix=None):
+        if suffix is not None:
+            header = f"bytes=-{suffix}"
+        else:
+            header = f"bytes={start}-{end - 1}"
+        response = self.session.get(self.url, headers={"Range": header}, stream=True, timeout=self.timeout)
+        try:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise RangeNotSupported(f"Сервер ответил {response.status_code} на Range-запрос")
+            match = re.match(r"bytes (\d+)-(\d+)/(\d+|\*)", response.headers.get("Content-Range", ""))
+            if not match:
+                raise RangeNotSupported("Сервер не вернул Content-Range")
+            first = int(match.group(1))
+            if match.group(3) != "*":
+                self.total_size = int(match.group(3))
+            data = response.content
+        finally:
+            response.close()
+        self.bytes_fetched += len(data)
+        return first, data
+
+    def read_central_directory(self):
+        tail_start, tail = self.fetch_range(suffix=TAIL_SIZE)
+        eocd_pos = tail.rfind(EOCD_SIGNATURE)
+        if eocd_pos < 0 or len(tail) - eocd_pos < EOCD_STRUCT.size:
+            raise ValueError("Не найдена запись конца центрального каталога")
+        (_, _, _, _, total_entries, cd_size, cd_offset, _) = EOCD_STRUCT.unpack_from(tail, eocd_pos)
+
+        if cd_offset == 0xFFFFFFFF or cd_size == 0xFFFFFFFF or total_entries == 0xFFFF:
+            total_entries, cd_size, cd_offset = self._read_zip64_end(tail_start, tail, eocd_pos)
+
+        relative = cd_offset - tail_start
+        if 0 <= relative and relative + cd_size <= len(tail):
+            directory = tail[relative:relative + cd_size]
+        else:
+            _, directory = self.fetch_range(cd_offset, cd_offset + cd_size)
+        logging.info(f"Центральный каталог прочитан, загружено {self.bytes_fetched} байт")
+        return parse_central_directory(directory, total_entries)
+
+    def _read_zip64_end(self, tail_start, tail, eocd_pos):
+        locator_pos = eocd_pos - EOCD64_LOCATOR_STRUCT.size
+        if locator_pos < 0:
+            raise ValueError("Не найден локатор ZIP64")
+        signature, _, eocd64_offset, _ = EOCD64_LOCATOR_STRUCT.unpack_from(tail, locator_pos)
+        if signature != EOCD64_LOCATOR_SIGNATURE:
+            raise ValueError("Повреждён локатор ZIP64")
+        relative = eocd64_offset - tail_start
+        if 0 <= relative and relative + EOCD64_STRUCT.size <= len(tail):
+            record = tail[relative:relative + EOCD64_STRUCT.size]
+        else:
+            _, record = self.fetch_range(eocd64_offset, eocd64_offset + EOCD64_STRUCT.size)
+        fields = EOCD64_STRUCT.unpack(record)
+        if fields[0] != EOCD64_SIGNATURE:
+            raise ValueError("Повреждена запись конца каталога ZIP64")
+        return fields[7], fields[8], fields[9]
+
+
+def parse_central_directory(data, expected_entries=None):
+    entries = {}
+    pos = 0
+    while pos + CENTRAL_DIR_STRUCT.size <= len(data):
+        fields = CENTRAL_DIR_STRUCT.unpack_from(data, pos)
+        if fields[0] != CENTRAL_DIR_SIGNATURE:
+            break
+        flags, crc, compressed_size, size = fields[3], fields[7], fields[8], fields[9]
+        name_len, extra_len, comment_len = fields[10], fields[11], fields[12]
+        pos += CENTRAL_DIR_STRUCT.size
+        raw_name = data[pos:pos + name_len]
+        extra = data[pos + name_len:pos + name_len + extra_len]
+        pos += name_len + extra_len + comment_len
+
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        if size == 0xFFFFFFFF or compressed_size == 0xFFFFFFFF:
+            size, compressed_size = _zip64_sizes(extra, size, compressed_size)
+        entries[name] = RemoteZipEntry(name, crc, size, compressed_size)
+
+    if expected_entries is not None and len(entries) != expected_entries:
+        logging.warning(f"В центральном каталоге {len(entries)} записей вместо {expected_entries}")
+    return entries
+
+
+def _zip64_sizes(extra, size, compressed_size):
+    pos = 0
+    while pos + 4 <= len(extra):
+        header_id, length = struct.unpack_from("<2H", extra, pos)
+        if header_id == 0x0001:
+            values = extra[pos + 4:pos + 4 + length]
+            offset = 0
+            if size == 0xFFFFFFFF:
+                size = struct.unpack_from("<Q", values, offset)[0]
+                offset += 8
+            if compressed_size == 0xFFFFFFFF:
+                compressed_size = struct.unpack_from("<Q", values, offset)[0]
+            break
+        pos += 4 + length
+    return size, compressed_size
@@ -0,0 +1,160 @@
+import os
+import json
+import logging
+from collections import OrderedDict
+
+from catalog import CURSOR_EXTENSIONS, cursor_role
+from system_cursors import scheme_values
+
+COMPILED_SCHEME_LIMIT = 2048
+# Заголовок .cur с одной записью каталога — 22 байта; файл короче заведомо повреждён
+MIN_CURSOR_SIZE = 22
+
+
+class CompiledScheme:
+    # Схема пака, собранная один раз: роли и значения реестра с абсолютными путями,
+    # stat-отпечатки файлов (путь, размер, mtime) и найденные при сборке проблемы.
+    # Все поля — кортежи; схема не меняется, устаревшую SchemeCache заменяет новой
+    __slots__ = ("category", "name", "roles", "values", "fingerprints", "problems")
+
+    def __init__(self, category, name, roles, values, fingerprints, problems):
+        self.category = category
+        self.name = name
+        self.roles = roles
+        self.values = values
+        self.fingerprints = fingerprints
+        self.problems = problems
+
+    def scheme(self):
+        # {роль: путь} — формат каталога
+        return dict(self.roles)
+
+    def to_json(self):
+        return json.dumps({"roles": self.roles, "values": self.values, "fingerprints": self.fingerprints,
+                           "problems": self.problems}, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, category, name, data):
+        data = json.loads(data)
+        return cls(category, name, tuple(map(tuple, data["roles"])), tuple(map(tuple, data["values"])),
+                   tuple(map(tuple, data["fingerprints"])), tuple(data["problems"]))
+
+    def is_current(self):
+        # Файлы на диске те же, что при сборке
+        for path, size, mtime_ns in self.fingerprints:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                return False
+        return True
+
+
+def compile_scheme(category, name, files):
+    # files — [(роль, путь, размер, mtime)]; None, если курсоров в паке нет
+    if not files:
+        return None
+    files = sorted(files)
+    roles = tuple((role, os.path.abspath(path)) for role, path, _, _ in files)
+    values = tuple(scheme_values(dict(roles)).items())
+    problems = [f"{role}: файл обрезан ({size} байт)" for role, _, size, _ in files if size < MIN_CURSOR_SIZE]
+    if not values:
+        problems.append("нет ни одного известного курсора")
+    fingerprints = tuple((os.path.abspath(path), size, mtime_ns) for _, path, size, mtime_ns in files)
+    return CompiledScheme(category, name, roles, values, fingerprints, tuple(problems))
+
+
+def disk_files(path):
+    # Курсоры пака прямо с диска — для паков, которых ещё нет в каталоге
+    files = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.lower().endswith(CURSOR_EXTENSIONS):
+                    st = entry.stat()
+                    files.append((cursor_role(entry.name), entry.path, st.st_size, st.st_mtime_ns))
+    except OSError:
+        pass
+    return files
+
+
+class SchemeCache:
+    # Собранные схемы паков по (категория, пак): в памяти — LRU-словарь, на диске —
+    # таблица compiled каталога, которую каталог сам чистит при переиндексации пака.
+    # warm() собирает схемы заранее (страница браузера, избранное, недавние), и get()
+    # в момент применения — поиск в словаре без обращения к диску и каталогу.
+    def __init__(self, catalog, limit=COMPILED_SCHEME_LIMIT):
+        self.catalog = catalog
+        self.limit = limit
+        self.entries = OrderedDict()
+        self.compiled = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, category, name):
+        key = (category, name)
+        scheme = self.entries.get(key)
+        if scheme is None:
+            # Схему не подготовили заранее — собираем сейчас, как раньше при клике
+            self.misses += 1
+            self.warm(category, [name])
+            return self.entries.get(key)
+        self.entries.move_to_end(key)
+        return scheme
+
+    def warm(self, category, names):
+        missing = [name for name in dict.fromkeys(names) if (category, name) not in self.entries]
+        if not missing:
+            return
+        stored = self.catalog.compiled(category, missing)
+        rebuild = []
+        for name in missing:
+            data = stored.get(name)
+            scheme = CompiledScheme.from_json(category, name, data) if data else None
+            if scheme is not None and scheme.is_current():
+                self.put(scheme)
+            else:
+                rebuild.append(name)
+        if not rebuild:
+            return
+
+        indexed = self.catalog.pack_files(category, rebuild)
+        persist = []
+        for name in rebuild:
+            files = indexed.get(name)
+            if files is None or name in stored:
+                # Пака нет в индексе или файлы изменились после индексации — собираем с диска;
+                # такую схему не сохраняем, её заменит пересборка после обновления каталога
+                files = disk_files(os.path.join(self.catalog.roots[category], name))
+                scheme = compile_scheme(category, name, files)
+            else:
+                scheme = compile_scheme(category, name, files)
+                if scheme is not None:
+                    persist.append((name, scheme.to_json()))
+            if scheme is not None:
+                self.compiled += 1
+                self.put(scheme)
+        if persist:
+            self.catalog.store_compiled(category, persist)
+        logging.info(f"Собрано схем {category}: {len(rebuild)}, сохранено {len(persist)}")
+
+    def warm_names(self, names):
+        # Недавние хранятся без категории — ищем её в каталоге
+        by_category = {}
+        for name, category in self.catalog.locate(names).items():
+            by_category.setdefault(category, []).append(name)
+        for category, category_names in by_category.items():
+            self.warm(category, category_names)
+
+    def put(self, scheme):
+        key = (scheme.category, scheme.name)
+        self.entries[key] = scheme
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.limit:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, category, name):
+        self.entries.pop((category, name), None)
@@ -0,0 +1,151 @@
+import math
+from collections import Counter
+
+FUZZY_THRESHOLD = 0.6
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def match_tier(lowered, query):
+    # 0 — совпадение с начала имени, 1 — с начала слова, 2 — подстрока, None — нет совпадения
+    pos = lowered.find(query)
+    if pos < 0:
+        return None
+    if pos == 0:
+        return 0
+    while pos > 0:
+        if not lowered[pos - 1].isalnum():
+            return 1
+        pos = lowered.find(query, pos + 1)
+    return 2
+
+
+class SearchIndex:
+    # Индекс имён паков для поиска в браузере. Имена хранятся в нижнем регистре,
+    # триграммный индекс строится при первом запросе длиннее двух символов.
+    # Выдача ранжируется: начало имени, начало слова, подстрока; если точных совпадений
+    # нет — нечёткие по сходству триграмм (коэффициент Дайса: общие триграммы
+    # относительно триграмм запроса и имени, так что длинное имя с теми же общими
+    # частями ниже короткого). Внутри ранга — порядок каталога (по имени без учёта регистра).
+    def __init__(self, names=()):
+        self.build(names)
+
+    def build(self, names):
+        self.names = []
+        self.lowered = []
+        # Число триграмм каждого имени — для ранжирования нечётких совпадений; заполняется вместе с postings
+        self.gram_counts = []
+        self.ids = {}
+        self.free = []
+        self.postings = None
+        self.ordered = None
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, name):
+        if name in self.ids:
+            return
+        lowered = name.lower()
+        if self.free:
+            idx = self.free.pop()
+            self.names[idx] = name
+            self.lowered[idx] = lowered
+        else:
+            idx = len(self.names)
+            self.names.append(name)
+            self.lowered.append(lowered)
+            self.gram_counts.append(0)
+        self.ids[name] = idx
+        self.ordered = None
+        if self.postings is not None:
+            grams = trigrams(lowered)
+            self.gram_counts[idx] = len(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(idx)
+
+    def remove(self, name):
+        idx = self.ids.pop(name, None)
+        if idx is None:
+            return
+        if self.postings is not None:
+            for gram in trigrams(self.lowered[idx]):
+                posting = self.postings.get(gram)
+                if posting is not None:
+                    posting.discard(idx)
+        self.names[idx] = None
+        self.lowered[idx] = None
+        self.free.append(idx)
+        self.ordered = None
+
+    def build_postings(self):
+        # Можно вызвать заранее в фоновом потоке, чтобы первый поиск не строил индекс в GUI
+        if self.postings is None:
+            postings = {}
+            for idx in self.ids.values():
+                grams = trigrams(self.lowered[idx])
+                self.gram_counts[idx] = len(grams)
+                for gram in grams:
+                    posting = postings.get(gram)
+                    if posting is None:
+                        postings[gram] = {idx}
+                    else:
+                        posting.add(idx)
+            self.postings = postings
+        return self.postings
+
+    def _ensure_order(self):
+        if self.ordered is None:
+            self.ordered = sorted(self.ids.values(), key=lambda idx: (self.lowered[idx], self.names[idx]))
+            self.rank = [0] * len(self.names)
+            for position, idx in enumerate(self.ordered):
+                self.rank[idx] = position
+        return self.ordered
+
+    def search(self, query, limit=None):
+        query = query.lower().strip()
+        ordered = self._ensure_order()
+        if not query:
+            return [self.names[idx] for idx in ordered[:limit]]
+
+        tiers = ([], [], [])
+        fuzzy = []
+        query_grams = trigrams(query)
+        if query_grams:
+            counts = Counter()
+            for gram in query_grams:
+                counts.update(self.build_postings().get(gram, ()))
+            needed = max(1, math.ceil(len(query_grams) * FUZZY_THRESHOLD))
+            candidates = [idx for idx, shared in counts.items() if shared >= needed]
+            if len(candidates) * 8 > len(ordered):
+                # Кандидатов много: дешевле пройти каталог по порядку, чем сортировать
+                candidates = set(candidates)
+                candidates = [idx for idx in ordered if idx in candidates]
+            else:
+                candidates.sort(key=self.rank.__getitem__)
+            for idx in candidates:
+                tier = match_tier(self.lowered[idx], query) if counts[idx] == len(query_grams) else None
+                if tier is None:
+                    fuzzy.append(idx)
+                else:
+                    tiers[tier].append(idx)
+        else:
+            # Запрос короче триграммы: линейный проход по именам в нижнем регистре
+            lowered = self.lowered
+            for idx in ordered:
+                if query in lowered[idx]:
+                    tiers[match_tier(lowered[idx], query)].append(idx)
+
+        result = tiers[0] + tiers[1] + tiers[2]
+        if not result:
+            # Нечёткие совпадения — только как подсказка, когда точных нет: иначе имена
+            # с общими частями ("Pack 0001", "Pack 0002") заполняют выдачу шумом
+            # sort устойчив: при равном сходстве остаётся порядок каталога
+            gram_counts = self.gram_counts
+            fuzzy.sort(key=lambda idx: -2 * counts[idx] / (len(query_grams) + gram_counts[idx]))
+            result = fuzzy
+        return [self.names[idx] for idx in result[:limit]]
@@ -0,0 +1,74 @@
+import random
+from array import array
+
+from PySide6.QtCore import QPointF, Qt
+from PySide6.QtGui import QPixmap, QPainter, QRadialGradient, QBrush, QColor
+
+STAR_COUNT = 150
+TWINKLE_INTERVAL_MS = 100
+COORD_SCALE = 65535
+MIN_ALPHA = 50
+MAX_ALPHA = 255
+
+
+class StarField:
+    # Общий звёздный фон для всех StarryBackground: одно поле звёзд в нормированных
+    # координатах (массивы array вместо списка кортежей) и заранее отрисованные спрайты
+    # звёзд по размерам. Мерцание тактируется AnimationScheduler через виджеты фона,
+    # поэтому скрытые фоны поле не трогают; виджеты перерисовывают лишь области под звёздами.
+    def __init__(self, count=STAR_COUNT, interval=TWINKLE_INTERVAL_MS, seed=None):
+        rng = random.Random(seed)
+        self.rng = rng
+        self.xs = array("H", (rng.randint(0, COORD_SCALE) for _ in range(count)))
+        self.ys = array("H", (rng.randint(0, COORD_SCALE) for _ in range(count)))
+        self.sizes = array("B", (rng.randint(1, 3) for _ in range(count)))
+        self.alphas = array("B", (rng.randint(MIN_ALPHA, MAX_ALPHA) for _ in range(count)))
+        self.interval = interval
+        self.sprites = {}
+        self.step = None
+        self.ticks = 0
+
+    def __len__(self):
+        return len(self.xs)
+
+    def sprite(self, size):
+        # Звезда прежнего вида: круг радиуса size с радиальным градиентом до прозрачности на 2*size.
+        # Яркость звезды задаётся прозрачностью при отрисовке спрайта
+        pixmap = self.sprites.get(size)
+        if pixmap is None:
+            extent = size * 2 + 2
+            pixmap = QPixmap(extent, extent)
+            pixmap.fill(Qt.transparent)
+            center = QPointF(extent / 2, extent / 2)
+            gradient = QRadialGradient(center, size * 2)
+            gradient.setColorAt(0, QColor(255, 255, 255, 255))
+            gradient.setColorAt(1, QColor(255, 255, 255, 0))
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QBrush(gradient))
+            painter.drawEllipse(center, size, size)
+            painter.end()
+            self.sprites[size] = pixmap
+        return pixmap
+
+    def twinkle(self, now):
+        # Все видимые фоны делят одно поле: звёзды перемешиваются раз за интервал,
+        # сколько бы фонов ни попросило кадр
+        step = now // self.interval
+        if step == self.step:
+            return
+        self.step = step
+        randint = self.rng.randint
+        self.alphas = array("B", (randint(MIN_ALPHA, MAX_ALPHA) for _ in range(len(self.alphas))))
+        self.ticks += 1
+
+
+_shared = None
+
+
+def shared_star_field():
+    global _shared
+    if _shared is None:
+        _shared = StarField()
+    return _shared
@@ -0,0 +1,61 @@
+import time
+import logging
+
+# Цель на холодный старт: от первой строки main.py до первой отрисовки окна
+STARTUP_BUDGET_MS = 300
+
+
+class StartupProfiler:
+    # Замеры запуска окна: фазы отмечаются по порядку вызовом mark(), каждая длится
+    # от предыдущей отметки. Первая отрисовка закрывает замер и пишет отчёт в журнал.
+    # Модуль без Qt, чтобы main.py импортировал его раньше всего остального
+    def __init__(self, budget_ms=STARTUP_BUDGET_MS):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+        self.first_paint_ms = None
+        self.budget_ms = budget_ms
+        self.callbacks = []
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def painted(self):
+        if self.first_paint_ms is not None:
+            return
+        self.mark("first paint")
+        self.first_paint_ms = self.elapsed_ms()
+        self.log()
+        for callback in self.callbacks:
+            callback(self.report())
+        self.callbacks.clear()
+
+    def when_painted(self, callback):
+        # Колбэк получит report() сразу после первой отрисовки
+        if self.first_paint_ms is not None:
+            callback(self.report())
+        else:
+            self.callbacks.append(callback)
+
+    def report(self):
+        return {
+            "phases_ms": {name: round(duration, 2) for name, duration in self.phases},
+            "first_paint_ms": round(self.first_paint_ms, 2) if self.first_paint_ms is not None else None,
+            "budget_ms": self.budget_ms,
+        }
+
+    def log(self):
+        for name, duration in self.phases:
+            logging.info(f"Запуск: {name} — {duration:.1f} мс")
+        if self.first_paint_ms > self.budget_ms:
+            logging.warning(f"Первая отрисовка через {self.first_paint_ms:.0f} мс, цель {self.budget_ms} мс")
+        else:
+            logging.info(f"Первая отрисовка через {self.first_paint_ms:.0f} мс")
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,106 @@
+import os
+import logging
+
+from constants import CURSOR_LIB_PATH, ANIME_PATH, CLASSIC_PATH, MANIFEST_FILE, DOWNLOAD_CACHE_PATH, DOWNLOAD_SEGMENTS
+from manifest import HashManifest, archive_digests
+from remote_zip import RemoteZip, RangeNotSupported
+from downloads import DownloadCache, fetch_archive
+from installer import DeltaInstaller, recover_install
+
+# Проверка и установка библиотеки курсоров без Qt. Прогресс сообщается через колбэки:
+# окно пересылает его сигналами воркеров, cli.py печатает в stderr.
+
+
+def check_library(url, progress=None):
+    # True — локальная библиотека отличается от архива по адресу url
+    progress = progress or (lambda percent, text: None)
+    logging.info("Проверка локальных файлов...")
+    recover_install(CURSOR_LIB_PATH)
+
+    # Собираем локальные файлы и их MD5-хеши, пересчитывая только изменившиеся
+    manifest = HashManifest(MANIFEST_FILE, CURSOR_LIB_PATH)
+    manifest.load()
+    local_files = manifest.scan([ANIME_PATH, CLASSIC_PATH])
+    manifest.save()
+    logging.info(f"Локальных файлов: {len(local_files)}, пересчитано хешей: {manifest.hashed}")
+
+    try:
+        return verify_central_directory(url, manifest, progress)
+    except RangeNotSupported as e:
+        logging.info(f"Range-запросы недоступны ({str(e)}), скачиваем архив целиком")
+    return verify_full_archive(url, local_files, progress)
+
+
+def verify_central_directory(url, manifest, progress):
+    # Сверяем CRC32 и размеры из центрального каталога архива с манифестом,
+    # не скачивая сам архив
+    progress(0, "Чтение каталога архива...")
+    remote_files = RemoteZip(url).read_central_directory()
+    cursor_entries = [entry for name, entry in remote_files.items() if name.endswith(('.cur', '.ani'))]
+    progress(100, f"Проверено файлов: {len(cursor_entries)}")
+    for entry in cursor_entries:
+        if not manifest.matches(entry.name, entry.size, entry.crc):
+            logging.info(f"Файл {entry.name} отсутствует или изменился")
+            return True
+    return False
+
+
+def verify_full_archive(url, local_files, progress):
+    # Скачиваем архив в кэш загрузок и проверяем содержимое.
+    # Если обновление понадобится, install_library возьмёт архив из кэша.
+    def report(downloaded, total, speed):
+        if total > 0:
+            progress(int((downloaded / total) * 100), f"Скачивание архива... Скорость: {speed:.2f} МБ/с")
+
+    cache = DownloadCache(DOWNLOAD_CACHE_PATH)
+    zip_path, is_temporary = fetch_archive(url, cache, progress=report, segments=DOWNLOAD_SEGMENTS)
+
+    def report_entry(done, total, file_name):
+        progress(int((done / total) * 100), f"Проверка файла: {file_name}")
+
+    try:
+        # Архив распаковывается в CURSOR_LIB_PATH, поэтому имя записи
+        # совпадает с путём файла в манифесте
+        github_files = archive_digests(zip_path, ('.cur', '.ani'), progress=report_entry)
+    finally:
+        # Файл без валидаторов в кэш не попадает, и второй раз его не использовать
+        if is_temporary:
+            os.remove(zip_path)
+
+    # Сравниваем локальные файлы с файлами в архиве
+    for file_path, github_md5 in github_files.items():
+        local_md5 = local_files.get(file_path)
+        if not local_md5 or local_md5 != github_md5:
+            return True
+    return False
+
+
+def install_library(url, install_dir, progress=None, extract_progress=None):
+    # Скачивание (или архив из кэша) и дельта-распаковка; возвращает InstallReport
+    logging.info(f"Начинается загрузка архива с {url}")
+
+    def report(downloaded, total, speed):
+        if total > 0 and progress:
+            progress(int((downloaded / total) * 100), "CursorsLib.zip", speed)
+
+    cache = DownloadCache(DOWNLOAD_CACHE_PATH)
+    zip_path, is_temporary = fetch_archive(url, cache, progress=report, segments=DOWNLOAD_SEGMENTS)
+
+    logging.info("Загрузка завершена, начинаем распаковку")
+    try:
+        result = extract_zip(zip_path, install_dir, extract_progress)
+    finally:
+        if is_temporary:
+            os.remove(zip_path)
+    logging.info("Распаковка завершена")
+    return result
+
+
+def extract_zip(zip_path, extract_to, progress=None):
+    # Распаковываем только добавленные и изменённые файлы, библиотека подменяется целиком в конце
+    manifest = HashManifest(MANIFEST_FILE, extract_to)
+    manifest.load()
+    installer = DeltaInstaller(zip_path, extract_to, manifest=manifest, progress=progress)
+    report = installer.install()
+    logging.info(f"Итог распаковки: {report}")
+    return report
@@ -0,0 +1,309 @@
+import os
+import sys
+import time
+import ctypes
+import shutil
+import logging
+import subprocess
+
+from constants import CURSOR_KEYS, XCURSOR_CACHE_PATH
+from xcursor import THEME_PREFIX, compile_theme, theme_name, theme_values
+
+REG_PATH = r"Control Panel\Cursors"
+SPI_SETCURSORS = 0x0057
+SPIF_UPDATE_AND_SEND = 3
+CURSOR_EXTENSIONS = (".cur", ".ani")
+# Сколько прежних схем помнит CursorApplier для отката
+SNAPSHOT_LIMIT = 10
+BACKEND_ENV = "CURSOR_APPLY_BACKEND"
+GSETTINGS_SCHEMA = "org.gnome.desktop.interface"
+
+# Применение схемы курсоров через сменный бэкенд. Бэкенд умеет три вещи:
+# read(имена) — текущие значения реестра (None — значения нет), write(значения) —
+# записать пачку одним открытием ключа (None удаляет значение) и broadcast() —
+# разослать системе SPI_SETCURSORS. CursorApplier проверяет схему до записи,
+# снимает снимок затронутых значений и откатывает запись, если она не удалась.
+
+
+class RegistryBackend:
+    # HKCU\Control Panel\Cursors и SystemParametersInfoW — только Windows
+    def read(self, names):
+        import winreg
+        values = {}
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_PATH, 0, winreg.KEY_QUERY_VALUE) as key:
+            for name in names:
+                try:
+                    values[name] = winreg.QueryValueEx(key, name)[0]
+                except FileNotFoundError:
+                    values[name] = None
+        return values
+
+    def write(self, values):
+        import winreg
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, REG_PATH, 0, winreg.KEY_SET_VALUE) as key:
+            for name, path in values.items():
+                if path is None:
+                    try:
+                        winreg.DeleteValue(key, name)
+                    except FileNotFoundError:
+                        pass
+                else:
+                    winreg.SetValueEx(key, name, 0, winreg.REG_EXPAND_SZ if "%" in path else winreg.REG_SZ, path)
+
+    def broadcast(self):
+        if not ctypes.windll.user32.SystemParametersInfoW(SPI_SETCURSORS, 0, None, SPIF_UPDATE_AND_SEND):
+            raise OSError("SystemParametersInfoW(SPI_SETCURSORS) не выполнен")
+
+
+class MemoryBackend:
+    # Реестр в словаре: для проверки и замеров применения вне Windows.
+    # batches — записанные пачки по порядку, broadcasts — число рассылок;
+    # write_delay/broadcast_delay (с) имитируют стоимость настоящих вызовов,
+    # fail_writes — сколько следующих записей оборвать на середине пачки
+    def __init__(self, values=None, write_delay=0.0, broadcast_delay=0.0):
+        self.values = dict(values or {})
+        self.batches = []
+        self.broadcasts = 0
+        self.write_delay = write_delay
+        self.broadcast_delay = broadcast_delay
+        self.fail_writes = 0
+
+    def read(self, names):
+        return {name: self.values.get(name) for name in names}
+
+    def write(self, values):
+        if self.write_delay:
+            time.sleep(self.write_delay)
+        if self.fail_writes:
+            # Сбой посреди пачки: половина значений уже записана, как при ошибке SetValueEx
+            self.fail_writes -= 1
+            items = list(values.items())
+            self.store(dict(items[:len(items) // 2]))
+            raise OSError("имитация сбоя записи в реестр")
+        self.store(values)
+        self.batches.append(dict(values))
+
+    def store(self, values):
+        for name, path in values.items():
+            if path is None:
+                self.values.pop(name, None)
+            else:
+                self.values[name] = path
+
+    def broadcast(self):
+        if self.broadcast_delay:
+            time.sleep(self.broadcast_delay)
+        self.broadcasts += 1
+
+
+class TimingBackend:
+    # Обёртка над другим бэкендом: длительность каждого вызова в мс по операциям
+    def __init__(self, backend):
+        self.backend = backend
+        self.timings = {"read": [], "write": [], "broadcast": []}
+
+    def timed(self, operation, *args):
+        start = time.perf_counter()
+        try:
+            return getattr(self.backend, operation)(*args)
+        finally:
+            self.timings[operation].append((time.perf_counter() - start) * 1000)
+
+    def read(self, names):
+        return self.timed("read", names)
+
+    def write(self, values):
+        return self.timed("write", values)
+
+    def broadcast(self):
+        return self.timed("broadcast")
+
+
+class XcursorBackend:
+    # Linux: схема собирается в тему Xcursor (xcursor.py) в кеше по хешу содержимого,
+    # а применение — ссылка ~/.icons/<тема> на кеш и Inherits в ~/.icons/default/index.theme.
+    # Повторное применение уже собранного пака — только переключение ссылки.
+    # Значения, как в реестре, дописываются к текущей схеме; пустые убирают курсор из темы
+    def __init__(self, icons_dir=None, cache_dir=XCURSOR_CACHE_PATH):
+        self.icons_dir = icons_dir or os.path.expanduser("~/.icons")
+        self.cache_dir = cache_dir
+        self.default_theme = os.path.join(self.icons_dir, "default", "index.theme")
+        self.backup = self.default_theme + ".cursor-galaxy-backup"
+        self.built = 0
+
+    def active_theme(self):
+        # Имя нашей темы из ~/.icons/default/index.theme или None
+        try:
+            with open(self.default_theme, "r", encoding="utf-8") as f:
+                for line in f:
+                    key, _, value = line.partition("=")
+                    if key.strip() == "Inherits" and value.strip().startswith(THEME_PREFIX):
+                        return value.strip()
+        except OSError:
+            pass
+        return None
+
+    def current_values(self):
+        name = self.active_theme()
+        return theme_values(os.path.join(self.icons_dir, name)) if name else {}
+
+    def read(self, names):
+        values = self.current_values()
+        return {name: values.get(name) for name in names}
+
+    def write(self, values):
+        merged = self.current_values()
+        merged.update(values)
+        merged = {name: path for name, path in merged.items() if path}
+        if not merged:
+            self.deactivate()
+            return
+        theme_dir, built = compile_theme(merged, self.cache_dir)
+        self.built += built
+        self.activate(theme_name(os.path.basename(theme_dir)), theme_dir)
+
+    def activate(self, name, theme_dir):
+        os.makedirs(os.path.dirname(self.default_theme), exist_ok=True)
+        link = os.path.join(self.icons_dir, name)
+        if os.path.realpath(link) != os.path.realpath(theme_dir):
+            replace_file(link, lambda tmp: os.symlink(theme_dir, tmp))
+        if os.path.exists(self.default_theme) and not self.active_theme() and not os.path.exists(self.backup):
+            # Чужую тему по умолчанию сохраняем, чтобы сброс вернул её
+            shutil.copy2(self.default_theme, self.backup)
+        replace_file(self.default_theme, lambda tmp: write_text(tmp, f"[Icon Theme]\nName=Default\nInherits={name}\n"))
+
+    def deactivate(self):
+        if os.path.exists(self.backup):
+            os.replace(self.backup, self.default_theme)
+        elif self.active_theme():
+            os.remove(self.default_theme)
+
+    def broadcast(self):
+        # Новые окна X11 читают тему сами; GNOME и его наследники — из gsettings
+        if not shutil.which("gsettings"):
+            return
+        name = self.active_theme()
+        command = ["gsettings", "set", GSETTINGS_SCHEMA, "cursor-theme", name] if name else \
+            ["gsettings", "reset", GSETTINGS_SCHEMA, "cursor-theme"]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            logging.warning(f"gsettings не сменил тему курсоров: {result.stderr.strip()}")
+
+
+def write_text(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def replace_file(path, create):
+    # create(tmp) создаёт файл или ссылку под временным именем, затем os.replace подменяет path целиком
+    directory = os.path.dirname(path)
+    tmp = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    create(tmp)
+    os.replace(tmp, path)
+
+
+BACKENDS = {"registry": RegistryBackend, "xcursor": XcursorBackend, "memory": MemoryBackend}
+
+
+def make_backend(name=None):
+    # Имя из аргумента или переменной окружения CURSOR_APPLY_BACKEND;
+    # по умолчанию реестр в Windows и тема Xcursor в остальных системах
+    name = name or os.environ.get(BACKEND_ENV) or ("registry" if sys.platform == "win32" else "xcursor")
+    if name not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд применения курсоров: {name}")
+    return BACKENDS[name]()
+
+
+def scheme_values(scheme):
+    # {роль: путь} -> {имя значения в реестре: путь}. Роли вне CURSOR_KEYS пропускаются;
+    # у нескольких ролей одно значение реестра — побеждает последняя, как и раньше
+    return {reg_name: scheme[key_name] for key_name, reg_name in CURSOR_KEYS.items() if key_name in scheme}
+
+
+def check_values(values):
+    # Проверка до записи: реестр с путём на отсутствующий файл даёт системе пустой курсор
+    if not values:
+        raise ValueError("В схеме нет ни одного известного курсора")
+    problems = []
+    for reg_name, path in values.items():
+        if not path.lower().endswith(CURSOR_EXTENSIONS):
+            problems.append(f"{reg_name}: не .cur/.ani")
+        elif not os.path.isfile(path):
+            problems.append(f"{reg_name}: файл не найден")
+    if problems:
+        raise ValueError("; ".join(problems))
+
+
+class CursorApplier:
+    def __init__(self, backend):
+        self.backend = backend
+        self.snapshots = []
+
+    def apply(self, scheme):
+        values = scheme_values(scheme)
+        check_values(values)
+        self.commit(values)
+
+    def apply_values(self, values):
+        # Значения собранной схемы (schemes.CompiledScheme) проверены при сборке — диск не трогаем
+        self.commit(dict(values))
+
+    def reset(self):
+        # Пустая строка возвращает курсор Windows по умолчанию
+        self.commit({reg_name: "" for reg_name in CURSOR_KEYS.values()})
+
+    def commit(self, values):
+        # Одна пачка и одна рассылка; при сбое записываем снимок обратно
+        snapshot = self.backend.read(values.keys())
+        try:
+            self.backend.write(values)
+            self.backend.broadcast()
+        except Exception:
+            try:
+                self.restore(snapshot)
+            except Exception as e:
+                logging.error(f"Не удалось откатить схему курсоров: {str(e)}")
+            raise
+        self.snapshots.append(snapshot)
+        del self.snapshots[:-SNAPSHOT_LIMIT]
+
+    def restore(self, snapshot):
+        self.backend.write(snapshot)
+        self.backend.broadcast()
+
+    def rollback(self):
+        # Возвращает предыдущую схему; False — откатывать нечего
+        if not self.snapshots:
+            return False
+        self.restore(self.snapshots.pop())
+        return True
+
+
+_shared = None
+
+
+def shared_applier():
+    global _shared
+    if _shared is None:
+        _shared = CursorApplier(make_backend())
+    return _shared
+
+
+def apply_scheme(scheme):
+    # scheme — {роль: путь к .cur/.ani}, как в каталоге
+    shared_applier().apply(scheme)
+
+
+def apply_values(values):
+    shared_applier().apply_values(values)
+
+
+def reset_scheme():
+    shared_applier().reset()
+
+
+def rollback_scheme():
+    return shared_applier().rollback()
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, QSize, Signal, Qt
+from PySide6.QtGui import QImage, QImageReader, QPainter
+
+from manifest import file_digests, atomic_write_json
+from catalog import CURSOR_EXTENSIONS
+from cursor_files import CursorFile
+
+THUMBNAIL_INDEX_VERSION = 2
+INDEX_SAVE_DELAY_MS = 2000
+DEFAULT_DISK_LIMIT = 64 * 1024 * 1024
+# Доля меньшей стороны превью, которую занимает курсор
+CURSOR_PREVIEW_SCALE = 0.6
+
+
+def is_cursor_file(path):
+    return path.lower().endswith(CURSOR_EXTENSIONS)
+
+
+def cursor_qimage(image):
+    if image.kind == "png":
+        qimage = QImage.fromData(image.data, "PNG")
+        if qimage.isNull():
+            raise ValueError("не удалось декодировать PNG-кадр курсора")
+        return qimage
+    # copy(): QImage не владеет переданным буфером
+    return QImage(image.data, image.width, image.height, image.width * 4, QImage.Format_RGBA8888).copy()
+
+
+def cursor_canvas(image, size):
+    # Курсор по центру прозрачного холста размера превью: карточка растягивает
+    # картинку на весь виджет, поэтому пропорции холста совпадают с ним
+    canvas = QImage(size, QImage.Format_ARGB32_Premultiplied)
+    canvas.fill(Qt.transparent)
+    side = int(min(size.width(), size.height()) * CURSOR_PREVIEW_SCALE)
+    scaled = cursor_qimage(image).scaled(side, side, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    painter = QPainter(canvas)
+    painter.drawImage((size.width() - scaled.width()) // 2, (size.height() - scaled.height()) // 2, scaled)
+    painter.end()
+    return canvas
+
+
+def render_cursor_frames(path, size, first_only=False):
+    # [(QImage, задержка в мс)] по шагам анимации; каждый кадр декодируется один раз
+    side = int(min(size.width(), size.height()) * CURSOR_PREVIEW_SCALE)
+    with CursorFile(path) as cursor:
+        steps = cursor.steps[:1] if first_only else cursor.steps
+        canvases = {}
+        frames = []
+        for frame, delay in steps:
+            if frame not in canvases:
+                canvases[frame] = cursor_canvas(cursor.image(frame, side), size)
+            frames.append((canvases[frame], delay))
+    return frames
+
+
+class ThumbnailJob(QRunnable):
+    def __init__(self, service, path, generation):
+        super().__init__()
+        self.service = service
+        self.path = path
+        self.generation = generation
+
+    def run(self):
+        # Задание, поставленное до invalidate, не декодирует устаревший файл
+        if not self.service.is_current(self.path, self.generation):
+            return
+        try:
+            image = self.service.load_or_render(self.path, self.generation)
+        except Exception as e:
+            logging.warning(f"Не удалось подготовить превью {self.path}: {str(e)}")
+            image = QImage()
+        self.service.finished.emit(self.path, image, self.generation)
+
+
+class ThumbnailService(QObject):
+    # Первые кадры preview.gif (или курсора пака без gif), уменьшенные до размера карточки. Декодирование идёт
+    # в пуле потоков, результат кешируется на диске под именем <md5 файла>_<ширина>x<высота>.png,
+    # а индекс путь -> (размер, mtime, md5) избавляет от повторного хеширования.
+    # Файлы миниатюр учитываются в индексе с временем последнего использования и вытесняются
+    # по LRU, когда их общий размер превышает max_bytes; вместе с ними уходят записи путей.
+    # invalidate увеличивает поколение пути: задания прежнего поколения ничего не пишут
+    # в кэш, а их результат отбрасывается.
+    # Сигнал ready(path, image) приходит в GUI-поток; пустой QImage — превью не удалось прочитать.
+    ready = Signal(str, QImage)
+    finished = Signal(str, QImage, int)
+
+    def __init__(self, cache_dir, size=QSize(195, 150), memory_items=120, max_workers=None,
+                 max_bytes=DEFAULT_DISK_LIMIT, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.size = size
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock = threading.Lock()
+        self.index, self.thumbs = self.load_index()
+        self.memory = OrderedDict()
+        self.pending = {}
+        self.generations = {}
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers or max(2, (os.cpu_count() or 2) // 2))
+        self.finished.connect(self.on_finished)
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(INDEX_SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.save_index)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Индекс превью повреждён, строим заново: {str(e)}")
+            data = {}
+        if data.get("version") != THUMBNAIL_INDEX_VERSION:
+            # Миниатюры, оставшиеся без учёта (прежняя версия индекса), тоже подлежат вытеснению
+            return {}, self.scan_thumbnails()
+        files = {path: tuple(entry) for path, entry in data.get("files", {}).items()}
+        thumbs = {name: list(entry) for name, entry in data.get("thumbs", {}).items()}
+        return files, thumbs
+
+    def scan_thumbnails(self):
+        thumbs = {}
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return thumbs
+        for entry in entries:
+            if entry.name.endswith(".png") and not entry.name.startswith(".tmp-"):
+                st = entry.stat()
+                thumbs[entry.name] = [st.st_size, st.st_mtime]
+        return thumbs
+
+    def save_index(self):
+        with self.lock:
+            files = dict(self.index)
+            thumbs = dict(self.thumbs)
+        try:
+            atomic_write_json(self.index_path, {"version": THUMBNAIL_INDEX_VERSION, "files": files,
+                                                "thumbs": thumbs})
+        except OSError as e:
+            logging.warning(f"Не удалось сохранить индекс превью: {str(e)}")
+
+    def request(self, path):
+        # Возвращает готовую миниатюру из памяти или None; во втором случае
+        # миниатюра позже придёт сигналом ready(path, image)
+        image = self.memory.get(path)
+        if image is not None:
+            self.memory.move_to_end(path)
+            return image
+        if path not in self.pending:
+            with self.lock:
+                generation = self.generations.get(path, 0)
+            self.pending[path] = generation
+            self.pool.start(ThumbnailJob(self, path, generation))
+        return None
+
+    def invalidate(self, path):
+        self.memory.pop(path, None)
+        self.pending.pop(path, None)
+        with self.lock:
+            self.generations[path] = self.generations.get(path, 0) + 1
+
+    def is_current(self, path, generation):
+        with self.lock:
+            return self.generations.get(path, 0) == generation
+
+    def on_finished(self, path, image, generation):
+        if self.pending.get(path) == generation:
+            del self.pending[path]
+        if not self.is_current(path, generation):
+            # Результат задания, поставленного до invalidate: следующий request запустит новое
+            return
+        if not image.isNull():
+            self.memory[path] = image
+            self.memory.move_to_end(path)
+            while len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+        self.save_timer.start()
+        self.ready.emit(path, image)
+
+    def wait(self):
+        self.pool.waitForDone()
+
+    def thumbnail_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}_{self.size.width()}x{self.size.height()}.png")
+
+    def load_or_render(self, path, generation=0):
+        # Выполняется в потоке пула: только QImage, без QPixmap
+        st = os.stat(path)
+        with self.lock:
+            entry = self.index.get(path)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            digest = entry[2]
+        else:
+            digest, _ = file_digests(path)
+            with self.lock:
+                if self.generations.get(path, 0) == generation:
+                    self.index[path] = (st.st_size, st.st_mtime_ns, digest)
+
+        cached = self.thumbnail_path(digest)
+        name = os.path.basename(cached)
+        image = QImage(cached)
+        if not image.isNull():
+            with self.lock:
+                if name in self.thumbs:
+                    self.thumbs[name][1] = time.time()
+                elif os.path.exists(cached):
+                    # Миниатюра записана, но индекс не успел сохраниться
+                    self.thumbs[name] = [os.path.getsize(cached), time.time()]
+            return image
+
+        if is_cursor_file(path):
+            image = render_cursor_frames(path, self.size, first_only=True)[0][0]
+        else:
+            reader = QImageReader(path)
+            reader.setScaledSize(self.size)
+            image = reader.read()
+            if image.isNull():
+                raise ValueError(reader.errorString())
+        if not self.is_current(path, generation):
+            # Файл сменился, пока шло декодирование: устаревшую миниатюру в кэш не пишем
+            return image
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".png", dir=self.cache_dir)
+        os.close(fd)
+        try:
+            if image.save(tmp_path, "PNG"):
+                os.replace(tmp_path, cached)
+                with self.lock:
+                    self.thumbs[name] = [os.path.getsize(cached), time.time()]
+                    self.evict(keep=name)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return image
+
+    def evict(self, keep=None):
+        # Вызывается под self.lock
+        total = sum(size for size, _ in self.thumbs.values())
+        if total <= self.max_bytes:
+            return
+        evicted = set()
+        for name, (size, _) in sorted(self.thumbs.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+            del self.thumbs[name]
+            evicted.add(name)
+            total -= size
+        suffix = f"_{self.size.width()}x{self.size.height()}.png"
+        stale = [path for path, entry in self.index.items() if entry[2] + suffix in evicted]
+        for path in stale:
+            del self.index[path]
+        logging.info(f"Из кэша превью вытеснено {len(evicted)} миниатюр")
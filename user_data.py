@@ -0,0 +1,150 @@
+import os
+import json
+import logging
+
+from manifest import atomic_write_json
+from favorites import FavoritesStore
+
+USER_DATA_VERSION = 1
+COMPACT_THRESHOLD = 1000
+RECENT_LIMIT = 5
+
+
+class UserDataStore:
+    # Избранное, недавние курсоры и настройки: снимок user_data.json плюс журнал операций
+    # user_data.json.journal (по JSON-строке на операцию). Изменения копятся в памяти
+    # и дописываются в журнал пачкой во flush(); когда журнал разрастается, его
+    # содержимое сворачивается в новый снимок через временный файл и os.replace.
+    # Операции идемпотентны, поэтому повторное применение журнала поверх снимка
+    # после сбоя между записью снимка и очисткой журнала безопасно.
+    def __init__(self, path, legacy_favorites=(), legacy_recents=None):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.legacy_favorites = legacy_favorites
+        self.legacy_recents = legacy_recents
+        self.favorites = {}
+        self.recents = []
+        self.settings = {}
+        self.pending = []
+        self.journal_ops = 0
+
+    def load(self):
+        if not os.path.exists(self.path) and not os.path.exists(self.journal_path):
+            self.import_legacy()
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == USER_DATA_VERSION:
+                self.favorites = {tuple(entry): True for entry in data.get("favorites", [])}
+                self.recents = data.get("recents", [])[:RECENT_LIMIT]
+                self.settings = data.get("settings", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"Снимок пользовательских данных повреждён: {str(e)}")
+        self.replay_journal()
+
+    def replay_journal(self):
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        damaged = False
+        for idx, line in enumerate(lines):
+            try:
+                self.apply(json.loads(line))
+            except (ValueError, TypeError, IndexError) as e:
+                # Недописанная последняя строка — обычное следствие сбоя во время записи
+                damaged = True
+                if idx != len(lines) - 1:
+                    logging.warning(f"Пропущена повреждённая запись журнала: {str(e)}")
+        self.journal_ops = len(lines)
+        if damaged:
+            # Иначе следующая операция допишется в хвост повреждённой строки
+            self.compact()
+
+    def import_legacy(self):
+        # Первый запуск с новым хранилищем: переносим старые JSON-файлы, сами файлы не трогаем
+        for path in self.legacy_favorites:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entries = FavoritesStore.parse(json.load(f))
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                logging.warning(f"Не удалось импортировать {path}: {str(e)}")
+                continue
+            for name, category in entries:
+                self.favorites[(name, category)] = True
+        if self.legacy_recents:
+            try:
+                with open(self.legacy_recents, "r", encoding="utf-8") as f:
+                    self.recents = [name for name in json.load(f) if isinstance(name, str)][:RECENT_LIMIT]
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logging.warning(f"Не удалось импортировать {self.legacy_recents}: {str(e)}")
+        if self.favorites or self.recents:
+            logging.info(f"Импортировано избранных: {len(self.favorites)}, недавних: {len(self.recents)}")
+        self.compact()
+
+    def apply(self, op):
+        kind = op[0]
+        if kind == "fav+":
+            self.favorites[(op[1], op[2])] = True
+        elif kind == "fav-":
+            self.favorites.pop((op[1], op[2]), None)
+        elif kind == "recent":
+            self.recents = list(op[1])[:RECENT_LIMIT]
+        elif kind == "set":
+            self.settings[op[1]] = op[2]
+        else:
+            raise ValueError(f"неизвестная операция {kind}")
+
+    def record(self, op):
+        self.apply(op)
+        self.pending.append(op)
+
+    def set_favorite(self, name, category, is_favorite):
+        self.record(["fav+" if is_favorite else "fav-", name, category])
+
+    def set_recents(self, recents):
+        self.record(["recent", list(recents)])
+
+    def touch_recent(self, name):
+        # Применённый пак поднимается в начало списка недавних
+        recents = [name] + [recent for recent in self.recents if recent != name]
+        self.set_recents(recents[:RECENT_LIMIT])
+        return self.recents
+
+    def set_setting(self, key, value):
+        self.record(["set", key, value])
+
+    def flush(self):
+        # Одна запись и один fsync на пачку накопленных операций
+        if not self.pending:
+            return
+        if self.journal_ops + len(self.pending) > COMPACT_THRESHOLD:
+            self.pending = []
+            self.compact()
+            return
+        data = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in self.pending)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_ops += len(self.pending)
+        self.pending = []
+
+    def compact(self):
+        atomic_write_json(self.path, {
+            "version": USER_DATA_VERSION,
+            "favorites": [list(entry) for entry in self.favorites],
+            "recents": self.recents,
+            "settings": self.settings,
+        })
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self.journal_ops = 0
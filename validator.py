@@ -0,0 +1,100 @@
+import sys
+import json
+import logging
+import argparse
+
+from cursor_files import CursorFile
+
+# Меньше файлов проверяем в текущем процессе: запуск пула дороже самой проверки
+POOL_THRESHOLD = 64
+CHUNK_SIZE = 32
+
+
+def check_file(path):
+    # None — файл цел, иначе текст ошибки. Выполняется в процессах пула, поэтому без Qt
+    try:
+        with CursorFile(path) as cursor:
+            cursor.validate()
+    except (OSError, ValueError) as e:
+        return str(e)
+    return None
+
+
+def validate_files(files, workers=None):
+    # files — [(путь, размер, mtime)]; результат в формате Catalog.record_validation
+    files = list(files)
+    paths = [path for path, _, _ in files]
+    if len(files) < POOL_THRESHOLD or workers == 1:
+        errors = map(check_file, paths)
+        return [(path, size, mtime_ns, error) for (path, size, mtime_ns), error in zip(files, errors)]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        errors = list(pool.map(check_file, paths, chunksize=CHUNK_SIZE))
+    return [(path, size, mtime_ns, error) for (path, size, mtime_ns), error in zip(files, errors)]
+
+
+def validate_category(catalog, category, workers=None, full=False):
+    # Проверяет только файлы, которых ещё нет в кеше проверок каталога или которые изменились
+    # на месте. Возвращает (сколько файлов проверено, {пак: [(роль, ошибка)]},
+    # паки с файлами, переписанными на месте)
+    catalog.refresh(category)
+    rewritten = catalog.restat(category)
+    if full:
+        catalog.reset_validation(category)
+    files = catalog.unvalidated(category)
+    if files:
+        catalog.record_validation(validate_files(files, workers))
+    broken = catalog.broken(category)
+    if files:
+        logging.info(f"Проверка {category}: файлов {len(files)}, повреждённых паков {len(broken)}")
+    return len(files), broken, rewritten
+
+
+def print_report(report, as_json=False):
+    # report — {категория: {"checked": число, "broken": {пак: [(роль, ошибка)]}}}
+    if as_json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    for category, result in report.items():
+        print(f"{category}: проверено файлов {result['checked']}, повреждённых паков {len(result['broken'])}")
+        for pack, errors in result["broken"].items():
+            print(f"  {pack}")
+            for role, error in errors:
+                print(f"    {role}: {error}")
+
+
+def verify_library(categories=None, workers=None, full=False, as_json=False):
+    # Отчёт по библиотеке из CATEGORY_PATHS; код выхода 1, если найдены повреждённые паки
+    from constants import CATALOG_FILE, CATEGORY_PATHS
+    from catalog import Catalog
+
+    catalog = Catalog(CATALOG_FILE, CATEGORY_PATHS)
+    report = {}
+    try:
+        for category in categories or sorted(CATEGORY_PATHS):
+            checked, broken, _ = validate_category(catalog, category, workers, full)
+            report[category] = {"checked": checked, "broken": broken}
+    finally:
+        catalog.close()
+    print_report(report, as_json)
+    return 1 if any(result["broken"] for result in report.values()) else 0
+
+
+def add_arguments(parser):
+    from constants import CATEGORY_PATHS
+    parser.add_argument("--category", choices=sorted(CATEGORY_PATHS), action="append",
+                        help="категория (по умолчанию все)")
+    parser.add_argument("--workers", type=int, help="число процессов проверки")
+    parser.add_argument("--full", action="store_true", help="перепроверить всё, не глядя на кеш")
+    parser.add_argument("--json", action="store_true", help="отчёт в JSON")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Проверка целостности установленных паков курсоров")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    return verify_library(args.category, args.workers, args.full, args.json)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
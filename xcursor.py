@@ -0,0 +1,214 @@
+import os
+import json
+import shutil
+import struct
+import hashlib
+import logging
+import tempfile
+
+from cursor_files import CursorFile, decode_png
+from manifest import file_digests, atomic_write_json
+
+XCURSOR_MAGIC = b"Xcur"
+XCURSOR_FILE_VERSION = 0x10000
+XCURSOR_HEADER_SIZE = 16
+XCURSOR_IMAGE_TYPE = 0xfffd0002
+XCURSOR_IMAGE_VERSION = 1
+XCURSOR_IMAGE_HEADER_SIZE = 36
+# Меняется вместе с форматом темы: прежние темы в кеше перестают совпадать по хешу
+THEME_FORMAT = 1
+THEME_PREFIX = "cursor-galaxy"
+SCHEME_FILE = "scheme.json"
+# Сборка темы декодирует все кадры всех размеров — пул окупается уже с нескольких паков
+POOL_THRESHOLD = 4
+
+# Значение реестра Windows -> имена курсоров X11. Первое имя — файл темы, остальные —
+# ссылки на него. Если два значения претендуют на одно имя, побеждает стоящее выше
+XCURSOR_NAMES = {
+    "Arrow": ("left_ptr", "default", "arrow", "top_left_arrow"),
+    "Help": ("help", "question_arrow", "whats_this", "left_ptr_help", "dnd-ask"),
+    "Busy": ("watch", "wait"),
+    "AppStarting": ("left_ptr_watch", "progress", "half-busy"),
+    "WorkingInBackground": ("left_ptr_watch", "progress", "half-busy"),
+    "Crosshair": ("crosshair", "cross", "tcross", "cross_reverse", "diamond_cross"),
+    "PrecisionSelect": ("crosshair", "cross", "tcross"),
+    "IBeam": ("xterm", "text", "ibeam", "vertical-text"),
+    "SizeAll": ("fleur", "move", "all-scroll", "size_all", "grabbing", "dnd-move"),
+    "SizeNESW": ("bottom_left_corner", "top_right_corner", "nesw-resize", "ne-resize", "sw-resize", "size_bdiag"),
+    "SizeNWSE": ("bottom_right_corner", "top_left_corner", "nwse-resize", "nw-resize", "se-resize", "size_fdiag"),
+    "SizeWE": ("sb_h_double_arrow", "h_double_arrow", "ew-resize", "col-resize", "left_side", "right_side",
+               "e-resize", "w-resize", "size_hor", "split_h"),
+    "SizeNS": ("sb_v_double_arrow", "v_double_arrow", "ns-resize", "row-resize", "top_side", "bottom_side",
+               "n-resize", "s-resize", "size_ver", "split_v"),
+    "AlternateSelect": ("center_ptr", "up_arrow"),
+    "No": ("not-allowed", "crossed_circle", "no-drop", "forbidden", "circle", "dnd-no-drop"),
+    "Hand": ("hand2", "pointer", "pointing_hand", "hand1", "grab", "openhand"),
+    "Handwriting": ("pencil",),
+}
+
+
+def premultiplied_bgra(rgba):
+    # Пиксели Xcursor — ARGB с предумноженной альфой, little-endian: байты B, G, R, A
+    out = bytearray(len(rgba))
+    out[0::4] = rgba[2::4]
+    out[1::4] = rgba[1::4]
+    out[2::4] = rgba[0::4]
+    alpha = rgba[3::4]
+    out[3::4] = alpha
+    if alpha.count(255) == len(alpha):
+        return bytes(out)
+    tables = premultiply_tables()
+    for idx, a in enumerate(alpha):
+        if a != 255:
+            table = tables[a]
+            pos = idx * 4
+            out[pos] = table[out[pos]]
+            out[pos + 1] = table[out[pos + 1]]
+            out[pos + 2] = table[out[pos + 2]]
+    return bytes(out)
+
+
+PREMULTIPLY = []
+
+
+def premultiply_tables():
+    # Таблицы канал -> канал * альфа / 255 для каждой альфы, строятся при первом полупрозрачном пикселе
+    if not PREMULTIPLY:
+        PREMULTIPLY.extend(bytes((c * a + 127) // 255 for c in range(256)) for a in range(256))
+    return PREMULTIPLY
+
+
+def image_pixels(image):
+    # (ширина, высота, пиксели Xcursor) кадра CursorImage
+    if image.kind == "png":
+        width, height, rgba = decode_png(image.data)
+    else:
+        width, height, rgba = image.width, image.height, image.data
+    return width, height, premultiplied_bgra(rgba)
+
+
+def compile_cursor(path):
+    # .cur/.ani -> файл Xcursor: каждый шаг анимации во всех размерах из файла.
+    # Кадры одного номинального размера в порядке файла libXcursor проигрывает как анимацию
+    chunks = []
+    with CursorFile(path) as cursor:
+        decoded = {}
+        for frame, delay in cursor.steps:
+            if frame not in decoded:
+                images = [cursor.entry_image(entry) for entry in cursor.frames[frame]]
+                decoded[frame] = [(image, image_pixels(image)) for image in images]
+            for image, (width, height, pixels) in decoded[frame]:
+                nominal = max(width, height)
+                x_hot = min(image.hotspot[0], width - 1)
+                y_hot = min(image.hotspot[1], height - 1)
+                header = struct.pack("<9I", XCURSOR_IMAGE_HEADER_SIZE, XCURSOR_IMAGE_TYPE, nominal,
+                                     XCURSOR_IMAGE_VERSION, width, height, x_hot, y_hot,
+                                     max(int(delay), 1) if cursor.animated else 0)
+                chunks.append((nominal, header + pixels))
+    if not chunks:
+        raise ValueError("в курсоре нет кадров")
+    # Оглавление сгруппировано по размеру; внутри размера порядок кадров сохраняется
+    chunks.sort(key=lambda chunk: chunk[0])
+    position = XCURSOR_HEADER_SIZE + 12 * len(chunks)
+    toc = []
+    for nominal, data in chunks:
+        toc.append(struct.pack("<3I", XCURSOR_IMAGE_TYPE, nominal, position))
+        position += len(data)
+    header = XCURSOR_MAGIC + struct.pack("<3I", XCURSOR_HEADER_SIZE, XCURSOR_FILE_VERSION, len(chunks))
+    return header + b"".join(toc) + b"".join(data for _, data in chunks)
+
+
+def cursor_names(values):
+    # {значение реестра: путь} -> {имя файла темы: (путь, [ссылки])}
+    taken = set()
+    result = {}
+    for reg_name, names in XCURSOR_NAMES.items():
+        path = values.get(reg_name)
+        if not path:
+            continue
+        free = [name for name in names if name not in taken]
+        if not free:
+            continue
+        taken.update(free)
+        result[free[0]] = (path, free[1:])
+    return result
+
+
+def theme_digest(values):
+    # Ключ кеша: содержимое файлов курсоров и то, каким именам X11 они достались
+    digest = hashlib.sha1(f"xcursor-theme-{THEME_FORMAT}".encode())
+    for name, (path, aliases) in sorted(cursor_names(values).items()):
+        digest.update(f"\0{name}\0{','.join(aliases)}\0{file_digests(path)[0]}".encode())
+    return digest.hexdigest()
+
+
+def theme_name(digest):
+    return f"{THEME_PREFIX}-{digest[:12]}"
+
+
+def compile_theme(values, cache_dir, title=None):
+    # Тема Xcursor (cursors/ и index.theme) в cache_dir/<хеш содержимого>.
+    # Возвращает (каталог темы, собрана ли она сейчас); готовая тема из кеша не пересобирается
+    digest = theme_digest(values)
+    theme_dir = os.path.join(os.path.abspath(cache_dir), digest)
+    if os.path.exists(os.path.join(theme_dir, "index.theme")):
+        return theme_dir, False
+    names = cursor_names(values)
+    if not names:
+        raise ValueError("В схеме нет курсоров, известных X11")
+
+    # Сборка во временном каталоге рядом и переименование целиком: недособранная тема в кеш не попадает
+    os.makedirs(cache_dir, exist_ok=True)
+    building = tempfile.mkdtemp(prefix=".building-", dir=cache_dir)
+    try:
+        cursors_dir = os.path.join(building, "cursors")
+        os.mkdir(cursors_dir)
+        for name, (path, aliases) in names.items():
+            with open(os.path.join(cursors_dir, name), "wb") as f:
+                f.write(compile_cursor(path))
+            for alias in aliases:
+                os.symlink(name, os.path.join(cursors_dir, alias))
+        with open(os.path.join(building, "index.theme"), "w", encoding="utf-8") as f:
+            f.write(f"[Icon Theme]\nName={title or theme_name(digest)}\nComment=Cursor Galaxy\n")
+        atomic_write_json(os.path.join(building, SCHEME_FILE), {"title": title, "values": values})
+        try:
+            os.rename(building, theme_dir)
+        except OSError:
+            # Ту же тему уже собрал параллельный процесс
+            if not os.path.exists(os.path.join(theme_dir, "index.theme")):
+                raise
+            shutil.rmtree(building, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+    logging.info(f"Собрана тема Xcursor {theme_name(digest)} ({title or 'без названия'}): курсоров {len(names)}")
+    return theme_dir, True
+
+
+def theme_values(theme_dir):
+    # Схема, из которой собрана тема: {значение реестра: путь}
+    try:
+        with open(os.path.join(theme_dir, SCHEME_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)["values"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def compile_job(job):
+    # Выполняется в процессах пула: (название, схема, кеш) -> (название, каталог темы, собрана ли, ошибка)
+    title, values, cache_dir = job
+    try:
+        theme_dir, built = compile_theme(values, cache_dir, title)
+    except (OSError, ValueError) as e:
+        return title, None, False, str(e)
+    return title, theme_dir, built, None
+
+
+def compile_themes(jobs, workers=None):
+    # jobs — [(название, {значение реестра: путь}, кеш)]; паки собираются параллельно
+    jobs = list(jobs)
+    if len(jobs) < POOL_THRESHOLD or workers == 1:
+        return [compile_job(job) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(compile_job, jobs))